@@ -2,6 +2,10 @@ from .nodes.material_inspector import NODE_CLASS_MAPPINGS as MATERIAL_CLASS_MAPP
 from .nodes.mesh_transform import NODE_CLASS_MAPPINGS as TRANSFORM_CLASS_MAPPINGS, NODE_DISPLAY_NAME_MAPPINGS as TRANSFORM_DISPLAY_MAPPINGS
 from .nodes.scene_assembler import NODE_CLASS_MAPPINGS as ASSEMBLER_CLASS_MAPPINGS, NODE_DISPLAY_NAME_MAPPINGS as ASSEMBLER_DISPLAY_MAPPINGS
 from .nodes.mesh_loader import NODE_CLASS_MAPPINGS as LOADER_CLASS_MAPPINGS, NODE_DISPLAY_NAME_MAPPINGS as LOADER_DISPLAY_MAPPINGS
+from .nodes.mesh_array import NODE_CLASS_MAPPINGS as ARRAY_CLASS_MAPPINGS, NODE_DISPLAY_NAME_MAPPINGS as ARRAY_DISPLAY_MAPPINGS
+from .nodes.material_batch_editor import NODE_CLASS_MAPPINGS as MATERIAL_BATCH_CLASS_MAPPINGS, NODE_DISPLAY_NAME_MAPPINGS as MATERIAL_BATCH_DISPLAY_MAPPINGS
+from .nodes.texture_atlas import NODE_CLASS_MAPPINGS as ATLAS_CLASS_MAPPINGS, NODE_DISPLAY_NAME_MAPPINGS as ATLAS_DISPLAY_MAPPINGS
+from .nodes.scene_animation import NODE_CLASS_MAPPINGS as ANIMATION_CLASS_MAPPINGS, NODE_DISPLAY_NAME_MAPPINGS as ANIMATION_DISPLAY_MAPPINGS
 
 # Import API routes to register endpoints
 from . import api_routes
@@ -11,6 +15,10 @@ NODE_CLASS_MAPPINGS = {
     **TRANSFORM_CLASS_MAPPINGS,
     **ASSEMBLER_CLASS_MAPPINGS,
     **LOADER_CLASS_MAPPINGS,
+    **ARRAY_CLASS_MAPPINGS,
+    **MATERIAL_BATCH_CLASS_MAPPINGS,
+    **ATLAS_CLASS_MAPPINGS,
+    **ANIMATION_CLASS_MAPPINGS,
 }
 
 NODE_DISPLAY_NAME_MAPPINGS = {
@@ -18,6 +26,10 @@ NODE_DISPLAY_NAME_MAPPINGS = {
     **TRANSFORM_DISPLAY_MAPPINGS,
     **ASSEMBLER_DISPLAY_MAPPINGS,
     **LOADER_DISPLAY_MAPPINGS,
+    **ARRAY_DISPLAY_MAPPINGS,
+    **MATERIAL_BATCH_DISPLAY_MAPPINGS,
+    **ATLAS_DISPLAY_MAPPINGS,
+    **ANIMATION_DISPLAY_MAPPINGS,
 }
 
 WEB_DIRECTORY = "./web"
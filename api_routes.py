@@ -1,5 +1,4 @@
 import os
-import subprocess
 import json
 from aiohttp import web
 import server
@@ -22,6 +21,7 @@ async def open_explorer(request):
             return web.json_response({"error": f"Path does not exist: {path}"}, status=404)
         
         # Open Windows Explorer
+        import subprocess
         # Use /select to highlight the file if it's a file path
         if os.path.isfile(path):
             subprocess.Popen(f'explorer /select,"{path}"')
@@ -32,3 +32,88 @@ async def open_explorer(request):
     
     except Exception as e:
         return web.json_response({"error": str(e)}, status=500)
+
+@server.PromptServer.instance.routes.get("/mixo3d/mesh_buffers/{mesh_id}")
+async def mesh_buffers(request):
+    """Serve a registry mesh as raw typed-array buffers (see core/mesh_buffers.py)"""
+    try:
+        from .core.scene_registry import registry
+        from .core.transform_index import transform_index
+        from .core.mesh_buffers import get_mesh_payload, parse_range
+
+        item_id = request.match_info["mesh_id"]
+        resolved = transform_index.resolve(item_id)
+        mesh_data = registry.get_mesh(resolved[1]) if resolved else None
+        if mesh_data is None:
+            return web.json_response({"error": f"Unknown mesh: {item_id}"}, status=404)
+
+        etag, payload = get_mesh_payload(resolved[1], mesh_data)
+        headers = {
+            "ETag": f'"{etag}"',
+            "Accept-Ranges": "bytes",
+            "Cache-Control": "no-cache",
+            # Node ids resolve to their leaf mesh; the world matrix rides along (row-major)
+            "X-Mixo3D-Mesh-Id": resolved[1],
+            "X-Mixo3D-Matrix": json.dumps([round(float(v), 9) for v in resolved[0].ravel()]),
+            "Access-Control-Expose-Headers": "ETag, X-Mixo3D-Mesh-Id, X-Mixo3D-Matrix",
+        }
+
+        if request.headers.get("If-None-Match", "").strip('W/ "') == etag:
+            return web.Response(status=304, headers=headers)
+
+        try:
+            byte_range = parse_range(request.headers.get("Range", ""), len(payload))
+        except ValueError:
+            headers["Content-Range"] = f"bytes */{len(payload)}"
+            return web.Response(status=416, headers=headers)
+
+        if byte_range is None:
+            return web.Response(body=payload, content_type="application/octet-stream", headers=headers)
+        start, end = byte_range
+        headers["Content-Range"] = f"bytes {start}-{end - 1}/{len(payload)}"
+        return web.Response(status=206, body=payload[start:end], content_type="application/octet-stream", headers=headers)
+
+    except Exception as e:
+        return web.json_response({"error": str(e)}, status=500)
+
+# A drag-select sends at most 24 x 24 rays; anything far beyond that is not a viewer request
+MAX_RAYS = 4096
+
+@server.PromptServer.instance.routes.post("/mixo3d/raycast")
+async def raycast(request):
+    """
+    Pick registry meshes with world-space rays (see core/bvh.py).
+    Body: {"ids": [...], "up_direction": "Y", "origin": [x,y,z], "direction": [x,y,z]}
+    or {"ids": [...], "rays": [[ox,oy,oz,dx,dy,dz], ...]} for batched drag-select.
+    """
+    try:
+        import asyncio
+        import numpy as np
+        from .core.bvh import raycast_scene
+
+        data = await request.json()
+        ids = [i for i in data.get("ids", []) if i]
+        if not ids:
+            return web.json_response({"error": "No ids provided"}, status=400)
+
+        batched = "rays" in data
+        if batched:
+            if not isinstance(data["rays"], list) or len(data["rays"]) > MAX_RAYS:
+                return web.json_response({"error": f"rays must be a list of at most {MAX_RAYS} rays"}, status=400)
+            rays = np.asarray(data["rays"], dtype=np.float64).reshape(-1, 6)
+        else:
+            rays = np.asarray([list(data.get("origin", [])) + list(data.get("direction", []))], dtype=np.float64)
+            if rays.shape != (1, 6):
+                return web.json_response({"error": "origin and direction must be 3-vectors"}, status=400)
+        max_distance = float(data.get("max_distance") or np.inf)
+
+        # BVH builds and traversal are CPU-bound; keep the event loop free
+        hits = await asyncio.get_running_loop().run_in_executor(
+            None, raycast_scene, ids, rays[:, :3], rays[:, 3:], data.get("up_direction", "Y"), max_distance)
+
+        if batched:
+            return web.json_response({"hits": hits})
+        return web.json_response({"hit": hits[0]})
+
+    except Exception as e:
+        return web.json_response({"error": str(e)}, status=500)
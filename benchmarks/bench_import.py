@@ -0,0 +1,66 @@
+"""
+Import-time benchmark for ComfyUI startup.
+
+Run from the ComfyUI root so `folder_paths` is importable:
+    python custom_nodes/comfyui-mixo3dtools/benchmarks/bench_import.py
+
+Each module is imported in a fresh interpreter. The report shows the import
+time and which heavy dependencies were pulled in. The last rows are the
+baseline an eager package would pay at boot for those dependencies.
+"""
+import ast
+import os
+import subprocess
+import sys
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY = ["torch", "trimesh", "PIL", "scipy", "pygfx", "wgpu"]
+
+def package_imports():
+    """Every module the package __init__ imports at startup, read from its source so the list cannot go stale."""
+    with open(os.path.join(PACKAGE_DIR, "__init__.py"), encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    modules = []
+    for stmt in tree.body:
+        if isinstance(stmt, ast.ImportFrom) and stmt.level == 1:
+            names = [stmt.module] if stmt.module else [a.name for a in stmt.names]
+            modules.extend(n for n in names if n not in modules)
+    return modules
+
+MODULES = package_imports()
+
+# Registers the package under an alias without executing its __init__ (which needs the server)
+_SNIPPET = """
+import sys, time, types, importlib
+sys.path.insert(0, {cwd!r})
+pkg = types.ModuleType("mixo3dtools"); pkg.__path__ = [{pkg!r}]; sys.modules["mixo3dtools"] = pkg
+import numpy  # already resident in any ComfyUI process
+t = time.perf_counter()
+importlib.import_module({target!r})
+dt = time.perf_counter() - t
+print(dt, ",".join(m for m in {heavy!r} if m in sys.modules))
+"""
+
+def measure(target, repeats=3):
+    best, heavy = None, ""
+    for _ in range(repeats):
+        code = _SNIPPET.format(cwd=os.getcwd(), pkg=PACKAGE_DIR, target=target, heavy=HEAVY)
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+        if out.returncode != 0:
+            return None, out.stderr.strip().splitlines()[-1]
+        dt, heavy = out.stdout.split(" ", 1) if " " in out.stdout else (out.stdout, "")
+        best = float(dt) if best is None else min(best, float(dt))
+    return best, heavy.strip()
+
+def main():
+    print(f"{'module':<36}{'ms':>9}  heavy deps loaded")
+    for name in MODULES:
+        dt, heavy = measure(f"mixo3dtools.{name}")
+        print(f"{name:<36}{'-' if dt is None else f'{dt * 1000:9.1f}':>9}  {heavy or '-'}")
+    # What the old eager imports cost on top of ComfyUI (torch excluded: ComfyUI loads it anyway)
+    for dep in ["trimesh", "PIL.Image", "scipy.spatial.transform", "pygfx"]:
+        dt, info = measure(dep)
+        print(f"{'[eager] ' + dep:<36}{'-' if dt is None else f'{dt * 1000:9.1f}':>9}  {info if dt is None else ''}")
+
+if __name__ == "__main__":
+    main()
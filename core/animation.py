@@ -0,0 +1,238 @@
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+from .scene_registry import registry
+from .transform_index import transform_index
+from .transform_utils import create_trs_matrices, up_direction_matrix
+from .gltf_writer import GLTFBuilder
+
+DEFAULT_TOLERANCE = 1e-4
+# Widest rotation between two kept keys; at 180 degrees slerp's direction becomes ambiguous
+_MAX_ROTATION_SPAN = np.radians(170.0)
+
+def decompose_trs(matrices: np.ndarray):
+    """
+    (K, 4, 4) affine matrices -> translations (K, 3), xyzw quaternions (K, 4), scales (K, 3).
+    Mirroring goes into a negative x scale. Quaternion signs are kept continuous
+    between consecutive frames so linear interpolation takes the short path.
+    """
+    m = np.asarray(matrices, dtype=np.float64).reshape(-1, 4, 4)
+    translations = m[:, :3, 3].copy()
+    m3 = m[:, :3, :3]
+    scales = np.linalg.norm(m3, axis=1)
+    scales[np.linalg.det(m3) < 0, 0] *= -1.0
+    rot = m3 / np.where(scales == 0, 1.0, scales)[:, None, :]
+
+    # Shepperd: branch on the largest of trace / diagonal for numerical stability
+    r00, r11, r22 = rot[:, 0, 0], rot[:, 1, 1], rot[:, 2, 2]
+    trace = r00 + r11 + r22
+    cases = np.argmax(np.stack([trace, r00, r11, r22], axis=1), axis=1)
+    q = np.empty((len(m), 4))
+    for case in range(4):
+        sel = cases == case
+        if not sel.any():
+            continue
+        r = rot[sel]
+        if case == 0:
+            s = np.sqrt(np.maximum(trace[sel] + 1.0, 0.0)) * 2.0
+            q[sel] = np.stack([(r[:, 2, 1] - r[:, 1, 2]) / s, (r[:, 0, 2] - r[:, 2, 0]) / s,
+                               (r[:, 1, 0] - r[:, 0, 1]) / s, 0.25 * s], axis=1)
+        elif case == 1:
+            s = np.sqrt(np.maximum(1.0 + r[:, 0, 0] - r[:, 1, 1] - r[:, 2, 2], 0.0)) * 2.0
+            q[sel] = np.stack([0.25 * s, (r[:, 0, 1] + r[:, 1, 0]) / s,
+                               (r[:, 0, 2] + r[:, 2, 0]) / s, (r[:, 2, 1] - r[:, 1, 2]) / s], axis=1)
+        elif case == 2:
+            s = np.sqrt(np.maximum(1.0 + r[:, 1, 1] - r[:, 0, 0] - r[:, 2, 2], 0.0)) * 2.0
+            q[sel] = np.stack([(r[:, 0, 1] + r[:, 1, 0]) / s, 0.25 * s,
+                               (r[:, 1, 2] + r[:, 2, 1]) / s, (r[:, 0, 2] - r[:, 2, 0]) / s], axis=1)
+        else:
+            s = np.sqrt(np.maximum(1.0 + r[:, 2, 2] - r[:, 0, 0] - r[:, 1, 1], 0.0)) * 2.0
+            q[sel] = np.stack([(r[:, 0, 2] + r[:, 2, 0]) / s, (r[:, 1, 2] + r[:, 2, 1]) / s,
+                               0.25 * s, (r[:, 1, 0] - r[:, 0, 1]) / s], axis=1)
+    q /= np.linalg.norm(q, axis=1, keepdims=True)
+
+    if len(q) > 1:
+        flips = np.sign((q[1:] * q[:-1]).sum(axis=1))
+        flips[flips == 0] = 1.0
+        q[1:] *= np.cumprod(flips)[:, None]
+    return translations, q, scales
+
+def _slerp(q0: np.ndarray, q1: np.ndarray, t: np.ndarray) -> np.ndarray:
+    """Slerp from unit quaternion q0 to q1 (same hemisphere) at each t, as glTF LINEAR rotation samplers do."""
+    theta = np.arccos(np.clip(np.dot(q0, q1), -1.0, 1.0))
+    if theta < 1e-8:
+        out = q0 + (q1 - q0) * t[:, None]
+    else:
+        out = (np.sin((1.0 - t) * theta)[:, None] * q0 + np.sin(t * theta)[:, None] * q1) / np.sin(theta)
+    return out / np.linalg.norm(out, axis=1, keepdims=True)
+
+def _rotation_angle(a: np.ndarray, b: np.ndarray, signed: bool = False) -> np.ndarray:
+    """
+    Angle in radians of the rotation between unit quaternions a and b, stable near 0.
+    signed=True keeps the quaternion sign, i.e. the turn slerp actually makes from a to b
+    (q and -q are the same orientation, but a 360 degree turn between them).
+    """
+    if not signed:
+        b = b * np.where((a * b).sum(axis=-1) < 0, -1.0, 1.0)[..., None]
+    return 4.0 * np.arctan2(np.linalg.norm(a - b, axis=-1), np.linalg.norm(a + b, axis=-1))
+
+def reduce_keyframes(times: np.ndarray, values: np.ndarray, tolerance: float = DEFAULT_TOLERANCE,
+                     rotation: bool = False) -> np.ndarray:
+    """
+    Indices of the keys to keep so interpolation between them stays within
+    tolerance of every dropped sample (Ramer-Douglas-Peucker on time).
+    Translation/scale use component-wise lerp error. With rotation=True the
+    values are quaternions, the error is the angle (radians) to the slerp of
+    the kept endpoints, and no kept span turns by 180 degrees or more, so the
+    shortest-path slerp players use is unambiguous. Constant tracks collapse to a single key.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n = len(values)
+    if n <= 2:
+        return np.arange(n)
+    if rotation:
+        if _rotation_angle(values, values[0]).max() <= tolerance:
+            return np.array([0])
+    elif np.abs(values - values[0]).max() <= tolerance:
+        return np.array([0])
+
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        a, b = stack.pop()
+        if b - a < 2:
+            continue
+        t = (times[a + 1:b] - times[a]) / (times[b] - times[a])
+        if rotation:
+            err = _rotation_angle(_slerp(values[a], values[b], t), values[a + 1:b])
+            too_wide = _rotation_angle(values[a], values[b], signed=True) >= _MAX_ROTATION_SPAN
+        else:
+            lerp = values[a] + (values[b] - values[a]) * t[:, None]
+            err = np.abs(values[a + 1:b] - lerp).max(axis=1)
+            too_wide = False
+        worst = int(np.argmax(err))
+        if err[worst] > tolerance or too_wide:
+            # An over-wide span with no error to speak of splits in the middle
+            mid = a + 1 + worst if err[worst] > tolerance else (a + b) // 2
+            keep[mid] = True
+            stack.append((a, mid))
+            stack.append((mid, b))
+    return np.flatnonzero(keep)
+
+def sample_keyframes(keys: Sequence[dict], frame_count: int) -> np.ndarray:
+    """
+    Sparse keys [{"frame", "position", "rotation" (degrees), "scale"}] ->
+    (frame_count, 4, 4) TRS matrices, each parameter linearly interpolated per frame.
+    """
+    keys = sorted(keys, key=lambda k: k.get("frame", 0))
+    key_frames = np.array([float(k.get("frame", 0)) for k in keys])
+
+    def track(name, default):
+        vals = []
+        for k in keys:
+            v = k.get(name, default)
+            vals.append([v, v, v] if np.isscalar(v) else list(v))
+        vals = np.asarray(vals, dtype=np.float64)
+        frames = np.arange(frame_count, dtype=np.float64)
+        return np.stack([np.interp(frames, key_frames, vals[:, c]) for c in range(3)], axis=1)
+
+    return create_trs_matrices(track("position", (0, 0, 0)), track("rotation", (0, 0, 0)), track("scale", 1.0))
+
+def write_animated_glb(output_path: str, tracks: List[dict], fps: float = 24.0, up_direction: str = "Y",
+                       tolerance: float = DEFAULT_TOLERANCE, name: str = "sequence") -> Optional[dict]:
+    """
+    tracks: [{"name", "mesh_id" (leaf mesh), "matrices" (F, 4, 4) world matrices per frame}].
+    Geometry is written once per distinct mesh; each track becomes an animated
+    node referencing it, with TRS channels reduced to the keys that matter.
+    Returns stats, or None if nothing could be written.
+    """
+    from .glb_exporter import GLBExporter
+
+    builder = GLTFBuilder()
+    # Static root carries the scene orientation so the tracks stay in assembly space
+    scene_rot = up_direction_matrix(up_direction)
+    root = {"name": name}
+    if not np.allclose(scene_rot, np.eye(4)):
+        root["matrix"] = [float(v) for v in scene_rot.T.ravel()]
+    root_index = builder.add_node(root)
+
+    mesh_index: Dict[str, int] = {}
+    material_index: Dict[tuple, int] = {}
+    channels = []
+    stats = {"tracks": 0, "frames": 0, "samples": 0, "keys": 0}
+
+    for track in tracks:
+        mesh_id = track["mesh_id"]
+        mesh_data = registry.get_mesh(mesh_id)
+        if mesh_data is None or mesh_data.indices is None:
+            print(f"[Mixo3D] Warning: Animation track {track.get('name')} has no mesh, skipped")
+            continue
+        if mesh_id not in mesh_index:
+            prims = []
+            for prim in GLBExporter.split_mesh(mesh_data, np.eye(4), mesh_id, mesh_id):
+                mat_key = (id(prim["material"]), id(prim["texture"]))
+                if mat_key not in material_index:
+                    material_index[mat_key] = builder.add_material(prim["material"], prim["texture"])
+                prims.append((prim, material_index[mat_key]))
+            mesh_index[mesh_id] = builder.add_mesh(mesh_id, prims)
+
+        matrices = np.asarray(track["matrices"], dtype=np.float64)
+        translations, rotations, scales = decompose_trs(matrices)
+        node = {"name": str(track.get("name", mesh_id)), "mesh": mesh_index[mesh_id],
+                "translation": translations[0].tolist(), "rotation": rotations[0].tolist(), "scale": scales[0].tolist()}
+        node_index = builder.add_node(node, parent=root_index)
+
+        times = np.arange(len(matrices)) / float(fps)
+        for path, values in (("translation", translations), ("rotation", rotations), ("scale", scales)):
+            keep = reduce_keyframes(times, values, tolerance, rotation=(path == "rotation"))
+            stats["samples"] += len(values)
+            stats["keys"] += len(keep)
+            if len(keep) == 1:
+                continue  # constant: the node's rest TRS already holds it
+            channels.append((node_index, path, times[keep], values[keep]))
+        stats["tracks"] += 1
+        stats["frames"] = max(stats["frames"], len(matrices))
+
+    if not stats["tracks"]:
+        return None
+    if channels:
+        builder.add_animation(name, channels)
+    builder.write(output_path)
+    print(f"[Mixo3D] Animation export: {stats['tracks']} tracks, {stats['frames']} frames, "
+          f"{stats['samples']} samples -> {stats['keys']} keys")
+    return stats
+
+def tracks_from_frame_ids(frame_ids: Sequence[str], name: str) -> Optional[dict]:
+    """
+    Per-frame registry ids (e.g. one MeshTransform output per frame) -> one track.
+    Frames whose id does not resolve hold the previous frame's matrix, so later keys keep their times.
+    """
+    matrices, leaves = transform_index.resolve_many(list(frame_ids))
+    resolved = [i for i, leaf in enumerate(leaves) if leaf]
+    if not resolved:
+        return None
+    mesh_id = leaves[resolved[0]]
+    if any(leaves[i] != mesh_id for i in resolved):
+        print(f"[Mixo3D] Warning: Track {name} changes mesh between frames; using {mesh_id}")
+    if len(resolved) < len(leaves):
+        print(f"[Mixo3D] Warning: Track {name}: {len(leaves) - len(resolved)} unresolved frames hold the previous pose")
+    held = []
+    current = matrices[resolved[0]]  # leading gaps take the first resolved pose
+    for matrix, leaf in zip(matrices, leaves):
+        if leaf:
+            current = matrix
+        held.append(current)
+    return {"name": name, "mesh_id": mesh_id, "matrices": np.asarray(held)}
+
+def tracks_from_keyframes(keyframes: Dict[str, List[dict]], frame_count: int) -> List[dict]:
+    """{registry id: [keys]} -> tracks; the keyframe TRS is applied on top of each id's own transform."""
+    tracks = []
+    for item_id, keys in keyframes.items():
+        resolved = transform_index.resolve(item_id)
+        if resolved is None or not keys:
+            print(f"[Mixo3D] Warning: Keyframes for unknown id {item_id}, skipped")
+            continue
+        base, leaf_id = resolved
+        tracks.append({"name": item_id, "mesh_id": leaf_id,
+                       "matrices": sample_keyframes(keys, frame_count) @ base})
+    return tracks
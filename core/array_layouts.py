@@ -0,0 +1,54 @@
+import numpy as np
+
+# Each layout returns (positions, rotations, scales) as (K, 3) arrays,
+# ready for transform_utils.create_trs_matrices.
+
+def grid_layout(counts=(1, 1, 1), spacing=(1.0, 1.0, 1.0), centered=True):
+    """Regular nx * ny * nz lattice, x varying fastest."""
+    nx, ny, nz = (max(int(c), 1) for c in counts)
+    iz, iy, ix = np.meshgrid(np.arange(nz), np.arange(ny), np.arange(nx), indexing="ij")
+    idx = np.stack([ix.ravel(), iy.ravel(), iz.ravel()], axis=1).astype(np.float64)
+    if centered:
+        idx -= (np.array([nx, ny, nz]) - 1) / 2.0
+    positions = idx * np.asarray(spacing, dtype=np.float64)
+    k = len(positions)
+    return positions, np.zeros((k, 3)), np.ones((k, 3))
+
+def radial_layout(count=8, radius=1.0, axis="Y", start_angle=0.0, sweep=360.0, face_center=True):
+    """
+    count copies on a circle around axis. A full 360 sweep spaces copies evenly
+    without duplicating the first one. face_center rotates each copy about the axis.
+    """
+    count = max(int(count), 1)
+    closed = abs(sweep) >= 360.0
+    steps = count if closed else max(count - 1, 1)
+    angles = start_angle + np.arange(count) * (sweep / steps)
+    a = np.radians(angles)
+    u, v = radius * np.cos(a), radius * np.sin(a)
+
+    positions = np.zeros((count, 3))
+    rotations = np.zeros((count, 3))
+    # Circle plane and rotation channel per axis (right-handed, matches Three.js Euler)
+    if axis == "X":
+        positions[:, 1], positions[:, 2] = u, v
+        rotations[:, 0] = angles
+    elif axis == "Z":
+        positions[:, 0], positions[:, 1] = u, v
+        rotations[:, 2] = angles
+    else:
+        positions[:, 2], positions[:, 0] = u, v
+        rotations[:, 1] = angles
+    if not face_center:
+        rotations[:] = 0.0
+    return positions, rotations, np.ones((count, 3))
+
+def random_layout(count=100, extents=(1.0, 1.0, 1.0), seed=0,
+                  rotation_jitter=(0.0, 0.0, 0.0), scale_range=(1.0, 1.0)):
+    """Uniform scatter inside a centered box with per-instance rotation/scale jitter."""
+    count = max(int(count), 1)
+    rng = np.random.default_rng(seed)
+    half = np.asarray(extents, dtype=np.float64) / 2.0
+    positions = rng.uniform(-1.0, 1.0, (count, 3)) * half
+    rotations = rng.uniform(-1.0, 1.0, (count, 3)) * np.asarray(rotation_jitter, dtype=np.float64)
+    s = rng.uniform(scale_range[0], scale_range[1], count)
+    return positions, rotations, np.repeat(s[:, None], 3, axis=1)
@@ -0,0 +1,214 @@
+import hashlib
+import numpy as np
+import trimesh
+from collections import OrderedDict
+from typing import List, Optional
+from .mesh_model import SceneMeshData, base_color_texture_key
+from .gltf_writer import GLTFBuilder, DEFAULT_QUANTIZATION
+from .mesh_writers import write_stl, write_obj
+
+class BakedScene:
+    """
+    Result of one bake: transformed, per-material primitives (see
+    GLBExporter.bake_primitives). Any number of outputs can be serialized
+    from it without re-gathering or re-transforming geometry.
+    """
+
+    def __init__(self, primitives: List[dict], up_direction: str = "Y", key: str = ""):
+        self.primitives = primitives
+        self.up_direction = up_direction
+        self.key = key
+
+    def __bool__(self):
+        return bool(self.primitives)
+
+    def batched(self) -> "BakedScene":
+        """Copy with primitives merged across inputs by identical material (see batch_primitives)."""
+        return BakedScene(batch_primitives(self.primitives), self.up_direction,
+                          key=f"{self.key}:batched")
+
+    def write(self, output_path: str, file_type: str = 'glb', quantization: Optional[dict] = None):
+        """
+        Serialize to glb/obj/stl. With quantization a glb is written with
+        KHR_mesh_quantization and the stats dict is returned; otherwise True.
+        Returns False for an empty scene.
+        """
+        if not self.primitives: return False
+
+        if quantization and file_type == 'glb':
+            return self.write_quantized(output_path, quantization)
+        # Direct vectorized writers; no per-material trimesh objects needed
+        if file_type == 'stl':
+            return write_stl(output_path, self.primitives)
+        if file_type == 'obj':
+            return write_obj(output_path, self.primitives)
+
+        combined_meshes = []
+        for prim in self.primitives:
+            tm = trimesh.Trimesh(
+                vertices=prim["positions"],
+                faces=prim["indices"],
+                vertex_normals=prim["normals"],
+                process=False
+            )
+            if prim["uvs"] is not None:
+                tm.visual = trimesh.visual.TextureVisuals(uv=prim["uvs"])
+
+            mat_def = prim["material"]
+            pbr = trimesh.visual.material.PBRMaterial(
+                baseColorFactor=mat_def.get('base_color', [0.8, 0.8, 0.8, 1.0]),
+                metallicFactor=mat_def.get('metallic', 0.0),
+                roughnessFactor=mat_def.get('roughness', 0.5),
+                baseColorTexture=prim["texture"]
+            )
+            tm.visual.material = pbr
+            combined_meshes.append(tm)
+            
+        scene = trimesh.Scene(combined_meshes)
+        scene.export(output_path, file_type=file_type)
+        return True
+
+    def write_quantized(self, output_path: str, quantization: dict):
+        """Write primitives as a KHR_mesh_quantization GLB and report the positional error."""
+        options = {**DEFAULT_QUANTIZATION, **quantization}
+        builder = GLTFBuilder()
+        for prim in self.primitives:
+            mat_index = builder.add_material(prim["material"], prim["texture"])
+            builder.add_primitive_node(prim, mat_index, quantize=options)
+        builder.write(output_path)
+        stats = {**options, "max_position_error": builder.max_position_error}
+        print(f"[Mixo3D] Quantized export: max position error {builder.max_position_error:.6g}")
+        return stats
+
+    def to_mesh_data(self, metadata: Optional[dict] = None) -> SceneMeshData:
+        """Merge all primitives into one registry mesh (one material slot per distinct material)."""
+        prims = self.primitives
+        counts = np.array([len(p["positions"]) for p in prims], dtype=np.int64)
+        offsets = np.concatenate([[0], np.cumsum(counts)[:-1]]) if len(prims) else counts
+
+        materials, textures, slot_of, face_mats = [], {}, {}, []
+        for prim in prims:
+            key = (id(prim["material"]), id(prim["texture"]))
+            if key not in slot_of:
+                slot_of[key] = len(materials)
+                materials.append(dict(prim["material"]))
+                if prim["texture"] is not None:
+                    textures[base_color_texture_key(slot_of[key])] = prim["texture"]
+            face_mats.append(np.full(len(prim["indices"]), slot_of[key], dtype=np.int32))
+
+        has_normals = bool(prims) and all(p["normals"] is not None for p in prims)
+        has_uvs = any(p["uvs"] is not None for p in prims)
+        return SceneMeshData(
+            vertices=np.vstack([p["positions"] for p in prims]) if prims else np.zeros((0, 3)),
+            indices=np.vstack([p["indices"].astype(np.int64) + o for p, o in zip(prims, offsets)]) if prims else np.zeros((0, 3), dtype=np.int32),
+            normals=np.vstack([p["normals"] for p in prims]) if has_normals else None,
+            uvs=np.vstack([p["uvs"] if p["uvs"] is not None else np.zeros((len(p["positions"]), 2)) for p in prims]) if has_uvs else None,
+            materials=materials,
+            textures=textures,
+            face_material_indices=np.concatenate(face_mats) if face_mats else None,
+            metadata=dict(metadata or {}),
+        )
+
+def _canonical(value):
+    """Hashable, float-rounded form of a material value."""
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return tuple(_canonical(v) for v in value)
+    if isinstance(value, (float, np.floating)):
+        return round(float(value), 5)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _canonical(v)) for k, v in value.items()))
+    return value
+
+def texture_hash(image) -> Optional[str]:
+    """Content hash of a PIL texture, None without one."""
+    if image is None:
+        return None
+    h = hashlib.md5(f"{image.mode}|{image.size}|".encode())
+    h.update(image.tobytes())
+    return h.hexdigest()
+
+def batch_primitives(primitives: List[dict]) -> List[dict]:
+    """
+    Concatenate primitives whose materials are equal by value (factors plus
+    texture content, names ignored) into one primitive per material.
+    Primitives with and without normals/uvs are kept in separate batches.
+    """
+    tex_hashes = {}
+    groups = OrderedDict()
+    for prim in primitives:
+        tex = prim["texture"]
+        if id(tex) not in tex_hashes:
+            tex_hashes[id(tex)] = texture_hash(tex)
+        material_key = _canonical({k: v for k, v in prim["material"].items() if k != "name"})
+        key = (material_key, tex_hashes[id(tex)], prim["normals"] is not None, prim["uvs"] is not None)
+        groups.setdefault(key, []).append(prim)
+
+    batched = []
+    for group in groups.values():
+        first = group[0]
+        if len(group) == 1:
+            batched.append(first)
+            continue
+        counts = np.array([len(p["positions"]) for p in group], dtype=np.int64)
+        offsets = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        batched.append({
+            "name": f"batch_{len(batched)}",
+            "node_id": first["node_id"],
+            "node_ids": [p["node_id"] for p in group],
+            "mesh_id": first["mesh_id"],
+            "material_index": first["material_index"],
+            "positions": np.vstack([p["positions"] for p in group]),
+            "normals": np.vstack([p["normals"] for p in group]) if first["normals"] is not None else None,
+            "uvs": np.vstack([p["uvs"] for p in group]) if first["uvs"] is not None else None,
+            "indices": np.vstack([p["indices"] + np.uint32(o) for p, o in zip(group, offsets)]).astype(np.uint32),
+            "material": first["material"],
+            "texture": first["texture"],
+        })
+    print(f"[Mixo3D] Material batching: {len(primitives)} primitives -> {len(batched)}")
+    return batched
+
+# ⚡ Bake cache: input hash -> BakedScene
+_MAX_CACHED = 4
+_bake_cache: "OrderedDict[str, BakedScene]" = OrderedDict()
+
+def _texture_signature(tex) -> str:
+    """Content hash of a texture slot value: PIL image, ComfyUI IMAGE tensor or array."""
+    if hasattr(tex, "detach"):
+        tex = tex.detach().cpu().numpy()
+    if isinstance(tex, np.ndarray):
+        h = hashlib.md5(f"{tex.dtype}|{tex.shape}|".encode())
+        h.update(np.ascontiguousarray(tex).tobytes())
+        return h.hexdigest()
+    return texture_hash(tex) if hasattr(tex, "tobytes") else str(tex)
+
+def mesh_signature(mesh_data: Optional[SceneMeshData]) -> str:
+    """Content hash of everything baking reads from a mesh: geometry, materials and textures."""
+    if mesh_data is None:
+        return ""
+    # get_hash covers vertices and materials
+    h = hashlib.md5(mesh_data.get_hash().encode())
+    for arr in (mesh_data.normals, mesh_data.uvs, mesh_data.indices, mesh_data.face_material_indices):
+        h.update(b"-" if arr is None else np.ascontiguousarray(arr).tobytes())
+        h.update(b"|")
+    for slot in sorted(mesh_data.textures):
+        h.update(f"{slot}={_texture_signature(mesh_data.textures[slot])}|".encode())
+    return h.hexdigest()
+
+def bake_key(node_ids: List[str], matrices, leaves, meshes, up_direction: str) -> str:
+    """Hash of everything a bake depends on: root order, world matrices and leaf mesh content."""
+    h = hashlib.md5(up_direction.encode())
+    for root_id, matrix, leaf_id, mesh_data in zip(node_ids, matrices, leaves, meshes):
+        h.update(f"{root_id}|{leaf_id}|{mesh_signature(mesh_data)}|".encode())
+        h.update(np.ascontiguousarray(matrix).tobytes())
+    return h.hexdigest()
+
+def get_cached_bake(key: str) -> Optional[BakedScene]:
+    baked = _bake_cache.get(key)
+    if baked is not None:
+        _bake_cache.move_to_end(key)
+    return baked
+
+def store_bake(baked: BakedScene):
+    _bake_cache[baked.key] = baked
+    while len(_bake_cache) > _MAX_CACHED:
+        _bake_cache.popitem(last=False)
@@ -0,0 +1,138 @@
+"""
+Headless assemble-and-export jobs: the MeshFromPath -> MeshTransform ->
+MaterialEditor -> SceneAssembler chain driven by a manifest instead of a
+ComfyUI graph. Only core modules are used, so no server is needed.
+
+Manifest (JSON, or YAML if PyYAML is installed):
+{
+  "defaults": {"output_dir": "exports", "formats": ["glb"], "up_direction": "Y"},
+  "jobs": [{
+    "name": "chair_red",
+    "formats": ["glb", "stl"],
+    "batch_materials": true,
+    "quantization": {"position_bits": 14},
+    "assets": [{"path": "chair.glb", "position": [0, 0, 0], "rotation": [0, 90, 0], "scale": 1.0,
+                "materials": [{"name": "Seat*", "color": "#cc2222"}]}]
+  }]
+}
+Relative paths resolve against the manifest's directory.
+"""
+import os
+import json
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional
+from .scene_registry import registry
+from .mesh_model import SceneNodeData
+from .mesh_loading import load_mesh_cached, source_key
+from .material_edits import apply_material_edits
+from .transform_utils import create_trs_matrix
+
+JOB_KEYS = ("output_dir", "formats", "up_direction", "batch_materials", "quantization")
+EXPORT_FORMATS = ("glb", "obj", "stl")
+
+# Per-process cache of loaded source meshes, reused across the jobs a worker runs
+_MAX_LOADED = 32
+_loaded: "OrderedDict[str, Any]" = OrderedDict()
+
+def load_manifest(path: str) -> Dict[str, Any]:
+    """Read a JSON or YAML manifest and resolve relative paths. Returns {"jobs": [...]} with defaults applied."""
+    with open(path, "r", encoding="utf-8") as f:
+        if path.lower().endswith((".yaml", ".yml")):
+            try:
+                import yaml
+            except ImportError:
+                raise RuntimeError("YAML manifests need PyYAML (pip install pyyaml); use JSON otherwise")
+            manifest = yaml.safe_load(f)
+        else:
+            manifest = json.load(f)
+
+    base_dir = os.path.dirname(os.path.abspath(path))
+    defaults = manifest.get("defaults", {})
+    jobs = []
+    for i, job in enumerate(manifest.get("jobs", [])):
+        job = {**{k: defaults[k] for k in JOB_KEYS if k in defaults}, **job}
+        job.setdefault("name", f"job_{i}")
+        job["output_dir"] = os.path.join(base_dir, job.get("output_dir", "."))
+        job["assets"] = [{**asset, "path": os.path.join(base_dir, asset["path"])} for asset in job.get("assets", [])]
+        jobs.append(job)
+    return {"jobs": jobs}
+
+def _load_source(path: str, cache_dir: Optional[str]):
+    key = source_key(path)
+    mesh_data = _loaded.get(key)
+    if mesh_data is None:
+        mesh_data = load_mesh_cached(path, cache_dir)
+        _loaded[key] = mesh_data
+        while len(_loaded) > _MAX_LOADED:
+            _loaded.popitem(last=False)
+    else:
+        _loaded.move_to_end(key)
+    return mesh_data
+
+def run_job(job: Dict[str, Any], cache_dir: Optional[str] = None) -> Dict[str, Any]:
+    """Assemble one job's assets and write every requested format. Never raises; errors go in the result."""
+    from .glb_exporter import GLBExporter
+
+    start = time.perf_counter()
+    result = {"name": job.get("name", ""), "outputs": [], "error": None}
+    # Job-unique ids: the registry may be a live ComfyUI one, so only this job's entries are touched
+    prefix = f"batch_{uuid.uuid4().hex[:8]}"
+    registered = []
+    try:
+        node_ids = []
+        for i, asset in enumerate(job["assets"]):
+            mesh_data = _load_source(asset["path"], cache_dir)
+            if asset.get("materials"):
+                mesh_data, _ = apply_material_edits(mesh_data, asset["materials"])
+            mesh_id = registry.register_mesh(mesh_data, requested_id=f"{prefix}_asset_{i}")
+            registered.append(mesh_id)
+
+            scale = asset.get("scale", 1.0)
+            if not isinstance(scale, (list, tuple)):
+                scale = (scale, scale, scale)
+            matrix = create_trs_matrix(position=asset.get("position", (0, 0, 0)),
+                                       rotation=asset.get("rotation", (0, 0, 0)), scale=scale)
+            node_ids.append(registry.register_node(SceneNodeData(mesh_id=mesh_id, transform=matrix),
+                                                   requested_id=f"{prefix}_asset_{i}_node"))
+            registered.append(node_ids[-1])
+
+        baked = GLBExporter.bake(node_ids, job.get("up_direction", "Y"), job.get("batch_materials", False))
+        if not baked:
+            raise ValueError("Nothing to export")
+
+        os.makedirs(job["output_dir"], exist_ok=True)
+        for fmt in job.get("formats", ["glb"]):
+            if fmt not in EXPORT_FORMATS:
+                raise ValueError(f"Unsupported format: {fmt}")
+            out_path = os.path.join(job["output_dir"], f"{job['name']}.{fmt}")
+            baked.write(out_path, fmt, job.get("quantization") if fmt == "glb" else None)
+            result["outputs"].append(out_path)
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    finally:
+        for item_id in reversed(registered):
+            registry.unregister(item_id)
+    result["seconds"] = round(time.perf_counter() - start, 3)
+    return result
+
+def run_jobs(jobs: List[Dict[str, Any]], workers: int = 0, cache_dir: Optional[str] = None, progress=None) -> List[Dict[str, Any]]:
+    """
+    Run jobs across a process pool (workers <= 1 runs inline). Results come back in job order.
+    progress(result) is called as each job finishes.
+    """
+    results: List[Optional[Dict[str, Any]]] = [None] * len(jobs)
+    if workers <= 1 or len(jobs) <= 1:
+        for i, job in enumerate(jobs):
+            results[i] = run_job(job, cache_dir)
+            if progress: progress(results[i])
+        return results
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(run_job, job, cache_dir): i for i, job in enumerate(jobs)}
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+            if progress: progress(results[futures[future]])
+    return results
@@ -0,0 +1,67 @@
+import numpy as np
+from typing import List, Optional
+from .scene_registry import registry
+from .transform_index import transform_index
+from .transform_utils import up_direction_matrix
+
+# Corner selector: bit i of the corner index picks min/max on axis i
+_CORNER_BITS = ((np.arange(8)[:, None] >> np.arange(3)) & 1).astype(bool)
+
+def aabb_corners(aabbs):
+    """(K, 2, 3) boxes -> (K, 8, 3) corners."""
+    aabbs = np.asarray(aabbs, dtype=np.float64).reshape(-1, 2, 3)
+    return np.where(_CORNER_BITS[None], aabbs[:, 1:2, :], aabbs[:, 0:1, :])
+
+def transform_aabbs(aabbs, matrices):
+    """Transform K local boxes by K (4, 4) matrices via their 8 corners. Returns (K, 2, 3)."""
+    corners = aabb_corners(aabbs)
+    matrices = np.asarray(matrices, dtype=np.float64).reshape(-1, 4, 4)
+    world = corners @ matrices[:, :3, :3].transpose(0, 2, 1) + matrices[:, None, :3, 3]
+    return np.stack([world.min(axis=1), world.max(axis=1)], axis=1)
+
+def transform_spheres(centers, radii, matrices):
+    """Conservative world spheres: radius grows by the largest axis scale of each matrix."""
+    matrices = np.asarray(matrices, dtype=np.float64).reshape(-1, 4, 4)
+    centers = np.asarray(centers, dtype=np.float64).reshape(-1, 3)
+    world_centers = np.einsum("kij,kj->ki", matrices[:, :3, :3], centers) + matrices[:, :3, 3]
+    max_scale = np.linalg.norm(matrices[:, :3, :3], axis=1).max(axis=1)
+    return world_centers, np.asarray(radii, dtype=np.float64) * max_scale
+
+def scene_bounds(node_ids: List[str], up_direction: str = "Y") -> Optional[dict]:
+    """
+    World bounds of an assembly without baking: each leaf mesh's cached local
+    AABB is transformed by its resolved node matrix (incl. scene orientation).
+    """
+    matrices, leaves = transform_index.resolve_many(node_ids)
+    boxes, mats = [], []
+    for matrix, leaf_id in zip(matrices, leaves):
+        mesh_data = registry.get_mesh(leaf_id) if leaf_id else None
+        aabb = mesh_data.get_local_aabb() if mesh_data is not None else None
+        if aabb is not None:
+            boxes.append(aabb)
+            mats.append(matrix)
+    if not boxes:
+        return None
+
+    world = transform_aabbs(np.stack(boxes), up_direction_matrix(up_direction) @ np.stack(mats))
+    b_min = world[:, 0].min(axis=0)
+    b_max = world[:, 1].max(axis=0)
+    size = b_max - b_min
+    return {
+        "min": b_min.tolist(),
+        "max": b_max.tolist(),
+        "size": size.tolist(),
+        "center": ((b_min + b_max) / 2.0).tolist(),
+        "radius": float(np.linalg.norm(size) / 2.0),
+    }
+
+def frustum_planes(view_proj):
+    """Six normalized (a, b, c, d) planes from a row-major view-projection matrix."""
+    m = np.asarray(view_proj, dtype=np.float64)
+    planes = np.stack([m[3] + m[0], m[3] - m[0], m[3] + m[1], m[3] - m[1], m[3] + m[2], m[3] - m[2]])
+    return planes / np.linalg.norm(planes[:, :3], axis=1, keepdims=True)
+
+def spheres_in_frustum(planes, centers, radii):
+    """Boolean mask of spheres at least partially inside all six planes."""
+    dist = np.asarray(centers) @ planes[:, :3].T + planes[:, 3]
+    return (dist >= -np.asarray(radii)[:, None]).all(axis=1)
@@ -0,0 +1,233 @@
+import hashlib
+from collections import OrderedDict
+from typing import List, Optional, Sequence
+import numpy as np
+from .mesh_model import SceneMeshData
+from .transform_index import transform_index
+from .transform_utils import up_direction_matrix
+
+LEAF_SIZE = 8
+_EPS = 1e-12
+# Barycentric slack so rays through shared edges and vertices still hit one of the triangles
+_BARY_EPS = 1e-9
+# Budget for all cached trees together; least recently used trees are dropped first
+_MAX_CACHED_BYTES = 256 * 1024 * 1024
+
+# content key -> MeshBVH, so a mesh re-registered under a new id (reload, re-run) reuses its tree
+_bvh_cache: "OrderedDict[str, MeshBVH]" = OrderedDict()
+_cached_bytes = 0
+
+def morton_codes(points: np.ndarray) -> np.ndarray:
+    """30-bit Morton codes (10 bits per axis) of points normalized to their bounds."""
+    lo, hi = points.min(axis=0), points.max(axis=0)
+    extent = np.where(hi - lo > 0, hi - lo, 1.0)
+    q = np.clip(((points - lo) / extent * 1023.0).astype(np.int64), 0, 1023)
+
+    def spread(v):
+        v = (v | (v << 16)) & 0x030000FF
+        v = (v | (v << 8)) & 0x0300F00F
+        v = (v | (v << 4)) & 0x030C30C3
+        v = (v | (v << 2)) & 0x09249249
+        return v
+
+    return (spread(q[:, 0]) << 2) | (spread(q[:, 1]) << 1) | spread(q[:, 2])
+
+class MeshBVH:
+    """
+    Implicit binary BVH over a triangle mesh: triangles sorted along a Morton
+    curve, grouped into LEAF_SIZE buckets, with a complete heap-layout tree
+    (children of i at 2i+1, 2i+2) whose bounds are reduced level by level.
+    Corners and bounds are stored as float32 (36 bytes per triangle); hit tests
+    upcast the gathered corners to float64.
+    """
+
+    def __init__(self, vertices: np.ndarray, indices: np.ndarray, leaf_size: int = LEAF_SIZE):
+        tri = np.asarray(vertices, dtype=np.float32)[np.asarray(indices)]
+        n_tris = len(tri)
+        self.leaf_size = leaf_size
+        order = np.argsort(morton_codes(tri.mean(axis=1, dtype=np.float64)), kind="stable")
+        self.order = order.astype(np.int32) if n_tris < 2 ** 31 else order
+        # (n, 3, 3) corners in Morton order; bounds below come from the same float32 values, so they stay exact
+        self.tri = tri = tri[self.order]
+
+        n_leaves = max(1, -(-n_tris // leaf_size))
+        self.n_leaf_slots = 1 << int(np.ceil(np.log2(n_leaves)))
+        n_nodes = 2 * self.n_leaf_slots - 1
+        self.lo = np.full((n_nodes, 3), np.inf, dtype=np.float32)
+        self.hi = np.full((n_nodes, 3), -np.inf, dtype=np.float32)
+
+        first_leaf = self.n_leaf_slots - 1
+        if n_tris:
+            starts = np.arange(0, n_tris, leaf_size)
+            self.lo[first_leaf:first_leaf + n_leaves] = np.minimum.reduceat(tri.min(axis=1), starts, axis=0)
+            self.hi[first_leaf:first_leaf + n_leaves] = np.maximum.reduceat(tri.max(axis=1), starts, axis=0)
+        # Bottom-up, one vectorized reduction per level
+        level_start = first_leaf
+        while level_start > 0:
+            parents = np.arange((level_start - 1) // 2, level_start)
+            self.lo[parents] = np.minimum(self.lo[2 * parents + 1], self.lo[2 * parents + 2])
+            self.hi[parents] = np.maximum(self.hi[2 * parents + 1], self.hi[2 * parents + 2])
+            level_start = parents[0]
+        # Padding slots (and parents of padding only) keep inverted bounds and are never visited
+        self.occupied = (self.lo <= self.hi).all(axis=1)
+        self.n_tris = n_tris
+
+    @property
+    def nbytes(self) -> int:
+        return self.tri.nbytes + self.order.nbytes + self.lo.nbytes + self.hi.nbytes + self.occupied.nbytes
+
+    def raycast(self, origins: np.ndarray, directions: np.ndarray, max_distance: float = np.inf):
+        """
+        Closest hit per ray. Directions need not be unit length; t is in units of the direction.
+        Returns (t, face_index, u, v) arrays; misses have t = inf and face_index = -1.
+        """
+        origins = np.asarray(origins, dtype=np.float64).reshape(-1, 3)
+        directions = np.asarray(directions, dtype=np.float64).reshape(-1, 3)
+        n_rays = len(origins)
+        best_t = np.full(n_rays, float(max_distance))
+        best_face = np.full(n_rays, -1, dtype=np.int64)
+        best_u = np.zeros(n_rays)
+        best_v = np.zeros(n_rays)
+        if self.n_tris == 0 or n_rays == 0:
+            return np.full(n_rays, np.inf), best_face, best_u, best_v
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            inv_dir = 1.0 / directions
+        first_leaf = self.n_leaf_slots - 1
+
+        # Frontier of (ray, node) pairs, traversed breadth-first for all rays at once
+        rays = np.arange(n_rays)
+        nodes = np.zeros(n_rays, dtype=np.int64)
+        while len(rays):
+            o, inv = origins[rays], inv_dir[rays]
+            with np.errstate(invalid="ignore"):
+                t1 = (self.lo[nodes] - o) * inv
+                t2 = (self.hi[nodes] - o) * inv
+            # 0 * inf = NaN: the ray is parallel to an axis and starts on that slab's plane,
+            # so the axis puts no limit on t
+            near, far = np.minimum(t1, t2), np.maximum(t1, t2)
+            t_near = np.where(np.isnan(near), -np.inf, near).max(axis=1)
+            t_far = np.where(np.isnan(far), np.inf, far).min(axis=1)
+            hit = (t_near <= t_far) & (t_far >= 0) & (t_near <= best_t[rays])
+            rays, nodes = rays[hit], nodes[hit]
+
+            leaf = nodes >= first_leaf
+            if leaf.any():
+                self._intersect_leaves(origins, directions, rays[leaf], nodes[leaf] - first_leaf,
+                                       best_t, best_face, best_u, best_v)
+            rays, nodes = rays[~leaf], nodes[~leaf]
+            rays = np.repeat(rays, 2)
+            nodes = np.stack([2 * nodes + 1, 2 * nodes + 2], axis=1).ravel()
+            keep = self.occupied[nodes]
+            rays, nodes = rays[keep], nodes[keep]
+
+        t = np.where(best_face >= 0, best_t, np.inf)
+        face = np.where(best_face >= 0, self.order[np.maximum(best_face, 0)], -1)
+        return t, face, best_u, best_v
+
+    def _intersect_leaves(self, origins, directions, rays, leaves, best_t, best_face, best_u, best_v):
+        """Möller–Trumbore for every (ray, triangle in leaf) pair, keeping the closest hit per ray."""
+        offsets = np.arange(self.leaf_size)
+        tris = (leaves[:, None] * self.leaf_size + offsets).ravel()
+        rays = np.repeat(rays, self.leaf_size)
+        valid = tris < self.n_tris
+        tris, rays = tris[valid], rays[valid]
+
+        d = directions[rays]
+        corners = self.tri[tris].astype(np.float64)
+        v0 = corners[:, 0]
+        e1, e2 = corners[:, 1] - v0, corners[:, 2] - v0
+        p = np.cross(d, e2)
+        det = (e1 * p).sum(axis=1)
+        ok = np.abs(det) > _EPS
+        inv_det = np.divide(1.0, det, out=np.zeros_like(det), where=ok)
+        s = origins[rays] - v0
+        u = (s * p).sum(axis=1) * inv_det
+        q = np.cross(s, e1)
+        v = (d * q).sum(axis=1) * inv_det
+        t = (e2 * q).sum(axis=1) * inv_det
+        ok &= (u >= -_BARY_EPS) & (v >= -_BARY_EPS) & (u + v <= 1 + _BARY_EPS) & (t >= 0) & (t < best_t[rays])
+        if not ok.any():
+            return
+        rays, tris, t, u, v = rays[ok], tris[ok], t[ok], u[ok], v[ok]
+        # Closest per ray: sort by (ray, t) and take the first of each run
+        order = np.lexsort((t, rays))
+        rays, tris, t, u, v = rays[order], tris[order], t[order], u[order], v[order]
+        first = np.ones(len(rays), dtype=bool)
+        first[1:] = rays[1:] != rays[:-1]
+        rays, tris, t, u, v = rays[first], tris[first], t[first], u[first], v[first]
+        closer = t < best_t[rays]
+        rays = rays[closer]
+        best_t[rays] = t[closer]
+        best_face[rays] = tris[closer]
+        best_u[rays] = u[closer]
+        best_v[rays] = v[closer]
+
+def get_mesh_bvh(mesh_data: SceneMeshData) -> Optional[MeshBVH]:
+    """
+    BVH built once per mesh content, held only in a byte-bounded LRU. The mesh
+    keeps just its content key (dropped with its derived data when geometry changes).
+    """
+    global _cached_bytes
+    if mesh_data.indices is None or len(mesh_data.indices) == 0:
+        return None
+    key = mesh_data._derived.get("bvh_key")
+    if key is None:
+        # get_hash covers vertices and materials only; the tree also depends on the faces
+        key = f"{mesh_data.get_hash()}:{hashlib.md5(np.ascontiguousarray(mesh_data.indices).tobytes()).hexdigest()}"
+        mesh_data._derived["bvh_key"] = key
+    bvh = _bvh_cache.get(key)
+    if bvh is not None:
+        _bvh_cache.move_to_end(key)
+        return bvh
+    bvh = MeshBVH(mesh_data.vertices, mesh_data.indices)
+    _bvh_cache[key] = bvh
+    _cached_bytes += bvh.nbytes
+    # The newest tree always stays, even if it alone exceeds the budget
+    while _cached_bytes > _MAX_CACHED_BYTES and len(_bvh_cache) > 1:
+        _, evicted = _bvh_cache.popitem(last=False)
+        _cached_bytes -= evicted.nbytes
+    return bvh
+
+def raycast_scene(item_ids: Sequence[str], origins, directions, up_direction: str = "Y",
+                  max_distance: float = np.inf) -> List[Optional[dict]]:
+    """
+    Cast world-space rays (the viewer's assembled space, up_direction applied)
+    against registry ids. Returns one dict per ray (None on miss): node_id, mesh_id,
+    face_index, material_index, material_name, distance, point.
+    """
+    from .scene_registry import registry
+
+    origins = np.asarray(origins, dtype=np.float64).reshape(-1, 3)
+    directions = np.asarray(directions, dtype=np.float64).reshape(-1, 3)
+    n_rays = len(origins)
+    best_t = np.full(n_rays, float(max_distance))
+    hits: List[Optional[dict]] = [None] * n_rays
+    scene_rot = up_direction_matrix(up_direction)
+
+    matrices, leaves = transform_index.resolve_many(list(item_ids))
+    for item_id, matrix, leaf_id in zip(item_ids, matrices, leaves):
+        mesh_data = registry.get_mesh(leaf_id) if leaf_id else None
+        bvh = get_mesh_bvh(mesh_data) if mesh_data is not None else None
+        if bvh is None:
+            continue
+        # Rays into mesh space; the direction keeps its scale so t stays a world-space parameter
+        inv = np.linalg.inv(scene_rot @ matrix)
+        local_o = origins @ inv[:3, :3].T + inv[:3, 3]
+        local_d = directions @ inv[:3, :3].T
+        t, face, _, _ = bvh.raycast(local_o, local_d, max_distance)
+        for r in np.flatnonzero((face >= 0) & (t < best_t)):
+            best_t[r] = t[r]
+            f = int(face[r])
+            mat_idx = int(mesh_data.face_material_indices[f]) if mesh_data.face_material_indices is not None else 0
+            mat = mesh_data.materials[mat_idx] if mat_idx < len(mesh_data.materials) else {}
+            hits[r] = {
+                "node_id": item_id,
+                "mesh_id": leaf_id,
+                "face_index": f,
+                "material_index": mat_idx,
+                "material_name": mat.get("name", ""),
+                "distance": float(t[r]),
+                "point": (origins[r] + directions[r] * t[r]).tolist(),
+            }
+    return hits
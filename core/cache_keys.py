@@ -0,0 +1,30 @@
+import hashlib
+from .scene_registry import registry
+
+# Widgets that only change how the viewer draws; they never reach the registry or the baked files
+VIEW_ONLY_PARAMS = frozenset({
+    "fov", "exposure", "bg_color", "grid_size", "material_mode", "show_preview", "show_stats",
+})
+
+def input_signature(kwargs: dict, id_prefix: str = "mesh_id") -> str:
+    """
+    IS_CHANGED hash over the inputs that affect geometry. View-only widgets are
+    skipped and registry id inputs hash their content, so a re-registered id
+    with the same content does not trigger downstream work.
+    """
+    h = hashlib.md5()
+    for key, val in sorted(kwargs.items()):
+        if val is None or key in VIEW_ONLY_PARAMS:
+            continue
+        h.update(key.encode())
+        if key.startswith(id_prefix):
+            for item_id in (val if isinstance(val, list) else [val]):
+                item = registry.get_any(item_id) if isinstance(item_id, str) else None
+                h.update(item.get_hash().encode() if item else str(item_id).encode())
+        else:
+            h.update(str(val).encode())
+    return h.hexdigest()
+
+def content_node_id(node_data) -> str:
+    """Deterministic registry id for a node: the same mesh and matrix always get the same id."""
+    return f"node_{node_data.get_hash()[:16]}"
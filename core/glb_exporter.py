@@ -1,122 +1,149 @@
-import trimesh
+import sys
 import numpy as np
-import torch
-import os
 from PIL import Image
-from typing import List
+from typing import List, Optional
 from .scene_registry import registry
-from .mesh_model import SceneNodeData, SceneMeshData
-from .transform_utils import apply_transform
+from .mesh_model import SceneNodeData, SceneMeshData, base_color_texture_key
+from .transform_utils import apply_transform, transform_normals, up_direction_matrix
+from .transform_index import transform_index
+from .baked_scene import BakedScene, bake_key, get_cached_bake, store_bake
 
 class GLBExporter:
     @staticmethod
     def gather_node_data(node_id, current_transform=None):
         """
-        Recursively trace nodes and meshes to get final baked state.
+        Resolve a node chain to its final baked state via the cached transform index.
         Returns a list of (mesh_data, final_transform).
         """
-        if current_transform is None:
-            current_transform = np.eye(4)
-            
-        item = registry.get_any(node_id)
-        if not item:
+        resolved = transform_index.resolve(node_id)
+        if resolved is None:
             return []
-            
-        if isinstance(item, SceneNodeData):
-            # Transform stacking: New = Parent * Child
-            new_transform = current_transform @ item.transform
-            return GLBExporter.gather_node_data(item.mesh_id, new_transform)
-        elif isinstance(item, SceneMeshData):
-            return [(item, current_transform)]
-        return []
+        world, leaf_id = resolved
+        mesh_data = registry.get_mesh(leaf_id)
+        if mesh_data is None:
+            return []
+        if current_transform is not None:
+            world = current_transform @ world
+        return [(mesh_data, world)]
+
     @staticmethod
-    def export(node_ids: List[str], output_path: str, add_preview_helpers: bool = False, 
-               file_type: str = 'glb', up_direction: str = "Y"):
+    def gather_all(node_ids: List[str]):
         """
-        Bake transforms, merge meshes, and export a single 3D file with multi-material support.
+        Bulk variant of gather_node_data for many roots in one resolve call.
+        Returns a list of (mesh_data, final_transform), skipping broken chains.
+        """
+        matrices, leaves = transform_index.resolve_many(node_ids)
+        items = []
+        for matrix, leaf_id in zip(matrices, leaves):
+            mesh_data = registry.get_mesh(leaf_id) if leaf_id else None
+            if mesh_data is not None:
+                items.append((mesh_data, matrix))
+        return items
+
+    @staticmethod
+    def bake_primitives(node_ids: List[str], up_direction: str = "Y"):
+        """
+        Bake transforms and split every resolved mesh into one primitive per material.
+        Each primitive only keeps the vertices its faces reference.
+        Returns a list of dicts: positions, normals, uvs, indices, material,
+        texture (PIL.Image or None), name, node_id, mesh_id, material_index.
         """
-        combined_meshes = []
-        
         # 🔄 Scene-wide Orientation Matrix (Convert to standard Y-up GLTF)
         # We rotate the entire assembly to match the desired Up direction
-        scene_rot = np.eye(4)
-        if up_direction == "Z":
-            from .transform_utils import create_trs_matrix
-            # Match JS: .makeRotationX(-Math.PI / 2)
-            scene_rot = create_trs_matrix(rotation=(-90, 0, 0))
-        elif up_direction == "-Y":
-            from .transform_utils import create_trs_matrix
-            # Match JS: .makeRotationX(Math.PI)
-            scene_rot = create_trs_matrix(rotation=(180, 0, 0))
-        elif up_direction == "-Z":
-            from .transform_utils import create_trs_matrix
-            # Match JS: .makeRotationX(Math.PI / 2)
-            scene_rot = create_trs_matrix(rotation=(90, 0, 0))
+        scene_rot = up_direction_matrix(up_direction)
 
         # ⚡ Gather all meshes from all branches (Supports deep chains)
-        all_items = []
-        for root_id in node_ids:
-            all_items.extend(GLBExporter.gather_node_data(root_id))
+        matrices, leaves = transform_index.resolve_many(node_ids)
+        primitives = []
 
-        for mesh_data, node_transform in all_items:
+        for root_id, node_transform, leaf_id in zip(node_ids, matrices, leaves):
+            mesh_data = registry.get_mesh(leaf_id) if leaf_id else None
+            if mesh_data is None or mesh_data.indices is None:
+                continue
             # Combine scene orientation with recursive local transform
-            final_transform = scene_rot @ node_transform
-            
-            mat_indices = mesh_data.face_material_indices
-            if mat_indices is None:
-                mat_indices = np.zeros(len(mesh_data.indices), dtype=np.int32)
-            
-            unique_mats = np.unique(mat_indices)
-            
-            # Baked positions
-            baked_vertices = apply_transform(mesh_data.vertices, final_transform)
-            
-            # Baked normals (Rotation only)
-            baked_normals = None
-            if mesh_data.normals is not None:
-                rot_part = final_transform[:3, :3]
-                baked_normals = mesh_data.normals @ rot_part.T
-                # Normalize results
-                norm_lens = np.linalg.norm(baked_normals, axis=1, keepdims=True)
-                baked_normals = np.divide(baked_normals, norm_lens, out=np.zeros_like(baked_normals), where=norm_lens!=0)
+            primitives.extend(GLBExporter.split_mesh(mesh_data, scene_rot @ node_transform, root_id, leaf_id))
+        return primitives
+
+    @staticmethod
+    def split_mesh(mesh_data: SceneMeshData, final_transform: np.ndarray, root_id: str, leaf_id: str):
+        """One baked primitive per material of a single mesh (see bake_primitives)."""
+        mat_indices = mesh_data.face_material_indices
+        if mat_indices is None:
+            mat_indices = np.zeros(len(mesh_data.indices), dtype=np.int32)
+
+        # Baked positions
+        baked_vertices = apply_transform(mesh_data.vertices, final_transform)
 
-            for m_idx in unique_mats:
-                face_mask = (mat_indices == m_idx)
-                sub_faces = mesh_data.indices[face_mask]
-                
-                tm = trimesh.Trimesh(
-                    vertices=baked_vertices,
-                    faces=sub_faces,
-                    vertex_normals=baked_normals,
-                    process=False
-                )
-                
-                if mesh_data.uvs is not None:
-                    tm.visual = trimesh.visual.TextureVisuals(uv=mesh_data.uvs)
+        # Baked normals (renormalized only under non-uniform scale); computed lazily when the file had none
+        baked_normals = None
+        normals = mesh_data.get_vertex_normals()
+        if normals is not None:
+            baked_normals = transform_normals(normals, final_transform)
 
-                mat_def = mesh_data.materials[m_idx] if m_idx < len(mesh_data.materials) else {"base_color": [0.8, 0.8, 0.8, 1.0]}
-                
-                tex_key = 'base_color_texture' if m_idx == 0 else f'base_color_texture_{m_idx}'
-                base_color_tex = mesh_data.textures.get(tex_key)
-                
-                if base_color_tex is not None and isinstance(base_color_tex, torch.Tensor):
-                    try:
-                        t = base_color_tex
-                        if t.dim() == 4: t = t[0]
-                        img_np = (t.cpu().detach().numpy() * 255).astype(np.uint8)
-                        base_color_tex = Image.fromarray(img_np)
-                    except: pass
+        primitives = []
+        for m_idx in np.unique(mat_indices):
+            sub_faces = mesh_data.indices[mat_indices == m_idx]
+            # Compact to the vertices this material actually uses
+            used, remapped = np.unique(sub_faces, return_inverse=True)
+            mat_def = mesh_data.materials[m_idx] if m_idx < len(mesh_data.materials) else {"base_color": [0.8, 0.8, 0.8, 1.0]}
+
+            primitives.append({
+                "name": f"{root_id}_{int(m_idx)}",
+                "node_id": root_id,
+                "mesh_id": leaf_id,
+                "material_index": int(m_idx),
+                "positions": baked_vertices[used],
+                "normals": baked_normals[used] if baked_normals is not None else None,
+                "uvs": mesh_data.uvs[used] if mesh_data.uvs is not None else None,
+                "indices": remapped.reshape(-1, 3).astype(np.uint32),
+                "material": mat_def,
+                "texture": texture_to_image(mesh_data.textures.get(base_color_texture_key(int(m_idx)))),
+            })
+        return primitives
+
+    @staticmethod
+    def bake(node_ids: List[str], up_direction: str = "Y", batch: bool = False) -> BakedScene:
+        """
+        Bake once into a BakedScene that can be written to any number of outputs.
+        Cached by input hash, so repeated exports of the same inputs only serialize.
+        With batch, primitives sharing a material by value are merged across inputs.
+        """
+        matrices, leaves = transform_index.resolve_many(node_ids)
+        meshes = [registry.get_mesh(leaf) if leaf else None for leaf in leaves]
+        key = bake_key(node_ids, matrices, leaves, meshes, up_direction)
+        baked = get_cached_bake(key)
+        if baked is None:
+            baked = BakedScene(GLBExporter.bake_primitives(node_ids, up_direction), up_direction, key=key)
+            store_bake(baked)
+        if batch:
+            batched = get_cached_bake(f"{key}:batched")
+            if batched is None:
+                batched = baked.batched()
+                store_bake(batched)
+            return batched
+        return baked
+
+    @staticmethod
+    def export(node_ids: List[str], output_path: str, add_preview_helpers: bool = False, 
+               file_type: str = 'glb', up_direction: str = "Y", quantization: Optional[dict] = None,
+               batch: bool = False):
+        """
+        Bake transforms, merge meshes, and export a single 3D file with multi-material support.
+        With quantization (see gltf_writer.DEFAULT_QUANTIZATION) a glb is written with
+        KHR_mesh_quantization. Returns False if nothing was exported, else True
+        (or the quantization stats dict). batch merges primitives by material across inputs.
+        """
+        return GLBExporter.bake(node_ids, up_direction, batch).write(output_path, file_type, quantization)
 
-                pbr = trimesh.visual.material.PBRMaterial(
-                    baseColorFactor=mat_def.get('base_color', [0.8, 0.8, 0.8, 1.0]),
-                    metallicFactor=mat_def.get('metallic', 0.0),
-                    roughnessFactor=mat_def.get('roughness', 0.5),
-                    baseColorTexture=base_color_tex if isinstance(base_color_tex, Image.Image) else None
-                )
-                tm.visual.material = pbr
-                combined_meshes.append(tm)
-            
-        if not combined_meshes: return False
-        scene = trimesh.Scene(combined_meshes)
-        scene.export(output_path, file_type=file_type)
-        return True
+def texture_to_image(tex):
+    """Convert a base color texture (PIL.Image or ComfyUI IMAGE tensor) to PIL, None if unusable."""
+    # torch is only consulted if something already loaded it (ComfyUI IMAGE inputs)
+    torch = sys.modules.get("torch")
+    if tex is not None and torch is not None and isinstance(tex, torch.Tensor):
+        try:
+            t = tex
+            if t.dim() == 4: t = t[0]
+            img_np = (t.cpu().detach().numpy() * 255).astype(np.uint8)
+            tex = Image.fromarray(img_np)
+        except: pass
+    return tex if isinstance(tex, Image.Image) else None
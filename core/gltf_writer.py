@@ -0,0 +1,281 @@
+import io
+import json
+import struct
+import numpy as np
+from typing import Any, Dict, List, Optional
+
+# glTF constants
+FLOAT = 5126
+BYTE = 5120
+UNSIGNED_BYTE = 5121
+SHORT = 5122
+UNSIGNED_SHORT = 5123
+UNSIGNED_INT = 5125
+ARRAY_BUFFER = 34962
+ELEMENT_ARRAY_BUFFER = 34963
+
+_COMPONENT_TYPES = {
+    np.dtype(np.float32): FLOAT, np.dtype(np.int8): BYTE, np.dtype(np.uint8): UNSIGNED_BYTE,
+    np.dtype(np.int16): SHORT, np.dtype(np.uint16): UNSIGNED_SHORT, np.dtype(np.uint32): UNSIGNED_INT,
+}
+_TYPES = {1: "SCALAR", 2: "VEC2", 3: "VEC3", 4: "VEC4"}
+
+DEFAULT_QUANTIZATION = {"position_bits": 14, "normal_bits": 8, "uv_bits": 12}
+
+def _pad_rows(arr, row_bytes):
+    """Pad each element to a 4-byte multiple (glTF vertex stride rule). Returns (bytes, stride)."""
+    stride = (row_bytes + 3) & ~3
+    if stride == row_bytes:
+        return arr.tobytes(), None
+    out = np.zeros((len(arr), stride), dtype=np.uint8)
+    out[:, :row_bytes] = arr.view(np.uint8).reshape(len(arr), row_bytes)
+    return out.tobytes(), stride
+
+class GLTFBuilder:
+    """
+    Minimal binary glTF 2.0 writer over NumPy arrays.
+    One glTF mesh + node per primitive so each node can carry its own
+    (de)quantization transform.
+    """
+
+    def __init__(self):
+        self.gltf: Dict[str, Any] = {
+            "asset": {"version": "2.0", "generator": "mixo3dtools"},
+            "scene": 0, "scenes": [{"nodes": []}],
+            "nodes": [], "meshes": [], "materials": [], "accessors": [], "bufferViews": [],
+            "buffers": [{"byteLength": 0}],
+        }
+        self.extensions_used = set()
+        self.extensions_required = set()
+        self._bin = bytearray()
+        self._image_cache = {}
+        self.max_position_error = 0.0
+
+    # -- low level ---------------------------------------------------------
+    def add_buffer_view(self, data: bytes, target=None, stride=None) -> int:
+        offset = (len(self._bin) + 3) & ~3
+        self._bin.extend(b"\x00" * (offset - len(self._bin)))
+        self._bin.extend(data)
+        view = {"buffer": 0, "byteOffset": offset, "byteLength": len(data)}
+        if target is not None:
+            view["target"] = target
+        if stride is not None:
+            view["byteStride"] = stride
+        self.gltf["bufferViews"].append(view)
+        return len(self.gltf["bufferViews"]) - 1
+
+    def add_accessor(self, arr: np.ndarray, target=ARRAY_BUFFER, normalized=False, with_bounds=False) -> int:
+        arr = np.ascontiguousarray(arr)
+        comps = 1 if arr.ndim == 1 else arr.shape[1]
+        if target == ARRAY_BUFFER:
+            data, stride = _pad_rows(arr, comps * arr.dtype.itemsize)
+        else:
+            data, stride = arr.tobytes(), None
+        accessor = {
+            "bufferView": self.add_buffer_view(data, target, stride),
+            "componentType": _COMPONENT_TYPES[arr.dtype],
+            "count": int(len(arr)),
+            "type": _TYPES[comps],
+        }
+        if normalized:
+            accessor["normalized"] = True
+        if with_bounds and len(arr):
+            cast = float if arr.dtype.kind == "f" else int
+            accessor["min"] = [cast(v) for v in np.atleast_1d(arr.min(axis=0))]
+            accessor["max"] = [cast(v) for v in np.atleast_1d(arr.max(axis=0))]
+        self.gltf["accessors"].append(accessor)
+        return len(self.gltf["accessors"]) - 1
+
+    def add_material(self, mat_def: dict, image=None) -> int:
+        base_color = list(mat_def.get("base_color", [0.8, 0.8, 0.8, 1.0]))
+        material = {
+            "name": str(mat_def.get("name", f"Material_{len(self.gltf['materials'])}")),
+            "pbrMetallicRoughness": {
+                "baseColorFactor": [float(c) for c in base_color],
+                "metallicFactor": float(mat_def.get("metallic", 0.0)),
+                "roughnessFactor": float(mat_def.get("roughness", 0.5)),
+            },
+        }
+        if len(base_color) > 3 and base_color[3] < 1.0:
+            material["alphaMode"] = "BLEND"
+        if image is not None:
+            material["pbrMetallicRoughness"]["baseColorTexture"] = {"index": self._add_texture(image)}
+        self.gltf["materials"].append(material)
+        return len(self.gltf["materials"]) - 1
+
+    def _add_texture(self, image) -> int:
+        key = id(image)
+        if key not in self._image_cache:
+            buf = io.BytesIO()
+            image.save(buf, format="PNG")
+            self.gltf.setdefault("images", []).append(
+                {"bufferView": self.add_buffer_view(buf.getvalue()), "mimeType": "image/png"})
+            if "samplers" not in self.gltf:
+                self.gltf["samplers"] = [{"magFilter": 9729, "minFilter": 9987, "wrapS": 10497, "wrapT": 10497}]
+            self.gltf.setdefault("textures", []).append(
+                {"sampler": 0, "source": len(self.gltf["images"]) - 1})
+            self._image_cache[key] = len(self.gltf["textures"]) - 1
+        return self._image_cache[key]
+
+    # -- primitives --------------------------------------------------------
+    def add_primitive_node(self, prim: dict, material_index: int, quantize: Optional[dict] = None,
+                           parent: Optional[int] = None) -> int:
+        """
+        prim: {"positions", "indices", optional "normals", "uvs", "name"}.
+        Returns the node index. With quantize, attributes are stored as
+        normalized integers and the node carries the dequantization transform.
+        """
+        node = {"name": str(prim.get("name", f"node_{len(self.gltf['nodes'])}"))}
+        primitive = self._build_primitive(prim, material_index, quantize, node)
+        self.gltf["meshes"].append({"name": node["name"], "primitives": [primitive]})
+        node["mesh"] = len(self.gltf["meshes"]) - 1
+        return self.add_node(node, parent)
+
+    def add_mesh(self, name: str, primitives: List[tuple]) -> int:
+        """One glTF mesh from [(prim, material_index)] (float attributes); nodes may share it."""
+        self.gltf["meshes"].append({
+            "name": name,
+            "primitives": [self._build_primitive(prim, mat_index) for prim, mat_index in primitives],
+        })
+        return len(self.gltf["meshes"]) - 1
+
+    def _build_primitive(self, prim: dict, material_index: int, quantize: Optional[dict] = None,
+                         node: Optional[dict] = None) -> dict:
+        """Write the attribute accessors; with quantize, node receives the dequantization transform."""
+        positions = np.asarray(prim["positions"], dtype=np.float64)
+        attributes = {}
+
+        if quantize:
+            q_pos, translation, scale, err = quantize_positions(positions, quantize.get("position_bits", 14))
+            self.max_position_error = max(self.max_position_error, err)
+            attributes["POSITION"] = self.add_accessor(q_pos, normalized=True, with_bounds=True)
+            node["translation"] = translation
+            node["scale"] = [scale, scale, scale]
+            self.extensions_used.add("KHR_mesh_quantization")
+            self.extensions_required.add("KHR_mesh_quantization")
+        else:
+            attributes["POSITION"] = self.add_accessor(positions.astype(np.float32), with_bounds=True)
+
+        normals = prim.get("normals")
+        if normals is not None:
+            if quantize:
+                attributes["NORMAL"] = self.add_accessor(quantize_unit(normals, quantize.get("normal_bits", 8)), normalized=True)
+            else:
+                attributes["NORMAL"] = self.add_accessor(np.asarray(normals, dtype=np.float32))
+
+        uvs = prim.get("uvs")
+        if uvs is not None:
+            # SceneMeshData uvs follow trimesh (origin bottom-left); glTF is top-left
+            uvs = np.asarray(uvs, dtype=np.float64) * [1.0, -1.0] + [0.0, 1.0]
+            q_uv = quantize_uvs(uvs, quantize.get("uv_bits", 12)) if quantize else None
+            if q_uv is not None:
+                attributes["TEXCOORD_0"] = self.add_accessor(q_uv, normalized=True)
+            else:
+                # Tiling UVs (outside 0..1) cannot use normalized unsigned storage
+                attributes["TEXCOORD_0"] = self.add_accessor(np.asarray(uvs, dtype=np.float32))
+
+        indices = np.asarray(prim["indices"]).ravel()
+        index_dtype = np.uint16 if len(positions) < 65536 else np.uint32
+        return {
+            "attributes": attributes,
+            "indices": self.add_accessor(indices.astype(index_dtype), target=ELEMENT_ARRAY_BUFFER),
+            "material": material_index,
+        }
+
+    def add_node(self, node: dict, parent: Optional[int] = None) -> int:
+        self.gltf["nodes"].append(node)
+        idx = len(self.gltf["nodes"]) - 1
+        if parent is None:
+            self.gltf["scenes"][0]["nodes"].append(idx)
+        else:
+            self.gltf["nodes"][parent].setdefault("children", []).append(idx)
+        return idx
+
+    # -- animation ---------------------------------------------------------
+    def add_animation(self, name: str, channels: List[tuple]) -> int:
+        """
+        channels: [(node_index, path, times (K,), values (K, C))] with path
+        "translation" | "rotation" (xyzw quaternions) | "scale", LINEAR interpolation.
+        """
+        animation = {"name": name, "channels": [], "samplers": []}
+        input_cache = {}
+        for node_index, path, times, values in channels:
+            times = np.asarray(times, dtype=np.float32)
+            key = times.tobytes()
+            if key not in input_cache:
+                # Keyframe times are shared between tracks with identical reductions
+                input_cache[key] = self.add_accessor(times, target=None, with_bounds=True)
+            animation["samplers"].append({
+                "input": input_cache[key],
+                "output": self.add_accessor(np.asarray(values, dtype=np.float32), target=None),
+                "interpolation": "LINEAR",
+            })
+            animation["channels"].append({
+                "sampler": len(animation["samplers"]) - 1,
+                "target": {"node": int(node_index), "path": path},
+            })
+        self.gltf.setdefault("animations", []).append(animation)
+        return len(self.gltf["animations"]) - 1
+
+    # -- output ------------------------------------------------------------
+    def to_bytes(self) -> bytes:
+        gltf = {k: v for k, v in self.gltf.items() if v != []}
+        gltf["buffers"] = [{"byteLength": len(self._bin)}]
+        if self.extensions_used:
+            gltf["extensionsUsed"] = sorted(self.extensions_used)
+        if self.extensions_required:
+            gltf["extensionsRequired"] = sorted(self.extensions_required)
+
+        json_bytes = json.dumps(gltf, separators=(",", ":")).encode()
+        json_bytes += b" " * (-len(json_bytes) % 4)
+        bin_bytes = bytes(self._bin) + b"\x00" * (-len(self._bin) % 4)
+        total = 12 + 8 + len(json_bytes) + 8 + len(bin_bytes)
+        return b"".join([
+            struct.pack("<III", 0x46546C67, 2, total),
+            struct.pack("<II", len(json_bytes), 0x4E4F534A), json_bytes,
+            struct.pack("<II", len(bin_bytes), 0x004E4942), bin_bytes,
+        ])
+
+    def write(self, path: str):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+# -- quantization helpers (KHR_mesh_quantization) ----------------------------
+def quantize_positions(positions, bits=14):
+    """
+    Normalized int16 positions with `bits` of precision over the primitive's bounds.
+    A uniform node scale keeps normals valid. Returns (q, translation, scale, max_error).
+    """
+    bits = int(min(max(bits, 2), 16))
+    lo, hi = positions.min(axis=0), positions.max(axis=0)
+    center = (lo + hi) / 2.0
+    half = float((hi - lo).max()) / 2.0 or 1.0
+    levels = (1 << (bits - 1)) - 1
+    shift = 16 - bits
+
+    q = np.clip(np.round((positions - center) / half * levels), -levels, levels).astype(np.int32)
+    error = float(np.linalg.norm(center + q * (half / levels) - positions, axis=1).max()) if len(q) else 0.0
+    stored = (q << shift).astype(np.int16)
+    # dequantized = translation + scale * stored / 32767
+    scale = half * 32767.0 / (levels << shift)
+    return stored, [float(c) for c in center], float(scale), error
+
+def quantize_unit(vectors, bits=8):
+    """Unit vectors as normalized int8 (bits <= 8) or int16."""
+    v = np.asarray(vectors, dtype=np.float64)
+    if bits <= 8:
+        return np.clip(np.round(v * 127.0), -127, 127).astype(np.int8)
+    return np.clip(np.round(v * 32767.0), -32767, 32767).astype(np.int16)
+
+def quantize_uvs(uvs, bits=12):
+    """UVs as normalized uint8/uint16 with `bits` of precision, None if outside [0, 1]."""
+    uv = np.asarray(uvs, dtype=np.float64)
+    if len(uv) and (uv.min() < 0.0 or uv.max() > 1.0):
+        return None
+    bits = int(min(max(bits, 2), 16))
+    levels = (1 << bits) - 1
+    # Snap to the `bits` grid, then spread over the full storage range so 1.0 stays exact
+    snapped = np.round(uv * levels) / levels
+    if bits <= 8:
+        return np.round(snapped * 255.0).astype(np.uint8)
+    return np.round(snapped * 65535.0).astype(np.uint16)
@@ -0,0 +1,149 @@
+import json
+import fnmatch
+from typing import Any, Dict, List, Optional
+import numpy as np
+from .mesh_model import SceneMeshData, base_color_texture_key
+
+# Highest material slot an edit may create (matches the inspector's material_index widget)
+MAX_MATERIAL_INDEX = 128
+
+def clone_mesh_data(mesh_data: SceneMeshData) -> SceneMeshData:
+    """Shallow clone for material edits: geometry arrays are shared, materials/textures are copied."""
+    face_indices = mesh_data.face_material_indices
+    if face_indices is None:
+        face_indices = np.zeros(len(mesh_data.indices), dtype=np.int32)
+    return SceneMeshData(
+        vertices=mesh_data.vertices,
+        indices=mesh_data.indices,
+        normals=mesh_data.normals,
+        uvs=mesh_data.uvs,
+        textures=mesh_data.textures.copy(),
+        materials=[dict(m) for m in mesh_data.materials],
+        face_material_indices=face_indices,
+        metadata=mesh_data.metadata.copy()
+    )
+
+def ensure_material_slot(mesh_data: SceneMeshData, material_index: int):
+    """Append generated materials until material_index exists."""
+    while len(mesh_data.materials) <= material_index:
+        new_mat_idx = len(mesh_data.materials)
+        mesh_data.materials.append({
+            "name": f"GeneratedShader_{new_mat_idx}",
+            "base_color": [0.8, 0.8, 0.8, 1.0],
+            "roughness": 0.5,
+            "metallic": 0.0
+        })
+
+def parse_color(value) -> Optional[List[float]]:
+    """'#rrggbb[aa]', [r, g, b] or [r, g, b, a] (0..1) -> [r, g, b, a]."""
+    if value is None or value == "-" or value == "":
+        return None
+    if isinstance(value, str):
+        hex_str = value.strip().lstrip("#")
+        if len(hex_str) not in (6, 8):
+            raise ValueError(f"Bad color: {value}")
+        rgba = [int(hex_str[i:i + 2], 16) / 255.0 for i in range(0, len(hex_str), 2)]
+    else:
+        rgba = [float(c) for c in value]
+    if len(rgba) == 3:
+        rgba.append(1.0)
+    return rgba[:4]
+
+def parse_material_edits(text: str) -> List[Dict[str, Any]]:
+    """
+    Edits as a JSON list of objects, or one table row per line:
+        selector, color, metallic, roughness[, texture]
+    selector is a material index or a name pattern (fnmatch, case-insensitive);
+    '-' keeps a column unchanged. Lines starting with '#' are comments.
+    """
+    text = (text or "").strip()
+    if not text:
+        return []
+    if text.startswith("["):
+        edits = json.loads(text)
+        if not isinstance(edits, list):
+            raise ValueError("Material edits JSON must be a list")
+        return edits
+
+    edits = []
+    for row, line in enumerate(text.splitlines(), 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        cols = [c.strip() for c in line.split(",")]
+        cols += ["-"] * (5 - len(cols))
+        selector, color, metallic, roughness, texture = cols[:5]
+        try:
+            edit: Dict[str, Any] = {"index": check_material_index(selector)} if selector.isdigit() else {"name": selector}
+            if color != "-":
+                parse_color(color)  # validate here so the error can name the row
+                edit["color"] = color
+            if metallic != "-": edit["metallic"] = float(metallic)
+            if roughness != "-": edit["roughness"] = float(roughness)
+        except ValueError as e:
+            raise ValueError(f"Row {row} '{line}': {e}") from e
+        if texture != "-": edit["texture"] = texture
+        edits.append(edit)
+    return edits
+
+def check_material_index(value) -> int:
+    """Material index as an int, ValueError outside 0..MAX_MATERIAL_INDEX."""
+    index = int(value)
+    if not 0 <= index <= MAX_MATERIAL_INDEX:
+        raise ValueError(f"Material index {index} outside 0..{MAX_MATERIAL_INDEX}")
+    return index
+
+def select_materials(mesh_data: SceneMeshData, edit: Dict[str, Any]) -> List[int]:
+    """Material indices matched by an edit's 'index' (int or list) or 'name' pattern."""
+    if "index" in edit:
+        idx = edit["index"]
+        return [check_material_index(i) for i in (idx if isinstance(idx, list) else [idx])]
+    pattern = str(edit.get("name", "")).lower()
+    return [i for i, m in enumerate(mesh_data.materials)
+            if fnmatch.fnmatchcase(str(m.get("name", "")).lower(), pattern)]
+
+def apply_material_edits(mesh_data: SceneMeshData, edits: List[Dict[str, Any]],
+                         textures: Optional[Dict[str, Any]] = None):
+    """
+    Apply all edits to a single clone of mesh_data.
+    texture: name of an entry in `textures` to assign, or 'remove' to drop the map.
+    Returns (new_mesh_data, sorted list of touched material indices).
+    """
+    textures = textures or {}
+    new_mesh_data = clone_mesh_data(mesh_data)
+    touched = set()
+
+    for n, edit in enumerate(edits, 1):
+        try:
+            targets = select_materials(new_mesh_data, edit)
+            color = parse_color(edit.get("color"))
+            for key in ("metallic", "roughness"):
+                if edit.get(key) is not None:
+                    float(edit[key])
+        except (ValueError, TypeError, AttributeError) as e:
+            raise ValueError(f"Edit {n} {edit}: {e}") from e
+        if not targets:
+            print(f"[Mixo3D] Warning: Material edit matched nothing: {edit}")
+        for m_idx in targets:
+            ensure_material_slot(new_mesh_data, m_idx)
+            mat = new_mesh_data.materials[m_idx]
+            if edit.get("rename"):
+                mat["name"] = str(edit["rename"]).strip()
+            if color is not None:
+                mat["base_color"] = color
+            for key in ("metallic", "roughness"):
+                if edit.get(key) is not None:
+                    mat[key] = float(edit[key])
+
+            tex = edit.get("texture")
+            tex_key = base_color_texture_key(m_idx)
+            if tex in ("remove", "none"):
+                new_mesh_data.textures.pop(tex_key, None)
+            elif tex:
+                if textures.get(tex) is None:
+                    print(f"[Mixo3D] Warning: Texture input '{tex}' is not connected")
+                else:
+                    new_mesh_data.textures[tex_key] = textures[tex]
+            touched.add(m_idx)
+
+    return new_mesh_data, sorted(touched)
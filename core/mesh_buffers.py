@@ -0,0 +1,119 @@
+import json
+import hashlib
+import struct
+import numpy as np
+from collections import OrderedDict
+from .mesh_model import SceneMeshData
+
+# Layout: b"MX3D" | uint32 header_len | JSON header (space padded to 4 bytes) | buffers
+# Buffer offsets in the header are absolute byte offsets into the payload, each 4-byte aligned.
+MAGIC = b"MX3D"
+_MAX_CACHED = 16
+_payload_cache: "OrderedDict[str, tuple]" = OrderedDict()
+
+def _align4(n):
+    return (n + 3) & ~3
+
+def encode_mesh_buffers(mesh_data: SceneMeshData):
+    """
+    Serialize geometry to raw typed arrays for the viewer.
+    Faces are sorted by material so each material is one contiguous draw group.
+    Returns (etag, payload_bytes).
+    """
+    vertices = np.ascontiguousarray(mesh_data.vertices, dtype=np.float32)
+    indices = mesh_data.indices if mesh_data.indices is not None else np.zeros((0, 3), dtype=np.int64)
+    mat_indices = mesh_data.face_material_indices
+    if mat_indices is None:
+        mat_indices = np.zeros(len(indices), dtype=np.int32)
+
+    order = np.argsort(mat_indices, kind="stable")
+    sorted_mats = mat_indices[order]
+    index_dtype = np.uint16 if len(vertices) < 65536 else np.uint32
+    index_array = np.ascontiguousarray(indices[order], dtype=index_dtype)
+
+    groups = []
+    if len(sorted_mats):
+        mats, starts, counts = np.unique(sorted_mats, return_index=True, return_counts=True)
+        groups = [{"start": int(s) * 3, "count": int(c) * 3, "material": int(m)}
+                  for m, s, c in zip(mats, starts, counts)]
+
+    arrays = [("position", vertices, 3), ("index", index_array, 1)]
+    if mesh_data.normals is not None:
+        arrays.append(("normal", np.ascontiguousarray(mesh_data.normals, dtype=np.float32), 3))
+    if mesh_data.uvs is not None:
+        arrays.append(("uv", np.ascontiguousarray(mesh_data.uvs, dtype=np.float32), 2))
+
+    h = hashlib.md5()
+    for _, arr, _ in arrays:
+        h.update(arr.tobytes())
+    for mat in mesh_data.materials:
+        h.update(str(mat).encode())
+    etag = h.hexdigest()
+
+    header = {
+        "hash": etag,
+        "vertex_count": int(len(vertices)),
+        "index_count": int(index_array.size),
+        "groups": groups,
+        "materials": [{"name": m.get("name", f"Material_{i}"),
+                       "base_color": list(m.get("base_color", [0.8, 0.8, 0.8, 1.0])),
+                       "metallic": float(m.get("metallic", 0.0)),
+                       "roughness": float(m.get("roughness", 0.5))}
+                      for i, m in enumerate(mesh_data.materials)],
+        "buffers": [],
+    }
+    # Offsets depend on the header length, so size the header with placeholders first
+    for name, arr, comps in arrays:
+        header["buffers"].append({"name": name, "dtype": arr.dtype.name, "components": comps,
+                                  "count": int(arr.size // comps), "offset": 0, "length": int(arr.nbytes)})
+    while True:
+        header_bytes = json.dumps(header, separators=(",", ":")).encode()
+        header_len = _align4(len(header_bytes))
+        offset = 8 + header_len
+        changed = False
+        for entry in header["buffers"]:
+            if entry["offset"] != offset:
+                entry["offset"] = offset
+                changed = True
+            offset = _align4(offset + entry["length"])
+        if not changed:
+            break
+
+    out = bytearray(offset)
+    out[0:4] = MAGIC
+    out[4:8] = struct.pack("<I", header_len)
+    out[8:8 + header_len] = header_bytes.ljust(header_len, b" ")
+    for entry, (_, arr, _) in zip(header["buffers"], arrays):
+        out[entry["offset"]:entry["offset"] + entry["length"]] = arr.tobytes()
+    return etag, bytes(out)
+
+def get_mesh_payload(mesh_id: str, mesh_data: SceneMeshData):
+    """Cached encode_mesh_buffers; re-encodes when a different object is registered under mesh_id."""
+    entry = _payload_cache.get(mesh_id)
+    if entry is not None and entry[0] is mesh_data:
+        _payload_cache.move_to_end(mesh_id)
+        return entry[1], entry[2]
+    etag, payload = encode_mesh_buffers(mesh_data)
+    _payload_cache[mesh_id] = (mesh_data, etag, payload)
+    while len(_payload_cache) > _MAX_CACHED:
+        _payload_cache.popitem(last=False)
+    return etag, payload
+
+def parse_range(range_header: str, size: int):
+    """
+    Parse a single 'bytes=start-end' range. Returns (start, end_exclusive),
+    None if no/multi-range (serve everything), or raises ValueError if unsatisfiable.
+    """
+    if not range_header or not range_header.startswith("bytes=") or "," in range_header:
+        return None
+    start_s, _, end_s = range_header[6:].strip().partition("-")
+    if start_s == "":
+        length = int(end_s)
+        if length <= 0:
+            raise ValueError(range_header)
+        return max(size - length, 0), size
+    start = int(start_s)
+    end = min(int(end_s) + 1, size) if end_s else size
+    if start >= size or start >= end:
+        raise ValueError(range_header)
+    return start, end
@@ -0,0 +1,209 @@
+import os
+import json
+import hashlib
+from typing import Optional
+import numpy as np
+from .mesh_model import SceneMeshData, base_color_texture_key
+from .transform_utils import apply_transform, transform_normals
+
+# Shared between MeshFromPath and the headless batch runner when set
+MESH_CACHE_ENV = "MIXO3D_MESH_CACHE_DIR"
+CACHE_FIELDS = ("vertices", "normals", "uvs", "indices", "face_material_indices")
+
+def source_key(path: str) -> str:
+    """Deterministic key for a file on disk: same path, mtime and size -> same key in every process."""
+    st = os.stat(path)
+    ident = f"{os.path.abspath(path)}|{st.st_mtime_ns}|{st.st_size}"
+    return hashlib.md5(ident.encode()).hexdigest()[:16]
+
+def default_cache_dir() -> Optional[str]:
+    return os.environ.get(MESH_CACHE_ENV) or None
+
+def material_base_color_image(mat_obj):
+    """Base color map of a trimesh material (PBR baseColorTexture or OBJ map_Kd), None if it has none."""
+    image = getattr(mat_obj, 'baseColorTexture', None)
+    if image is None:
+        image = getattr(mat_obj, 'image', None)
+    return image
+
+def material_info(mat_obj, name: str) -> dict:
+    """Registry material dict from a trimesh material; factors the file leaves unset keep the defaults."""
+    m_info = {"name": name, "base_color": [0.8, 0.8, 0.8, 1.0], "metallic": 0.0, "roughness": 0.5}
+    if mat_obj is None:
+        return m_info
+    factor = getattr(mat_obj, 'baseColorFactor', None)
+    if factor is not None:
+        factor = np.asarray(factor)
+        # trimesh reports colors as uint8; the registry and glTF use 0..1
+        if np.issubdtype(factor.dtype, np.integer):
+            factor = factor / 255.0
+        m_info["base_color"] = [float(c) for c in factor]
+    elif material_base_color_image(mat_obj) is not None:
+        m_info["base_color"] = [1.0, 1.0, 1.0, 1.0]  # the texture alone sets the color
+    for key, attr in (("metallic", "metallicFactor"), ("roughness", "roughnessFactor")):
+        value = getattr(mat_obj, attr, None)
+        if value is not None:
+            m_info[key] = float(value)
+    return m_info
+
+def file_has_vertex_normals(path: str) -> bool:
+    """
+    Whether the file stores vertex normals (glTF NORMAL attributes, OBJ vn, PLY nx,
+    NOFF). trimesh computes normals on first access and has no public flag telling
+    loaded ones apart, so the loader reads this from the file itself.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    try:
+        with open(path, "rb") as f:
+            if ext == ".glb":
+                # 12 byte header, then the JSON chunk: length, type, payload
+                header = f.read(20)
+                doc = json.loads(f.read(int.from_bytes(header[12:16], "little")))
+            elif ext == ".gltf":
+                doc = json.load(f)
+            elif ext == ".obj":
+                return any(line.startswith(b"vn ") for line in f)
+            elif ext == ".ply":
+                for line in f:
+                    if line.strip() == b"end_header":
+                        return False
+                    if line.split()[-1:] == [b"nx"]:
+                        return True
+                return False
+            elif ext == ".off":
+                return f.readline().strip().startswith(b"NOFF")
+            else:
+                return False
+    except (OSError, ValueError):
+        return False
+    return any("NORMAL" in prim.get("attributes", {})
+               for mesh in doc.get("meshes", []) for prim in mesh.get("primitives", []))
+
+def load_mesh_file(final_path: str) -> SceneMeshData:
+    """Load a mesh file with trimesh and flatten it into one SceneMeshData."""
+    import trimesh
+    scene_or_mesh = trimesh.load(final_path)
+    # Only normals the file actually had; reading vertex_normals otherwise computes them
+    has_normals = file_has_vertex_normals(final_path)
+    
+    if isinstance(scene_or_mesh, trimesh.Scene):
+        # Flatten hierarchy: Bake all scene node transforms into mesh vertices.
+        # Walk the graph ourselves: dump() copies drop the normals the file provided.
+        graph = scene_or_mesh.graph
+        
+        all_verts = []
+        all_faces = []
+        all_normals = []
+        all_uvs = []
+        all_mats = []
+        all_face_mat_indices = []
+        textures = {}
+        
+        v_offset = 0
+        mat_cache = {} 
+
+        for node_name in graph.nodes_geometry:
+            transform, geom_name = graph[node_name]
+            mesh = scene_or_mesh.geometry.get(geom_name)
+            if not isinstance(mesh, trimesh.Trimesh): continue
+            
+            mat_obj = getattr(mesh.visual, 'material', None)
+            mat_key = str(id(mat_obj)) if mat_obj else "default"
+            
+            if mat_key not in mat_cache:
+                mat_idx = len(all_mats)
+                mat_cache[mat_key] = mat_idx
+                m_name = getattr(mat_obj, 'name', f"Material_{mat_idx}")
+                if not m_name: m_name = f"Material_{mat_idx}"
+                
+                m_info = material_info(mat_obj, m_name)
+                image = material_base_color_image(mat_obj)
+                if image is not None:
+                    textures[base_color_texture_key(mat_idx)] = image
+                all_mats.append(m_info)
+            
+            m_idx = mat_cache[mat_key]
+            faces = mesh.faces[:, ::-1] if np.linalg.det(transform[:3, :3]) < 0 else mesh.faces
+            all_verts.append(apply_transform(mesh.vertices, transform))
+            all_faces.append(faces + v_offset)
+            if has_normals:
+                all_normals.append(transform_normals(mesh.vertex_normals, transform))
+            if hasattr(mesh.visual, 'uv'): all_uvs.append(mesh.visual.uv)
+            else: all_uvs.append(np.zeros((len(mesh.vertices), 2)))
+            
+            all_face_mat_indices.append(np.full(len(mesh.faces), m_idx, dtype=np.int32))
+            v_offset += len(mesh.vertices)
+
+        mesh_data = SceneMeshData(
+            vertices=np.vstack(all_verts) if all_verts else np.zeros((0,3)),
+            indices=np.vstack(all_faces) if all_faces else np.zeros((0,3), dtype=np.int32),
+            # Parts of mixed files without normals get trimesh's computed ones
+            normals=np.vstack(all_normals) if all_normals else None,
+            uvs=np.vstack(all_uvs) if all_uvs else None,
+            materials=all_mats,
+            face_material_indices=np.concatenate(all_face_mat_indices) if all_face_mat_indices else None,
+            textures=textures
+        )
+    else:
+        mesh = scene_or_mesh
+        m_obj = getattr(mesh.visual, 'material', None)
+        m_name = getattr(m_obj, 'name', "DefaultMaterial")
+        if not m_name: m_name = "DefaultMaterial"
+        
+        m_info = material_info(m_obj, m_name)
+
+        mesh_data = SceneMeshData(
+            vertices=np.array(mesh.vertices, dtype=np.float32),
+            indices=np.array(mesh.faces, dtype=np.int32),
+            normals=np.array(mesh.vertex_normals, dtype=np.float32) if has_normals else None,
+            uvs=np.array(mesh.visual.uv, dtype=np.float32) if hasattr(mesh.visual, 'uv') else None,
+            materials=[m_info],
+            face_material_indices=np.zeros(len(mesh.faces), dtype=np.int32)
+        )
+        image = material_base_color_image(m_obj)
+        if image is not None:
+            mesh_data.textures[base_color_texture_key(0)] = image
+    return mesh_data
+
+def load_mesh_cached(path: str, cache_dir: Optional[str] = None) -> SceneMeshData:
+    """
+    load_mesh_file with an on-disk .npz cache keyed by source_key, so repeated
+    loads (other processes, nightly runs) skip parsing. No cache without cache_dir.
+    Base color textures are stored as raw RGBA pixel arrays next to the geometry.
+    """
+    if not cache_dir:
+        return load_mesh_file(path)
+
+    cache_path = os.path.join(cache_dir, f"{source_key(path)}.npz")
+    if os.path.exists(cache_path):
+        try:
+            with np.load(cache_path, allow_pickle=False) as data:
+                meta = json.loads(str(data["meta"]))
+                arrays = {k: data[k] for k in CACHE_FIELDS if k in data.files}
+                pixels = {key: data[f"tex_{key}"] for key in meta.get("textures", [])}
+            mesh_data = SceneMeshData(materials=meta["materials"], metadata=meta["metadata"], **arrays)
+            if pixels:
+                from PIL import Image
+                mesh_data.textures = {key: Image.fromarray(px, "RGBA") for key, px in pixels.items()}
+            return mesh_data
+        except Exception as e:
+            print(f"[Mixo3D] Warning: Ignoring unreadable mesh cache {cache_path}: {e}")
+
+    mesh_data = load_mesh_file(path)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        arrays = {k: getattr(mesh_data, k) for k in CACHE_FIELDS if getattr(mesh_data, k) is not None}
+        for key, image in mesh_data.textures.items():
+            if hasattr(image, "convert"):
+                arrays[f"tex_{key}"] = np.asarray(image.convert("RGBA"))
+        meta = json.dumps({"materials": mesh_data.materials, "metadata": mesh_data.metadata,
+                           "textures": [k[4:] for k in arrays if k.startswith("tex_")],
+                           "source": os.path.abspath(path)}, default=str)
+        # Write-then-rename so concurrent readers never see a partial file
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(f, meta=np.array(meta), **arrays)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"[Mixo3D] Warning: Could not write mesh cache: {e}")
+    return mesh_data
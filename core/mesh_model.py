@@ -1,8 +1,23 @@
 from dataclasses import dataclass, field
 from typing import Dict, List, Any, Optional
 import numpy as np
-import torch
-from PIL import Image
+
+def base_color_texture_key(material_index: int) -> str:
+    """Texture slot name for a material's base color map."""
+    return 'base_color_texture' if material_index == 0 else f'base_color_texture_{material_index}'
+
+def _accumulate(indices: np.ndarray, corner_values: np.ndarray, n_verts: int) -> np.ndarray:
+    """Sum (3M, 3) per-corner values onto (n_verts, 3) vertices."""
+    flat = indices.reshape(-1)
+    return np.stack([np.bincount(flat, weights=corner_values[:, k], minlength=n_verts) for k in range(3)], axis=1)
+
+def _safe_inverse_norm(v: np.ndarray) -> np.ndarray:
+    lengths = np.linalg.norm(v, axis=1, keepdims=True)
+    return np.divide(1.0, lengths, out=np.zeros_like(lengths), where=lengths > 0)
+
+def _accumulate_unit(indices: np.ndarray, corner_values: np.ndarray, n_verts: int) -> np.ndarray:
+    summed = _accumulate(indices, corner_values, n_verts)
+    return summed * _safe_inverse_norm(summed)
 
 @dataclass
 class SceneMeshData:
@@ -25,6 +40,110 @@ class SceneMeshData:
     
     metadata: Dict[str, Any] = field(default_factory=dict)
 
+    # lazily computed values derived from geometry (bounds, ...), dropped when geometry is reassigned
+    _derived: Dict[str, Any] = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    GEOMETRY_FIELDS = ("vertices", "normals", "uvs", "indices")
+
+    def __setattr__(self, name, value):
+        if name in SceneMeshData.GEOMETRY_FIELDS:
+            derived = self.__dict__.get("_derived")
+            if derived:
+                derived.clear()
+        object.__setattr__(self, name, value)
+
+    def invalidate_derived(self):
+        """Call after mutating geometry arrays in place."""
+        self._derived.clear()
+
+    def get_local_aabb(self) -> Optional[np.ndarray]:
+        """Cached (2, 3) [min, max] of the untransformed vertices, None if empty."""
+        if "aabb" not in self._derived:
+            if self.vertices is None or len(self.vertices) == 0:
+                self._derived["aabb"] = None
+            else:
+                self._derived["aabb"] = np.stack([self.vertices.min(axis=0), self.vertices.max(axis=0)]).astype(np.float64)
+        return self._derived["aabb"]
+
+    def get_bounding_sphere(self):
+        """Cached (center (3,), radius) around the AABB center, None if empty."""
+        if "sphere" not in self._derived:
+            aabb = self.get_local_aabb()
+            if aabb is None:
+                self._derived["sphere"] = None
+            else:
+                center = aabb.mean(axis=0)
+                radius = float(np.sqrt(((self.vertices - center) ** 2).sum(axis=1).max()))
+                self._derived["sphere"] = (center, radius)
+        return self._derived["sphere"]
+
+    def _face_cross(self) -> np.ndarray:
+        """Cached unnormalized face normals (length = 2 * triangle area)."""
+        if "face_cross" not in self._derived:
+            tri = np.asarray(self.vertices, dtype=np.float64)[self.indices]
+            self._derived["face_cross"] = np.cross(tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0])
+        return self._derived["face_cross"]
+
+    def get_face_normals(self) -> Optional[np.ndarray]:
+        """Cached (M, 3) unit face normals, zero for degenerate faces."""
+        if self.indices is None:
+            return None
+        if "face_normals" not in self._derived:
+            cross = self._face_cross()
+            lengths = np.linalg.norm(cross, axis=1, keepdims=True)
+            self._derived["face_normals"] = np.divide(cross, lengths, out=np.zeros_like(cross), where=lengths > 0)
+        return self._derived["face_normals"]
+
+    def get_vertex_normals(self) -> Optional[np.ndarray]:
+        """Normals from the file if present, else cached area-weighted (N, 3) vertex normals."""
+        if self.normals is not None:
+            return self.normals
+        if self.indices is None:
+            return None
+        if "vertex_normals" not in self._derived:
+            self._derived["vertex_normals"] = _accumulate_unit(self.indices, np.repeat(self._face_cross(), 3, axis=0), len(self.vertices))
+        return self._derived["vertex_normals"]
+
+    def get_tangents(self) -> Optional[np.ndarray]:
+        """
+        Cached (N, 4) MikkTSpace-style tangents: area-weighted per-face UV tangents,
+        Gram-Schmidt orthogonalized against the vertex normal, w = bitangent handedness.
+        None without uvs.
+        """
+        if self.uvs is None or self.indices is None:
+            return None
+        if "tangents" not in self._derived:
+            verts = np.asarray(self.vertices, dtype=np.float64)
+            uvs = np.asarray(self.uvs, dtype=np.float64)
+            normals = np.asarray(self.get_vertex_normals(), dtype=np.float64)
+            i0, i1, i2 = self.indices[:, 0], self.indices[:, 1], self.indices[:, 2]
+
+            e1, e2 = verts[i1] - verts[i0], verts[i2] - verts[i0]
+            d1, d2 = uvs[i1] - uvs[i0], uvs[i2] - uvs[i0]
+            det = d1[:, 0] * d2[:, 1] - d2[:, 0] * d1[:, 1]
+            r = np.divide(1.0, det, out=np.zeros_like(det), where=np.abs(det) > 1e-20)
+            # Weighted by geometric area (not UV area); faces with degenerate UVs contribute nothing
+            area = np.linalg.norm(self._face_cross(), axis=1) * (r != 0)
+            face_t = (e1 * d2[:, 1:2] - e2 * d1[:, 1:2]) * r[:, None]
+            face_b = (e2 * d1[:, 0:1] - e1 * d2[:, 0:1]) * r[:, None]
+            face_t *= _safe_inverse_norm(face_t) * area[:, None]
+            face_b *= _safe_inverse_norm(face_b) * area[:, None]
+
+            n_verts = len(verts)
+            t = _accumulate(self.indices, np.repeat(face_t, 3, axis=0), n_verts)
+            b = _accumulate(self.indices, np.repeat(face_b, 3, axis=0), n_verts)
+
+            # Gram-Schmidt against the normal; fall back to any perpendicular axis
+            t -= normals * (normals * t).sum(axis=1, keepdims=True)
+            bad = np.linalg.norm(t, axis=1) < 1e-12
+            if bad.any():
+                axis = np.where(np.abs(normals[bad, 0:1]) < 0.9, [[1.0, 0.0, 0.0]], [[0.0, 1.0, 0.0]])
+                t[bad] = np.cross(normals[bad], np.cross(axis, normals[bad]))
+            t *= _safe_inverse_norm(t)
+            w = np.where((np.cross(normals, t) * b).sum(axis=1) < 0.0, -1.0, 1.0)
+            self._derived["tangents"] = np.hstack([t, w[:, None]])
+        return self._derived["tangents"]
+
     def get_hash(self) -> str:
         import hashlib
         # Simple hash for change detection
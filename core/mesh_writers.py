@@ -0,0 +1,106 @@
+import os
+import re
+import numpy as np
+from typing import List
+
+# Binary STL record: normal, 3 vertices, attribute byte count (50 bytes, no padding)
+STL_RECORD = np.dtype([("normal", "<f4", (3,)), ("vertices", "<f4", (3, 3)), ("attr", "<u2")])
+
+# Rows per formatted block when streaming OBJ text
+OBJ_CHUNK_ROWS = 200_000
+
+def write_stl(path: str, primitives: List[dict]):
+    """Binary STL of all baked primitives, built as one record array and written in one call."""
+    tris = [np.asarray(p["positions"], dtype=np.float32)[np.asarray(p["indices"])] for p in primitives]
+    tris = np.concatenate(tris) if tris else np.zeros((0, 3, 3), dtype=np.float32)
+
+    normals = np.cross(tris[:, 1] - tris[:, 0], tris[:, 2] - tris[:, 0])
+    lens = np.linalg.norm(normals, axis=1, keepdims=True)
+    normals = np.divide(normals, lens, out=np.zeros_like(normals), where=lens != 0)
+
+    records = np.zeros(len(tris), dtype=STL_RECORD)
+    records["normal"] = normals
+    records["vertices"] = tris
+    with open(path, "wb") as f:
+        f.write(b"mixo3dtools binary STL".ljust(80, b" "))
+        f.write(np.uint32(len(records)).tobytes())
+        f.write(records.tobytes())
+    return True
+
+def _write_rows(f, fmt: str, rows: np.ndarray):
+    """Format an (N, K) array with a per-row template in bulk, chunk by chunk."""
+    for start in range(0, len(rows), OBJ_CHUNK_ROWS):
+        block = rows[start:start + OBJ_CHUNK_ROWS]
+        f.write((fmt * len(block)) % tuple(block.ravel().tolist()))
+
+def _safe_name(name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_\-.]", "_", str(name)) or "material"
+
+def write_obj(path: str, primitives: List[dict]):
+    """
+    OBJ + MTL of all baked primitives. Positions, uvs and normals are written
+    as bulk-formatted v/vt/vn blocks and faces as one f block per primitive.
+    Base color textures are saved as PNG next to the MTL.
+    """
+    base = os.path.splitext(path)[0]
+    mtl_path = base + ".mtl"
+    out_dir = os.path.dirname(os.path.abspath(path))
+
+    # One MTL entry per distinct material dict/texture pair
+    mtl_names, mtl_lines = {}, []
+    prim_materials = []
+    for prim in primitives:
+        key = (id(prim["material"]), id(prim["texture"]))
+        if key not in mtl_names:
+            mat = prim["material"]
+            name = _safe_name(f"{mat.get('name', 'material')}_{len(mtl_names)}")
+            mtl_names[key] = name
+            r, g, b = list(mat.get("base_color", [0.8, 0.8, 0.8, 1.0]))[:3]
+            alpha = list(mat.get("base_color", [0.8, 0.8, 0.8, 1.0]))[3:4] or [1.0]
+            mtl_lines += [f"newmtl {name}", f"Kd {r:.6f} {g:.6f} {b:.6f}", f"d {alpha[0]:.6f}",
+                          f"Pm {float(mat.get('metallic', 0.0)):.6f}", f"Pr {float(mat.get('roughness', 0.5)):.6f}"]
+            if prim["texture"] is not None:
+                tex_name = f"{os.path.basename(base)}_{name}.png"
+                prim["texture"].save(os.path.join(out_dir, tex_name))
+                mtl_lines.append(f"map_Kd {tex_name}")
+            mtl_lines.append("")
+        prim_materials.append(mtl_names[key])
+
+    with open(mtl_path, "w") as f:
+        f.write("\n".join(mtl_lines))
+
+    with open(path, "w") as f:
+        f.write(f"# mixo3dtools\nmtllib {os.path.basename(mtl_path)}\n")
+        v_off = vt_off = vn_off = 1
+        for prim, mtl in zip(primitives, prim_materials):
+            positions = np.asarray(prim["positions"], dtype=np.float64)
+            uvs, normals = prim["uvs"], prim["normals"]
+            _write_rows(f, "v %.6f %.6f %.6f\n", positions)
+            if uvs is not None:
+                _write_rows(f, "vt %.6f %.6f\n", np.asarray(uvs, dtype=np.float64))
+            if normals is not None:
+                _write_rows(f, "vn %.6f %.6f %.6f\n", np.asarray(normals, dtype=np.float64))
+
+            f.write(f"o {_safe_name(prim.get('name', 'mesh'))}\nusemtl {mtl}\n")
+            faces = np.asarray(prim["indices"], dtype=np.int64)
+            # Per-corner columns: v[/vt][/vn] with 1-based global offsets
+            cols = [faces + v_off]
+            if uvs is not None:
+                cols.append(faces + vt_off)
+            if normals is not None:
+                cols.append(faces + vn_off)
+            corners = np.stack(cols, axis=2).reshape(len(faces), -1)
+            if uvs is not None and normals is not None:
+                corner_fmt = "%d/%d/%d"
+            elif uvs is not None:
+                corner_fmt = "%d/%d"
+            elif normals is not None:
+                corner_fmt = "%d//%d"
+            else:
+                corner_fmt = "%d"
+            _write_rows(f, "f " + " ".join([corner_fmt] * 3) + "\n", corners)
+
+            v_off += len(positions)
+            vt_off += len(uvs) if uvs is not None else 0
+            vn_off += len(normals) if normals is not None else 0
+    return True
@@ -1,30 +1,36 @@
-import pygfx as gfx
-import wgpu
 from typing import List, Dict
 import numpy as np
 from .scene_registry import registry
 from .mesh_model import SceneMeshData, SceneNodeData
+from .bounds import frustum_planes, transform_spheres, spheres_in_frustum
 
 class SceneRenderer:
     def __init__(self):
+        # pygfx/wgpu are only needed once a renderer is actually created
+        import pygfx as gfx
+        self.gfx = gfx
         self.canvas = None
         self.renderer = None
-        self.scene = gfx.Scene()
-        self.camera = gfx.PerspectiveCamera(70, 16/9)
-        self.meshes: Dict[str, gfx.Mesh] = {}
+        self.scene = self.gfx.Scene()
+        self.camera = self.gfx.PerspectiveCamera(70, 16/9)
+        self.meshes: Dict[str, "gfx.Mesh"] = {}
 
     def setup(self, canvas_id=None):
         # In a real ComfyUI environment, this might be a virtual canvas
         # or integrated with a custom frontend extension.
         pass
 
-    def update_scene(self, node_ids: List[str]):
+    def update_scene(self, node_ids: List[str], view_proj=None):
         """
         Update the pygfx scene based on node IDs.
+        If a (4, 4) view_proj matrix is given, nodes whose cached bounding
+        sphere lies outside the frustum are skipped.
         """
         # Clear existing
         for m in list(self.scene.children):
             self.scene.remove(m)
+
+        planes = frustum_planes(view_proj) if view_proj is not None else None
         
         for node_id in node_ids:
             node = registry.get_node(node_id)
@@ -34,33 +40,40 @@ class SceneRenderer:
             mesh_data = registry.get_mesh(node.mesh_id)
             if not mesh_data:
                 continue
+
+            if planes is not None:
+                sphere = mesh_data.get_bounding_sphere()
+                if sphere is not None:
+                    center, radius = transform_spheres(sphere[0], [sphere[1]], node.transform)
+                    if not spheres_in_frustum(planes, center, radius)[0]:
+                        continue
                 
             # Create pygfx geometry
-            geometry = gfx.Geometry(
+            geometry = self.gfx.Geometry(
                 indices=mesh_data.indices,
                 positions=mesh_data.vertices,
-                normals=mesh_data.normals,
+                normals=mesh_data.get_vertex_normals(),
                 texcoords=mesh_data.uvs
             )
             
             # Simple material for preview
             # In a full implementation, we'd handle multiple materials
             p_mat = mesh_data.materials[0] if mesh_data.materials else {}
-            material = gfx.MeshStandardMaterial(
+            material = self.gfx.MeshStandardMaterial(
                 color=p_mat.get('base_color', [1, 1, 1, 1]),
                 roughness=p_mat.get('roughness', 0.5),
                 metalness=p_mat.get('metallic', 0.0)
             )
             
-            gfx_mesh = gfx.Mesh(geometry, material)
+            gfx_mesh = self.gfx.Mesh(geometry, material)
             gfx_mesh.local.matrix = node.transform.T # pygfx uses column-major or row-major? 
             # Note: pygfx world matrix handling might need care
             
             self.scene.add(gfx_mesh)
             
         # Add basic lights
-        self.scene.add(gfx.AmbientLight(0.5))
-        self.scene.add(gfx.DirectionalLight(1, color=(1, 1, 1), position=(10, 10, 10)))
+        self.scene.add(self.gfx.AmbientLight(0.5))
+        self.scene.add(self.gfx.DirectionalLight(1, color=(1, 1, 1), position=(10, 10, 10)))
 
     def render_to_image(self):
         """
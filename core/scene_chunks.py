@@ -0,0 +1,116 @@
+import os
+import json
+from collections import OrderedDict
+from typing import List
+import numpy as np
+from .gltf_writer import GLTFBuilder
+
+CHUNK_MODES = ("by_input", "octree")
+CHUNK_ORDERS = ("importance", "size")
+MANIFEST_NAME = "manifest.json"
+DEFAULT_MAX_TRIANGLES = 200_000
+_MAX_OCTREE_DEPTH = 10
+
+def _sub_primitive(prim: dict, face_mask: np.ndarray) -> dict:
+    """prim restricted to the masked faces, compacted to the vertices they use."""
+    faces = prim["indices"][face_mask]
+    used, remapped = np.unique(faces, return_inverse=True)
+    sub = dict(prim)
+    sub["positions"] = prim["positions"][used]
+    sub["normals"] = prim["normals"][used] if prim["normals"] is not None else None
+    sub["uvs"] = prim["uvs"][used] if prim["uvs"] is not None else None
+    sub["indices"] = remapped.reshape(-1, 3).astype(np.uint32)
+    return sub
+
+def octree_cells(centroids: np.ndarray, max_triangles: int, max_depth: int = _MAX_OCTREE_DEPTH) -> np.ndarray:
+    """
+    Adaptive octree over triangle centroids: cells holding more than
+    max_triangles split until max_depth. Returns a cell path code per triangle
+    (root 1, child = parent * 8 + octant), so equal codes share a leaf.
+    """
+    n = len(centroids)
+    path = np.ones(n, dtype=np.int64)
+    lo = np.repeat(centroids.min(axis=0, keepdims=True), n, axis=0)
+    hi = np.repeat(centroids.max(axis=0, keepdims=True), n, axis=0)
+    for _ in range(max_depth):
+        _, inverse, counts = np.unique(path, return_inverse=True, return_counts=True)
+        over = counts[inverse] > max_triangles
+        if not over.any():
+            break
+        center = (lo[over] + hi[over]) * 0.5
+        upper = centroids[over] >= center
+        octant = upper[:, 0] * 1 + upper[:, 1] * 2 + upper[:, 2] * 4
+        lo[over] = np.where(upper, center, lo[over])
+        hi[over] = np.where(upper, hi[over], center)
+        path[over] = path[over] * 8 + octant
+    return path
+
+def split_into_chunks(primitives: List[dict], mode: str = "by_input",
+                      max_triangles: int = DEFAULT_MAX_TRIANGLES) -> List[List[dict]]:
+    """Group baked primitives into spatially coherent chunks (lists of primitives)."""
+    if mode == "by_input":
+        groups = OrderedDict()
+        for prim in primitives:
+            groups.setdefault(prim["node_id"], []).append(prim)
+        return list(groups.values())
+
+    # octree: one cell code per triangle over the whole scene, then cut each primitive by cell
+    centroids = np.vstack([p["positions"][p["indices"]].mean(axis=1) for p in primitives])
+    cells = octree_cells(centroids, max_triangles)
+    offsets = np.cumsum([0] + [len(p["indices"]) for p in primitives])
+    chunks = OrderedDict()
+    for prim, start, end in zip(primitives, offsets[:-1], offsets[1:]):
+        prim_cells = cells[start:end]
+        for cell in np.unique(prim_cells):
+            mask = prim_cells == cell
+            chunks.setdefault(int(cell), []).append(prim if mask.all() else _sub_primitive(prim, mask))
+    return list(chunks.values())
+
+def write_scene_chunks(baked, out_dir: str, mode: str = "by_input", order: str = "importance",
+                       max_triangles: int = DEFAULT_MAX_TRIANGLES) -> str:
+    """
+    Write a BakedScene as chunk GLBs plus an ordered manifest.json in out_dir.
+    order "importance" puts the largest bounding spheres (most screen area) first,
+    "size" the smallest files first for the quickest first pixels.
+    Returns the manifest path.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    entries = []
+    for i, chunk in enumerate(split_into_chunks(baked.primitives, mode, max_triangles)):
+        builder = GLTFBuilder()
+        materials = {}
+        for prim in chunk:
+            key = (id(prim["material"]), id(prim["texture"]))
+            if key not in materials:
+                materials[key] = builder.add_material(prim["material"], prim["texture"])
+            builder.add_primitive_node(prim, materials[key])
+        filename = f"chunk_{i:04d}.glb"
+        data = builder.to_bytes()
+        with open(os.path.join(out_dir, filename), "wb") as f:
+            f.write(data)
+
+        lo = np.min([p["positions"].min(axis=0) for p in chunk], axis=0)
+        hi = np.max([p["positions"].max(axis=0) for p in chunk], axis=0)
+        entries.append({
+            "file": filename,
+            "bytes": len(data),
+            "triangles": int(sum(len(p["indices"]) for p in chunk)),
+            "min": lo.tolist(), "max": hi.tolist(),
+            "center": ((lo + hi) * 0.5).tolist(),
+            "radius": float(np.linalg.norm(hi - lo) * 0.5),
+        })
+
+    if order == "size":
+        entries.sort(key=lambda e: e["bytes"])
+    else:
+        entries.sort(key=lambda e: (-e["radius"], e["bytes"]))
+
+    manifest = {"version": 1, "mode": mode, "order": order, "up_direction": baked.up_direction, "chunks": entries}
+    if entries:
+        manifest["min"] = np.min([e["min"] for e in entries], axis=0).tolist()
+        manifest["max"] = np.max([e["max"] for e in entries], axis=0).tolist()
+    manifest_path = os.path.join(out_dir, MANIFEST_NAME)
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    print(f"[Mixo3D] Wrote {len(entries)} scene chunks ({mode}, {order} order)")
+    return manifest_path
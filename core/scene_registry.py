@@ -1,7 +1,14 @@
+import os
 import uuid
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Callable, List
 from .mesh_model import SceneMeshData, SceneNodeData
 
+# Opt-in shared-memory geometry for several ComfyUI workers on one box (see shared_mesh_store)
+SHARED_REGISTRY_ENV = "MIXO3D_SHARED_REGISTRY"
+
+def shared_registry_enabled() -> bool:
+    return os.environ.get(SHARED_REGISTRY_ENV, "").strip().lower() in ("1", "true", "yes", "on")
+
 class SceneRegistry:
     _instance = None
 
@@ -10,11 +17,21 @@ class SceneRegistry:
             cls._instance = super(SceneRegistry, cls).__new__(cls)
             cls._instance.SCENE_MESHES: Dict[str, SceneMeshData] = {}
             cls._instance.SCENE_NODES: Dict[str, SceneNodeData] = {}
+            cls._instance._invalidation_hooks: List[Callable] = []
         return cls._instance
 
+    def add_invalidation_hook(self, hook: Callable):
+        """hook(item_id) is called when an id is (re)registered, hook(None) on clear."""
+        self._invalidation_hooks.append(hook)
+
+    def _invalidate(self, item_id: Optional[str]):
+        for hook in self._invalidation_hooks:
+            hook(item_id)
+
     def register_mesh(self, mesh_data: SceneMeshData, requested_id: str = None) -> str:
         mesh_id = requested_id if requested_id and requested_id.strip() else str(uuid.uuid4())
         self.SCENE_MESHES[mesh_id] = mesh_data
+        self._invalidate(mesh_id)
         return mesh_id
 
     def get_mesh(self, mesh_id: str) -> Optional[SceneMeshData]:
@@ -22,7 +39,14 @@ class SceneRegistry:
 
     def register_node(self, node_data: SceneNodeData, requested_id: str = None) -> str:
         node_id = requested_id if requested_id and requested_id.strip() else str(uuid.uuid4())
+        existing = self.SCENE_NODES.get(node_id)
+        if existing is not None and existing.get_hash() == node_data.get_hash():
+            # Same mesh and matrix under the same id: store the new metadata (array index, widget
+            # values) but skip invalidation, so caches downstream of it stay warm
+            self.SCENE_NODES[node_id] = node_data
+            return node_id
         self.SCENE_NODES[node_id] = node_data
+        self._invalidate(node_id)
         return node_id
 
     def get_node(self, node_id: str) -> Optional[SceneNodeData]:
@@ -35,9 +59,15 @@ class SceneRegistry:
             return node
         return self.SCENE_MESHES.get(id)
 
+    def unregister(self, item_id: str):
+        """Drop one mesh or node id, leaving every other entry in place."""
+        if self.SCENE_NODES.pop(item_id, None) is not None or self.SCENE_MESHES.pop(item_id, None) is not None:
+            self._invalidate(item_id)
+
     def clear(self):
         self.SCENE_MESHES.clear()
         self.SCENE_NODES.clear()
+        self._invalidate(None)
 
 # Singleton instance
 registry = SceneRegistry()
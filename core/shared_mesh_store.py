@@ -0,0 +1,257 @@
+import os
+import json
+import time
+import atexit
+import inspect
+import tempfile
+from typing import Callable, Dict, Optional
+import numpy as np
+from multiprocessing import shared_memory, resource_tracker
+from .mesh_model import SceneMeshData
+from .scene_registry import registry
+
+SHARED_FIELDS = {"vertices": "v", "normals": "n", "uvs": "uv", "indices": "i", "face_material_indices": "fm"}
+_REFCOUNT_BYTES = 8
+_LOCK_TIMEOUT = 30.0
+
+def _segment_name(key: str, suffix: str) -> str:
+    # Short enough for macOS' 31 character POSIX shm limit
+    return f"mx3d_{key}_{suffix}"
+
+# Python 3.13+ can open segments untracked; older versions need manual resource tracker bookkeeping
+_HAS_TRACK_KWARG = "track" in inspect.signature(shared_memory.SharedMemory).parameters
+_TRACKED = getattr(shared_memory, "_USE_POSIX", os.name == "posix") and not _HAS_TRACK_KWARG
+
+def _open_segment(name: str, create: bool = False, size: int = 0) -> shared_memory.SharedMemory:
+    """
+    Open a segment without the resource tracker owning it; lifetime is handled by
+    our own refcount, otherwise the first worker to exit would unlink it for everyone.
+    """
+    if _HAS_TRACK_KWARG:
+        return shared_memory.SharedMemory(name=name, create=create, size=size, track=False)
+    shm = shared_memory.SharedMemory(name=name, create=create, size=size)
+    if _TRACKED:
+        resource_tracker.unregister(shm._name, "shared_memory")
+    return shm
+
+def _unlink_segment(shm: shared_memory.SharedMemory):
+    if _TRACKED:
+        # unlink() unregisters again; keep the tracker's bookkeeping balanced
+        resource_tracker.register(shm._name, "shared_memory")
+    try:
+        shm.unlink()
+    except FileNotFoundError:
+        pass
+
+class _KeyLock:
+    """Cross-process lock per key: an O_EXCL lock file in the temp directory."""
+
+    def __init__(self, key: str):
+        self.path = os.path.join(tempfile.gettempdir(), f"mx3d_{key}.lock")
+
+    def __enter__(self):
+        start = time.monotonic()
+        while True:
+            try:
+                fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                os.write(fd, str(os.getpid()).encode())
+                os.close(fd)
+                return self
+            except FileExistsError:
+                # A worker that died while holding the lock leaves the file behind
+                try:
+                    if time.time() - os.path.getmtime(self.path) > _LOCK_TIMEOUT:
+                        os.remove(self.path)
+                        continue
+                except OSError:
+                    continue
+                if time.monotonic() - start > _LOCK_TIMEOUT:
+                    raise TimeoutError(f"Timed out waiting for {self.path}")
+                time.sleep(0.005)
+
+    def refresh(self):
+        """Bump the lock file's mtime so a long copy is not mistaken for a dead holder."""
+        try:
+            os.utime(self.path)
+        except OSError:
+            pass
+
+    def __exit__(self, *exc):
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+class SharedMeshHandle:
+    """This process' attachment to one shared mesh: the segments and the SceneMeshData viewing them."""
+
+    def __init__(self, key: str, header: shared_memory.SharedMemory, segments: Dict[str, shared_memory.SharedMemory],
+                 mesh_data: SceneMeshData):
+        self.key = key
+        self.header = header
+        self.segments = segments
+        self.mesh_data = mesh_data
+        self.released = False
+
+    def _refcount(self) -> np.ndarray:
+        return np.ndarray((1,), dtype=np.int64, buffer=self.header.buf[:_REFCOUNT_BYTES])
+
+    def release(self):
+        """Drop this process' reference; the last worker to detach unlinks the segments."""
+        if self.released:
+            return
+        self.released = True
+        with _KeyLock(self.key):
+            refcount = self._refcount()
+            refcount[0] -= 1
+            remaining = int(refcount[0])
+            del refcount
+            if remaining <= 0:
+                for shm in (self.header, *self.segments.values()):
+                    _unlink_segment(shm)
+        # Views handed out to SceneMeshData keep the mapping alive until they are collected
+        for shm in (self.header, *self.segments.values()):
+            try:
+                shm.close()
+            except BufferError:
+                pass
+
+def _read_header(header: shared_memory.SharedMemory) -> dict:
+    length = int(np.frombuffer(header.buf, dtype=np.uint32, count=1, offset=_REFCOUNT_BYTES)[0])
+    start = _REFCOUNT_BYTES + 4
+    return json.loads(bytes(header.buf[start:start + length]).decode("utf-8"))
+
+class SharedMeshStore:
+    """
+    Geometry arrays of loaded meshes live in named shared-memory segments, so
+    workers loading the same file attach zero-copy instead of loading it again.
+    The local index maps registry mesh ids to this process' handles.
+    """
+
+    def __init__(self):
+        self._bound: Dict[str, SharedMeshHandle] = {}
+        registry.add_invalidation_hook(self._on_invalidate)
+        atexit.register(self.release_all)
+
+    def _attach_locked(self, key: str) -> Optional[SharedMeshHandle]:
+        try:
+            header = _open_segment(_segment_name(key, "h"))
+        except FileNotFoundError:
+            return None
+        meta = _read_header(header)
+        segments, arrays = {}, {}
+        for field, (dtype, shape) in meta["arrays"].items():
+            shm = _open_segment(_segment_name(key, SHARED_FIELDS[field]))
+            segments[field] = shm
+            arr = np.ndarray(tuple(shape), dtype=np.dtype(dtype), buffer=shm.buf)
+            arr.flags.writeable = False  # other workers see the same memory
+            arrays[field] = arr
+        textures = {}
+        for slot, (suffix, shape) in meta.get("textures", {}).items():
+            from PIL import Image
+            shm = _open_segment(_segment_name(key, suffix))
+            segments[slot] = shm
+            pixels = np.ndarray(tuple(shape), dtype=np.uint8, buffer=shm.buf)
+            pixels.flags.writeable = False
+            textures[slot] = Image.fromarray(pixels, "RGBA")
+
+        refcount = np.ndarray((1,), dtype=np.int64, buffer=header.buf[:_REFCOUNT_BYTES])
+        refcount[0] += 1
+        del refcount
+
+        mesh_data = SceneMeshData(
+            vertices=arrays["vertices"],
+            normals=arrays.get("normals"),
+            uvs=arrays.get("uvs"),
+            indices=arrays.get("indices"),
+            face_material_indices=arrays.get("face_material_indices"),
+            materials=meta["materials"],
+            textures=textures,
+            metadata={**meta["metadata"], "shared_key": key}
+        )
+        return SharedMeshHandle(key, header, segments, mesh_data)
+
+    def attach(self, key: str) -> Optional[SharedMeshHandle]:
+        """Attach to a mesh another worker already published, None if there is none."""
+        with _KeyLock(key):
+            return self._attach_locked(key)
+
+    def publish(self, key: str, mesh_data: SceneMeshData) -> SharedMeshHandle:
+        """
+        Copy the geometry and the PIL base color textures (as RGBA pixels) into shared
+        segments. If another worker published the same key meanwhile, attach to theirs instead.
+        """
+        with _KeyLock(key) as lock:
+            handle = self._attach_locked(key)
+            if handle is not None:
+                return handle
+
+            meta = {"arrays": {}, "textures": {}, "materials": mesh_data.materials, "metadata": mesh_data.metadata}
+            segments = {}
+
+            def copy_segment(name, suffix, arr):
+                arr = np.ascontiguousarray(arr)
+                shm = _open_segment(_segment_name(key, suffix), create=True, size=max(arr.nbytes, 1))
+                segments[name] = shm
+                np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[...] = arr
+                lock.refresh()
+                return [arr.dtype.str, list(arr.shape)]
+
+            try:
+                for field, suffix in SHARED_FIELDS.items():
+                    arr = getattr(mesh_data, field)
+                    if arr is not None:
+                        meta["arrays"][field] = copy_segment(field, suffix, arr)
+                for n, (slot, image) in enumerate(sorted(mesh_data.textures.items())):
+                    # Tensors from image inputs never reach the loader; only file textures are shared
+                    if hasattr(image, "convert"):
+                        suffix = f"t{n}"
+                        meta["textures"][slot] = [suffix, copy_segment(slot, suffix, np.asarray(image.convert("RGBA")))[1]]
+
+                # Header last: attachers only ever see complete meshes
+                payload = json.dumps(meta, default=str).encode("utf-8")
+                header = _open_segment(_segment_name(key, "h"), create=True,
+                                       size=_REFCOUNT_BYTES + 4 + len(payload))
+            except Exception:
+                for shm in segments.values():
+                    shm.close()
+                    _unlink_segment(shm)
+                raise
+            np.ndarray((1,), dtype=np.uint32, buffer=header.buf[_REFCOUNT_BYTES:_REFCOUNT_BYTES + 4])[0] = len(payload)
+            header.buf[_REFCOUNT_BYTES + 4:_REFCOUNT_BYTES + 4 + len(payload)] = payload
+            for shm in segments.values():
+                shm.close()
+            header.close()
+            print(f"[Mixo3D] Published shared mesh {key} ({sum(s.size for s in segments.values()) / 1e6:.1f} MB)")
+            return self._attach_locked(key)
+
+    def register_mesh(self, key: str, mesh_id: str, loader: Callable[[], SceneMeshData]) -> SceneMeshData:
+        """Attach to (or load and publish) the mesh for key and register it under mesh_id."""
+        handle = self.attach(key)
+        if handle is None:
+            handle = self.publish(key, loader())
+        else:
+            print(f"[Mixo3D] Attached shared mesh {key} for {mesh_id}")
+        previous = self._bound.pop(mesh_id, None)
+        registry.register_mesh(handle.mesh_data, requested_id=mesh_id)
+        self._bound[mesh_id] = handle
+        if previous is not None and previous is not handle:
+            previous.release()
+        return handle.mesh_data
+
+    def _on_invalidate(self, item_id: Optional[str]):
+        if item_id is None:
+            self.release_all()
+            return
+        handle = self._bound.get(item_id)
+        if handle is not None and registry.get_mesh(item_id) is not handle.mesh_data:
+            del self._bound[item_id]
+            handle.release()
+
+    def release_all(self):
+        handles, self._bound = list(self._bound.values()), {}
+        for handle in handles:
+            handle.release()
+
+# Singleton instance
+shared_store = SharedMeshStore()
@@ -0,0 +1,171 @@
+from typing import Dict, List, Tuple
+import numpy as np
+from .mesh_model import SceneMeshData, base_color_texture_key
+from .material_edits import clone_mesh_data, ensure_material_slot
+
+def shelf_pack(sizes: List[Tuple[int, int]], max_size: int):
+    """
+    Pack (w, h) rectangles into as few max_size x max_size bins as possible,
+    tallest first, left to right on shelves.
+    Returns (placements [(bin, x, y)] in input order, [(bin_w, bin_h)]).
+    """
+    order = sorted(range(len(sizes)), key=lambda i: (-sizes[i][1], -sizes[i][0]))
+    placements = [None] * len(sizes)
+    bins = []  # [used_w, used_h, shelf_y, shelf_h, cursor_x]
+
+    for i in order:
+        w, h = sizes[i]
+        for b_idx, b in enumerate(bins):
+            used_w, used_h, shelf_y, shelf_h, cursor_x = b
+            if cursor_x + w <= max_size and shelf_y + h <= max_size and h <= shelf_h:
+                break  # fits on the current shelf
+            if shelf_y + shelf_h + h <= max_size:
+                # open a new shelf below
+                b[2], b[3], b[4] = shelf_y + shelf_h, h, 0
+                break
+        else:
+            bins.append([0, 0, 0, h, 0])
+            b_idx, b = len(bins) - 1, bins[-1]
+
+        x, y = b[4], b[2]
+        placements[i] = (b_idx, x, y)
+        b[4] = x + w
+        b[0] = max(b[0], x + w)
+        b[1] = max(b[1], y + h)
+
+    return placements, [(b[0], b[1]) for b in bins]
+
+def _tile_pixels(image, factor, max_inner: int, padding: int) -> np.ndarray:
+    """RGBA tile with the base color factor baked in and `padding` pixels of edge bleed."""
+    from PIL import Image
+    img = image.convert("RGBA")
+    if max(img.size) > max_inner:
+        scale = max_inner / max(img.size)
+        img = img.resize((max(1, int(img.width * scale)), max(1, int(img.height * scale))), Image.LANCZOS)
+    pixels = np.asarray(img, dtype=np.float32) * np.asarray(factor, dtype=np.float32)
+    pixels = np.clip(pixels + 0.5, 0, 255).astype(np.uint8)
+    if padding:
+        pixels = np.pad(pixels, ((padding, padding), (padding, padding), (0, 0)), mode="edge")
+    return pixels
+
+def build_texture_atlas(mesh_data: SceneMeshData, max_atlas_size: int = 2048, padding: int = 4):
+    """
+    Pack base color textures of materials that share metallic/roughness into
+    atlases and merge those materials. Materials whose UVs leave 0..1 (tiling)
+    keep their own texture. Returns (new_mesh_data, stats dict).
+    """
+    from PIL import Image
+    from .glb_exporter import texture_to_image
+
+    stats = {"atlases": 0, "packed_materials": 0, "skipped_materials": 0}
+    if mesh_data.indices is None or mesh_data.uvs is None or not mesh_data.textures:
+        return mesh_data, stats
+
+    new_mesh = clone_mesh_data(mesh_data)
+    face_mats = np.asarray(new_mesh.face_material_indices, dtype=np.int64)
+    if len(face_mats):
+        ensure_material_slot(new_mesh, int(face_mats.max()))
+    n_mats = len(new_mesh.materials)
+    uvs = np.asarray(mesh_data.uvs, dtype=np.float64)
+
+    # 📦 Candidates: used, textured, and UVs inside the unit square
+    groups: Dict[tuple, List[int]] = {}
+    images = {}
+    for m_idx in np.unique(face_mats):
+        m_idx = int(m_idx)
+        image = texture_to_image(new_mesh.textures.get(base_color_texture_key(m_idx)))
+        if image is None:
+            continue
+        used_uvs = uvs[np.unique(mesh_data.indices[face_mats == m_idx])]
+        if used_uvs.min() < -1e-4 or used_uvs.max() > 1 + 1e-4:
+            stats["skipped_materials"] += 1
+            continue
+        mat = new_mesh.materials[m_idx]
+        key = (round(float(mat.get("metallic", 0.0)), 3), round(float(mat.get("roughness", 0.5)), 3))
+        groups.setdefault(key, []).append(m_idx)
+        images[m_idx] = image
+
+    if not images:
+        return mesh_data, stats
+
+    # Per-material uv transform: u' = u * su + ou, v' = v * sv + ov
+    uv_xform = np.zeros((n_mats, 4))
+    merged_of = {}  # old material index -> merged material index (into merged_mats)
+    merged_mats, merged_textures = [], []
+    max_inner = max(1, max_atlas_size - 2 * padding)
+
+    for (metallic, roughness), members in groups.items():
+        tiles = [_tile_pixels(images[m], new_mesh.materials[m].get("base_color", [1, 1, 1, 1]), max_inner, padding)
+                 for m in members]
+        placements, bin_sizes = shelf_pack([(t.shape[1], t.shape[0]) for t in tiles], max_atlas_size)
+        canvases = [np.zeros((h, w, 4), dtype=np.uint8) for w, h in bin_sizes]
+        first_merged = len(merged_mats)
+        for b_idx in range(len(bin_sizes)):
+            merged_mats.append({
+                "name": f"Atlas_{len(merged_mats)}",
+                "base_color": [1.0, 1.0, 1.0, 1.0],
+                "metallic": metallic,
+                "roughness": roughness
+            })
+
+        for m_idx, tile, (b_idx, x, y) in zip(members, tiles, placements):
+            th, tw = tile.shape[:2]
+            canvases[b_idx][y:y + th, x:x + tw] = tile
+            W, H = bin_sizes[b_idx]
+            w, h = tw - 2 * padding, th - 2 * padding
+            # uvs are bottom-left origin, image rows top-down
+            uv_xform[m_idx] = [w / W, h / H, (x + padding) / W, 1.0 - (y + padding + h) / H]
+            merged_of[m_idx] = first_merged + b_idx
+
+        for canvas in canvases:
+            merged_textures.append(Image.fromarray(canvas, "RGBA"))
+
+    # ✂️ Split vertices shared by faces whose uvs now differ (vertex, remapped material)
+    packed = np.zeros(n_mats, dtype=bool)
+    packed[list(merged_of)] = True
+    corner_mat = np.repeat(np.where(packed[face_mats], face_mats, -1), 3)
+    corner_key = mesh_data.indices.reshape(-1).astype(np.int64) * (n_mats + 1) + (corner_mat + 1)
+    unique_keys, inverse = np.unique(corner_key, return_inverse=True)
+    src_vertex = unique_keys // (n_mats + 1)
+    vertex_mat = unique_keys % (n_mats + 1) - 1
+
+    new_uvs = uvs[src_vertex].copy()
+    remap = vertex_mat >= 0
+    xf = uv_xform[vertex_mat[remap]]
+    new_uvs[remap, 0] = new_uvs[remap, 0] * xf[:, 0] + xf[:, 2]
+    new_uvs[remap, 1] = new_uvs[remap, 1] * xf[:, 1] + xf[:, 3]
+
+    # Materials: untouched ones keep their order, merged atlases are appended
+    kept = [m for m in range(n_mats) if not packed[m]]
+    mat_remap = np.zeros(n_mats, dtype=np.int64)
+    mat_remap[kept] = np.arange(len(kept))
+    for old, merged in merged_of.items():
+        mat_remap[old] = len(kept) + merged
+
+    textures = {k: v for k, v in new_mesh.textures.items() if not k.startswith("base_color_texture")}
+    for new_idx, old_idx in enumerate(kept):
+        tex = new_mesh.textures.get(base_color_texture_key(old_idx))
+        if tex is not None:
+            textures[base_color_texture_key(new_idx)] = tex
+    for i, atlas in enumerate(merged_textures):
+        textures[base_color_texture_key(len(kept) + i)] = atlas
+
+    result = SceneMeshData(
+        vertices=mesh_data.vertices[src_vertex],
+        # Resolved before the UV split so seams keep smooth shared normals
+        normals=mesh_data.get_vertex_normals()[src_vertex] if mesh_data.indices is not None else None,
+        uvs=new_uvs.astype(mesh_data.uvs.dtype),
+        indices=inverse.reshape(-1, 3).astype(mesh_data.indices.dtype),
+        materials=[new_mesh.materials[m] for m in kept] + merged_mats,
+        textures=textures,
+        face_material_indices=mat_remap[face_mats].astype(np.int32),
+        metadata=new_mesh.metadata
+    )
+
+    stats.update({
+        "atlases": len(merged_textures),
+        "packed_materials": len(merged_of),
+        "atlas_sizes": [list(t.size) for t in merged_textures],
+        "material_count": len(result.materials),
+    })
+    return result, stats
@@ -0,0 +1,49 @@
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+from .scene_registry import registry
+from .transform_index import transform_index
+
+class TransformDeltaTracker:
+    """
+    Remembers the last layout of each assembly so a re-run that only moved
+    nodes can be described as a list of matrices instead of a new scene.
+    """
+
+    def __init__(self):
+        self._layouts: Dict[str, dict] = {}
+
+    def update(self, key: str, slots: List[Tuple[str, int, str]], scene_rot: np.ndarray,
+               extra_signature=()) -> Optional[List[dict]]:
+        """
+        slots: (input_name, index_in_input, root_id) per assembled root.
+        Returns the changed entries if only transforms differ from the previous
+        run of `key`, an empty list if nothing changed, or None if the geometry
+        (inputs, leaf meshes, settings) changed and a full update is needed.
+        """
+        matrices, leaves = transform_index.resolve_many([root for _, _, root in slots])
+        matrices = scene_rot @ matrices
+        # Leaf mesh content: a different mesh registered under the same id is a geometry change
+        mesh_hashes = {}
+        for leaf in leaves:
+            if leaf and leaf not in mesh_hashes:
+                mesh = registry.get_mesh(leaf)
+                mesh_hashes[leaf] = mesh.get_hash() if mesh is not None else None
+        signature = (tuple((slot, idx, leaf, mesh_hashes.get(leaf))
+                           for (slot, idx, _), leaf in zip(slots, leaves)), tuple(extra_signature))
+
+        previous = self._layouts.get(key)
+        self._layouts[key] = {"signature": signature, "matrices": matrices}
+        if previous is None or previous["signature"] != signature:
+            return None
+
+        changed = ~np.isclose(previous["matrices"], matrices, atol=1e-9).all(axis=(1, 2))
+        return [{
+            "slot": slots[i][0],
+            "index": slots[i][1],
+            "node_id": slots[i][2],
+            # Row-major world matrix including the scene orientation
+            "matrix": matrices[i].ravel().tolist(),
+        } for i in np.flatnonzero(changed)]
+
+# Singleton instance
+delta_tracker = TransformDeltaTracker()
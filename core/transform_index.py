@@ -0,0 +1,89 @@
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+from .scene_registry import registry
+from .mesh_model import SceneNodeData, SceneMeshData
+
+class TransformIndex:
+    """
+    Memoized world-matrix resolution for node -> node -> ... -> mesh chains.
+    Each resolved id stores (world_matrix, leaf_mesh_id). Re-registering any id
+    drops the cached entries of every node whose chain passes through it.
+    """
+
+    def __init__(self, source=None):
+        self.source = source if source is not None else registry
+        self._resolved: Dict[str, Tuple[np.ndarray, str]] = {}
+        # child id -> cached node ids that point at it
+        self._parents: Dict[str, set] = {}
+        self.source.add_invalidation_hook(self.invalidate)
+
+    def invalidate(self, item_id: Optional[str] = None):
+        """Drop item_id and all cached nodes stacked on top of it (everything if None)."""
+        if item_id is None:
+            self._resolved.clear()
+            self._parents.clear()
+            return
+        stack = [item_id]
+        while stack:
+            current = stack.pop()
+            self._resolved.pop(current, None)
+            stack.extend(self._parents.pop(current, ()))
+
+    def resolve(self, item_id: str) -> Optional[Tuple[np.ndarray, str]]:
+        """
+        Returns (world_matrix, leaf_mesh_id) for a node or mesh id, or None if
+        the chain is broken or cyclic. Iterative, so chain depth is unbounded.
+        """
+        cached = self._resolved.get(item_id)
+        if cached is not None:
+            return cached
+
+        chain = []
+        seen = set()
+        current = item_id
+        while True:
+            tail = self._resolved.get(current)
+            if tail is not None:
+                break
+            if current in seen:
+                print(f"[Mixo3D] Warning: Cyclic transform chain at '{current}' (from '{item_id}')")
+                return None
+            item = self.source.get_any(current)
+            if isinstance(item, SceneMeshData):
+                tail = (np.eye(4), current)
+                self._resolved[current] = tail
+                break
+            if not isinstance(item, SceneNodeData):
+                return None
+            seen.add(current)
+            chain.append((current, item.transform))
+            current = item.mesh_id
+
+        # Unwind innermost first: New = Parent * Child
+        world, leaf = tail
+        child = current
+        for node_id, local in reversed(chain):
+            world = local @ world
+            self._resolved[node_id] = (world, leaf)
+            self._parents.setdefault(child, set()).add(node_id)
+            child = node_id
+        return self._resolved[item_id]
+
+    def resolve_many(self, item_ids: List[str]) -> Tuple[np.ndarray, List[Optional[str]]]:
+        """
+        Bulk resolve. Returns stacked (K, 4, 4) world matrices and the leaf mesh
+        id per root. Unresolvable roots get an identity matrix and a None leaf.
+        """
+        matrices = np.tile(np.eye(4), (len(item_ids), 1, 1))
+        leaves: List[Optional[str]] = []
+        for i, item_id in enumerate(item_ids):
+            res = self.resolve(item_id)
+            if res is None:
+                leaves.append(None)
+                continue
+            matrices[i] = res[0]
+            leaves.append(res[1])
+        return matrices, leaves
+
+# Singleton instance
+transform_index = TransformIndex()
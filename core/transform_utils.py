@@ -1,5 +1,4 @@
 import numpy as np
-from scipy.spatial.transform import Rotation as R
 
 def create_trs_matrix(position=(0, 0, 0), rotation=(0, 0, 0), scale=(1, 1, 1)):
     """
@@ -55,3 +54,64 @@ def apply_transform(vertices, matrix):
     """
     pts = np.hstack([vertices, np.ones((vertices.shape[0], 1))])
     return (pts @ matrix.T)[:, :3]
+
+def create_trs_matrices(positions, rotations, scales):
+    """
+    Batched create_trs_matrix: build K TRS matrices in one NumPy pass.
+    positions/rotations/scales are (K, 3) arrays (rotation in degrees, Euler 'XYZ').
+    Returns a (K, 4, 4) array.
+    """
+    positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+    rotations = np.radians(np.asarray(rotations, dtype=np.float64).reshape(-1, 3))
+    scales = np.asarray(scales, dtype=np.float64).reshape(-1, 3)
+    positions, rotations, scales = np.broadcast_arrays(positions, rotations, scales)
+
+    c1, c2, c3 = np.cos(rotations).T
+    s1, s2, s3 = np.sin(rotations).T
+
+    # Same XYZ layout as create_trs_matrix
+    r = np.empty((len(rotations), 3, 3))
+    r[:, 0, 0] = c2 * c3
+    r[:, 0, 1] = -c2 * s3
+    r[:, 0, 2] = s2
+    r[:, 1, 0] = c1 * s3 + c3 * s1 * s2
+    r[:, 1, 1] = c1 * c3 - s1 * s2 * s3
+    r[:, 1, 2] = -c2 * s1
+    r[:, 2, 0] = s1 * s3 - c1 * c3 * s2
+    r[:, 2, 1] = c3 * s1 + c1 * s2 * s3
+    r[:, 2, 2] = c1 * c2
+
+    # T * R * S == R with columns scaled, translation in the last column
+    mats = np.zeros((len(r), 4, 4))
+    mats[:, :3, :3] = r * scales[:, None, :]
+    mats[:, :3, 3] = positions
+    mats[:, 3, 3] = 1.0
+    return mats
+
+def up_direction_matrix(up_direction="Y"):
+    """
+    Scene-wide orientation that converts the chosen Up axis to glTF's Y-up.
+    Matches the viewer's makeRotationX calls.
+    """
+    if up_direction == "Z":
+        return create_trs_matrix(rotation=(-90, 0, 0))
+    elif up_direction == "-Y":
+        return create_trs_matrix(rotation=(180, 0, 0))
+    elif up_direction == "-Z":
+        return create_trs_matrix(rotation=(90, 0, 0))
+    return np.eye(4)
+
+def transform_normals(normals, matrix):
+    """
+    Transform (N, 3) unit normals by a 4x4 matrix. Rotation plus uniform scale
+    keeps them unit length, so only non-uniform scale pays for the inverse
+    transpose and a renormalize.
+    """
+    m3 = np.asarray(matrix, dtype=np.float64)[:3, :3]
+    gram = m3.T @ m3
+    scale_sq = gram[0, 0]
+    if scale_sq > 0 and np.allclose(gram, np.eye(3) * scale_sq, rtol=0, atol=1e-9 * scale_sq):
+        return normals @ (m3 / np.sqrt(scale_sq)).T
+    out = normals @ np.linalg.inv(m3)
+    lengths = np.linalg.norm(out, axis=1, keepdims=True)
+    return np.divide(out, lengths, out=np.zeros_like(out), where=lengths != 0)
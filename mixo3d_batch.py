@@ -0,0 +1,57 @@
+"""
+Headless batch exports without ComfyUI.
+
+    python mixo3d_batch.py jobs.json --workers 8 --cache-dir ~/.cache/mixo3d
+
+As a Python API, importing this file registers the package under the
+"mixo3dtools" alias (without running the ComfyUI __init__):
+
+    import mixo3d_batch
+    from mixo3dtools.core.batch import run_job, run_jobs, load_manifest
+
+See core/batch.py for the manifest format.
+"""
+import os
+import sys
+import types
+import argparse
+
+PACKAGE_NAME = "mixo3dtools"
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def install_package_alias():
+    """Make the core modules importable as mixo3dtools.core.* outside ComfyUI."""
+    if PACKAGE_NAME not in sys.modules:
+        pkg = types.ModuleType(PACKAGE_NAME)
+        pkg.__path__ = [PACKAGE_DIR]
+        sys.modules[PACKAGE_NAME] = pkg
+    return sys.modules[PACKAGE_NAME]
+
+# Module level on purpose: spawned pool workers re-import this file before unpickling jobs
+install_package_alias()
+
+def main(argv=None):
+    from mixo3dtools.core.batch import load_manifest, run_jobs
+    from mixo3dtools.core.mesh_loading import default_cache_dir
+
+    parser = argparse.ArgumentParser(description="Run Mixo3D assemble-and-export jobs from a manifest.")
+    parser.add_argument("manifest", help="JSON or YAML job manifest")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="process pool size (1 = inline)")
+    parser.add_argument("--cache-dir", default=default_cache_dir(),
+                        help="on-disk mesh cache shared with MeshFromPath (default: $MIXO3D_MESH_CACHE_DIR)")
+    args = parser.parse_args(argv)
+
+    jobs = load_manifest(args.manifest)["jobs"]
+    print(f"[Mixo3D] Running {len(jobs)} jobs on {args.workers} workers")
+
+    def report(result):
+        status = f"ERROR {result['error']}" if result["error"] else ", ".join(result["outputs"])
+        print(f"[Mixo3D] {result['name']} ({result['seconds']}s): {status}")
+
+    results = run_jobs(jobs, args.workers, args.cache_dir, progress=report)
+    failed = sum(1 for r in results if r["error"])
+    print(f"[Mixo3D] Done: {len(results) - failed} ok, {failed} failed")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
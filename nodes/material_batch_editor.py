@@ -0,0 +1,97 @@
+import os
+import uuid
+import folder_paths
+from ..core.scene_registry import registry
+from ..core.mesh_model import SceneNodeData
+from ..core.material_edits import parse_material_edits, apply_material_edits
+
+MAX_TEXTURE_INPUTS = 4
+
+class MeshMaterialBatchEditor:
+    @classmethod
+    def INPUT_TYPES(s):
+        return {
+            "required": {
+                "mesh_id": ("STRING", {"forceInput": True}),
+                "edits": ("STRING", {
+                    "multiline": True,
+                    "default": "# selector, color, metallic, roughness, texture\n# 0, #ff0000, 0.0, 0.4, texture_1\n# Metal*, -, 1.0, 0.2, -"
+                }),
+                "show_preview": ("BOOLEAN", {"default": True}),
+            },
+            "optional": {
+                f"texture_{i}": ("IMAGE",) for i in range(1, MAX_TEXTURE_INPUTS + 1)
+            }
+        }
+
+    RETURN_TYPES = ("STRING", "STRING")
+    RETURN_NAMES = ("mesh_id", "model_file")
+    FUNCTION = "apply_edits"
+    CATEGORY = "mixo3dtools"
+
+    def apply_edits(self, mesh_id, edits, show_preview=True, **kwargs):
+        item = registry.get_any(mesh_id)
+        if not item: return {"ui": {}, "result": ("", "")}
+
+        target_mesh_id = mesh_id
+        if isinstance(item, SceneNodeData):
+            target_mesh_id = item.mesh_id
+
+        mesh_data = registry.get_mesh(target_mesh_id)
+        if not mesh_data: return {"ui": {}, "result": ("", "")}
+
+        textures = {k: v for k, v in kwargs.items() if k.startswith("texture_") and v is not None}
+        try:
+            edit_list = parse_material_edits(edits)
+            # One clone for the whole table
+            new_mesh_data, touched = apply_material_edits(mesh_data, edit_list, textures)
+        except ValueError as e:
+            print(f"[Mixo3D] ERROR: Invalid material edits: {e}")
+            return {"ui": {}, "result": ("", "")}
+
+        new_mesh_id = f"{target_mesh_id}_mod_{uuid.uuid4().hex[:4]}"
+        registry.register_mesh(new_mesh_data, requested_id=new_mesh_id)
+
+        # Preserve transform if incoming was a node
+        final_id = new_mesh_id
+        if isinstance(item, SceneNodeData):
+            node_data = SceneNodeData(
+                mesh_id=new_mesh_id,
+                transform=item.transform,
+                metadata=item.metadata.copy()
+            )
+            final_id = registry.register_node(node_data)
+
+        print(f"[Mixo3D] Batch material edit: {len(edit_list)} edits, {len(touched)} materials changed")
+
+        ui_data = {
+            "settings": {
+                "show_preview": show_preview,
+                "material_count": len(new_mesh_data.materials),
+                "edited_indices": touched
+            }
+        }
+
+        # At most one preview export, skipped when the preview is hidden
+        model_file = ""
+        if show_preview:
+            from ..core.glb_exporter import GLBExporter
+            out_dir = folder_paths.get_output_directory()
+            subfolder = "mixo3d_cache"
+            full_out_dir = os.path.join(out_dir, subfolder)
+            os.makedirs(full_out_dir, exist_ok=True)
+
+            preview_filename = f"preview_mat_{uuid.uuid4().hex[:8]}.glb"
+            GLBExporter.export([final_id], os.path.join(full_out_dir, preview_filename), add_preview_helpers=False)
+            model_file = os.path.join(subfolder, preview_filename)
+            ui_data["glb_url"] = [model_file]
+
+        return {"ui": ui_data, "result": (final_id, model_file)}
+
+NODE_CLASS_MAPPINGS = {
+    "MeshMaterialBatchEditor": MeshMaterialBatchEditor
+}
+
+NODE_DISPLAY_NAME_MAPPINGS = {
+    "MeshMaterialBatchEditor": "Mesh Material Batch Editor"
+}
@@ -1,11 +1,9 @@
 import os
 import uuid
-import torch
-import numpy as np
 import folder_paths
 from ..core.scene_registry import registry
-from ..core.mesh_model import SceneNodeData, SceneMeshData
-from ..core.glb_exporter import GLBExporter
+from ..core.mesh_model import SceneNodeData, base_color_texture_key
+from ..core.material_edits import MAX_MATERIAL_INDEX, clone_mesh_data, ensure_material_slot
 
 class MeshMaterialInspector:
     @classmethod
@@ -13,7 +11,7 @@ class MeshMaterialInspector:
         return {
             "required": {
                 "mesh_id": ("STRING", {"forceInput": True}),
-                "material_index": ("INT", {"default": 0, "min": 0, "max": 128, "step": 1}),
+                "material_index": ("INT", {"default": 0, "min": 0, "max": MAX_MATERIAL_INDEX, "step": 1}),
                 "rename_material": ("STRING", {"default": ""}),
                 "texture_mode": (["Keep Existing", "Update/Replace", "Remove (Solid Color)"], {"default": "Keep Existing"}),
                 "base_color_r": ("FLOAT", {"default": 1.0, "min": 0.0, "max": 1.0, "step": 0.01}),
@@ -48,29 +46,9 @@ class MeshMaterialInspector:
         mesh_data = registry.get_mesh(target_mesh_id)
         if not mesh_data: return {"ui": {}, "result": ("", "")}
 
-        face_indices = mesh_data.face_material_indices
-        if face_indices is None:
-            face_indices = np.zeros(len(mesh_data.indices), dtype=np.int32)
-
         # Clone geometry and textures
-        new_mesh_data = SceneMeshData(
-            vertices=mesh_data.vertices,
-            indices=mesh_data.indices,
-            normals=mesh_data.normals,
-            uvs=mesh_data.uvs,
-            textures=mesh_data.textures.copy(),
-            materials=[dict(m) for m in mesh_data.materials],
-            face_material_indices=face_indices
-        )
-        
-        while len(new_mesh_data.materials) <= material_index:
-            new_mat_idx = len(new_mesh_data.materials)
-            new_mesh_data.materials.append({
-                "name": f"GeneratedShader_{new_mat_idx}", 
-                "base_color": [0.8, 0.8, 0.8, 1.0], 
-                "roughness": 0.5, 
-                "metallic": 0.0
-            })
+        new_mesh_data = clone_mesh_data(mesh_data)
+        ensure_material_slot(new_mesh_data, material_index)
 
         # Rename Logic
         current_mat = new_mesh_data.materials[material_index]
@@ -80,7 +58,7 @@ class MeshMaterialInspector:
         current_mat_name = current_mat.get("name", "Unknown Shader")
 
         # Texture Logic
-        tex_key = 'base_color_texture' if material_index == 0 else f'base_color_texture_{material_index}'
+        tex_key = base_color_texture_key(material_index)
         
         if texture_mode == "Remove (Solid Color)":
             if tex_key in new_mesh_data.textures:
@@ -112,6 +90,7 @@ class MeshMaterialInspector:
             )
             final_id = registry.register_node(node_data)
 
+        from ..core.glb_exporter import GLBExporter
         out_dir = folder_paths.get_output_directory()
         subfolder = "mixo3d_cache"
         full_out_dir = os.path.join(out_dir, subfolder)
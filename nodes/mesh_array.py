@@ -0,0 +1,83 @@
+from ..core.scene_registry import registry
+from ..core.cache_keys import content_node_id
+from ..core.mesh_model import SceneNodeData
+from ..core.transform_utils import create_trs_matrix, create_trs_matrices
+from ..core.array_layouts import grid_layout, radial_layout, random_layout
+
+class MeshArray:
+    @classmethod
+    def INPUT_TYPES(s):
+        return {
+            "required": {
+                "mesh_id": ("STRING", {"forceInput": True}),
+                "layout": (["grid", "radial", "random"], {"default": "grid"}),
+                # grid
+                "count_x": ("INT", {"default": 3, "min": 1, "max": 1000, "step": 1}),
+                "count_y": ("INT", {"default": 1, "min": 1, "max": 1000, "step": 1}),
+                "count_z": ("INT", {"default": 3, "min": 1, "max": 1000, "step": 1}),
+                "spacing_x": ("FLOAT", {"default": 10.0, "min": -1000.0, "max": 1000.0, "step": 0.1}),
+                "spacing_y": ("FLOAT", {"default": 10.0, "min": -1000.0, "max": 1000.0, "step": 0.1}),
+                "spacing_z": ("FLOAT", {"default": 10.0, "min": -1000.0, "max": 1000.0, "step": 0.1}),
+                # radial / random
+                "count": ("INT", {"default": 8, "min": 1, "max": 100000, "step": 1}),
+                "radius": ("FLOAT", {"default": 50.0, "min": 0.0, "max": 10000.0, "step": 0.1}),
+                "axis": (["Y", "Z", "X"], {"default": "Y"}),
+                "sweep": ("FLOAT", {"default": 360.0, "min": -360.0, "max": 360.0, "step": 1.0}),
+                "face_center": ("BOOLEAN", {"default": True}),
+                "extent": ("FLOAT", {"default": 100.0, "min": 0.0, "max": 10000.0, "step": 0.1}),
+                "rotation_jitter": ("FLOAT", {"default": 0.0, "min": 0.0, "max": 180.0, "step": 1.0}),
+                "scale_min": ("FLOAT", {"default": 1.0, "min": 0.001, "max": 1000.0, "step": 0.01}),
+                "scale_max": ("FLOAT", {"default": 1.0, "min": 0.001, "max": 1000.0, "step": 0.01}),
+                "seed": ("INT", {"default": 0, "min": 0, "max": 0xffffffff}),
+                # applied to the whole array
+                "pos_x": ("FLOAT", {"default": 0.0, "min": -1000.0, "max": 1000.0, "step": 0.1}),
+                "pos_y": ("FLOAT", {"default": 0.0, "min": -1000.0, "max": 1000.0, "step": 0.1}),
+                "pos_z": ("FLOAT", {"default": 0.0, "min": -1000.0, "max": 1000.0, "step": 0.1}),
+            }
+        }
+
+    RETURN_TYPES = ("STRING", "INT")
+    RETURN_NAMES = ("mesh_id", "instance_count")
+    # One id per copy: single-id consumers run once per copy, list consumers receive them all
+    OUTPUT_IS_LIST = (True, False)
+    FUNCTION = "build_array"
+    CATEGORY = "mixo3dtools"
+
+    def build_array(self, mesh_id, layout="grid",
+                    count_x=3, count_y=1, count_z=3, spacing_x=10.0, spacing_y=10.0, spacing_z=10.0,
+                    count=8, radius=50.0, axis="Y", sweep=360.0, face_center=True,
+                    extent=100.0, rotation_jitter=0.0, scale_min=1.0, scale_max=1.0, seed=0,
+                    pos_x=0.0, pos_y=0.0, pos_z=0.0, **kwargs):
+        if isinstance(mesh_id, list):
+            mesh_id = mesh_id[0] if mesh_id else ""
+        if not mesh_id or not registry.get_any(mesh_id):
+            return ([], 0)
+
+        if layout == "radial":
+            pos, rot, scl = radial_layout(count, radius, axis, sweep=sweep, face_center=face_center)
+        elif layout == "random":
+            pos, rot, scl = random_layout(count, (extent, extent, extent), seed,
+                                          (rotation_jitter,) * 3, (scale_min, scale_max))
+        else:
+            pos, rot, scl = grid_layout((count_x, count_y, count_z), (spacing_x, spacing_y, spacing_z))
+
+        # ⚡ All instance matrices in one pass, then offset the whole array
+        matrices = create_trs_matrices(pos, rot, scl)
+        matrices = create_trs_matrix(position=(pos_x, pos_y, pos_z)) @ matrices
+
+        # Content ids: re-running an unchanged array reuses its registry entries and downstream caches
+        node_ids = []
+        for i, matrix in enumerate(matrices):
+            node_data = SceneNodeData(mesh_id=mesh_id, transform=matrix,
+                                      metadata={"array_layout": layout, "array_index": i})
+            node_ids.append(registry.register_node(node_data, requested_id=content_node_id(node_data)))
+
+        return (node_ids, len(node_ids))
+
+NODE_CLASS_MAPPINGS = {
+    "MeshArray": MeshArray
+}
+
+NODE_DISPLAY_NAME_MAPPINGS = {
+    "MeshArray": "Mesh Array / Scatter"
+}
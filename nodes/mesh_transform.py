@@ -1,11 +1,10 @@
 import os
-import uuid
 import folder_paths
 import numpy as np
 from ..core.scene_registry import registry
+from ..core.cache_keys import input_signature, content_node_id
 from ..core.mesh_model import SceneNodeData
 from ..core.transform_utils import create_trs_matrix
-from ..core.glb_exporter import GLBExporter
 
 class MeshTransform:
     @classmethod
@@ -34,11 +33,8 @@ class MeshTransform:
 
     @classmethod
     def IS_CHANGED(s, **kwargs):
-        import hashlib
-        h = hashlib.md5()
-        for key, val in sorted(kwargs.items()):
-            h.update(str(val).encode())
-        return h.hexdigest()
+        # fov / exposure / bg_color / show_preview only restyle the viewer
+        return input_signature(kwargs)
 
     def transform_mesh(self, mesh_id=None, pos_x=0.0, pos_y=0.0, pos_z=0.0, 
                        rot_x=0.0, rot_y=0.0, rot_z=0.0, 
@@ -63,8 +59,8 @@ class MeshTransform:
             }
         )
         
-        # Register node
-        node_id = registry.register_node(node_data)
+        # Register node under a content id so an unchanged transform keeps its id
+        node_id = registry.register_node(node_data, requested_id=content_node_id(node_data))
         
         # Pass data to UI, but DO NOT bake a GLB here.
         # The frontend will visualize the transformation live.
@@ -0,0 +1,91 @@
+import os
+import json
+import folder_paths
+from ..core.animation import (DEFAULT_TOLERANCE, tracks_from_frame_ids, tracks_from_keyframes,
+                              write_animated_glb)
+
+MAX_TRACKS = 8
+
+class SceneAnimationExporter:
+    @classmethod
+    def INPUT_TYPES(s):
+        return {
+            "required": {
+                "filename": ("STRING", {"default": "scene_animation"}),
+                "fps": ("INT", {"default": 24, "min": 1, "max": 120, "step": 1}),
+                "frame_count": ("INT", {"default": 0, "min": 0, "max": 10000, "step": 1}),
+                "up_direction": (["Y", "Z", "-Y", "-Z"], {"default": "Y"}),
+                "tolerance": ("FLOAT", {"default": DEFAULT_TOLERANCE, "min": 0.0, "max": 1.0, "step": 0.0001}),
+                "keyframes": ("STRING", {"multiline": True, "default": ""}),
+                "show_preview": ("BOOLEAN", {"default": True}),
+            },
+            "optional": {
+                f"track_{i}": ("STRING", {"forceInput": True}) for i in range(1, MAX_TRACKS + 1)
+            }
+        }
+
+    # Tracks receive every frame's id at once (batched MeshTransform runs, MeshArray lists)
+    INPUT_IS_LIST = True
+    RETURN_TYPES = ("STRING",)
+    RETURN_NAMES = ("model_file",)
+    FUNCTION = "export_animation"
+    CATEGORY = "mixo3dtools"
+    OUTPUT_NODE = True
+
+    def export_animation(self, filename, fps, frame_count, up_direction, tolerance, keyframes,
+                         show_preview, **kwargs):
+        # INPUT_IS_LIST: widgets arrive as one-element lists
+        filename, fps, frame_count = filename[0], fps[0], frame_count[0]
+        up_direction, tolerance, keyframes, show_preview = up_direction[0], tolerance[0], keyframes[0], show_preview[0]
+
+        tracks = []
+        for i in range(1, MAX_TRACKS + 1):
+            frame_ids = kwargs.get(f"track_{i}")
+            if not frame_ids:
+                continue
+            # A single upstream list output arrives nested
+            flat = [v for item in frame_ids for v in (item if isinstance(item, list) else [item]) if v]
+            track = tracks_from_frame_ids(flat, f"track_{i}")
+            if track is not None:
+                tracks.append(track)
+                frame_count = frame_count or len(flat)
+
+        if keyframes and keyframes.strip():
+            try:
+                key_data = json.loads(keyframes)
+            except json.JSONDecodeError as e:
+                print(f"[Mixo3D] ERROR: Invalid keyframes JSON: {e}")
+                return {"ui": {}, "result": ("",)}
+            if not frame_count:
+                frame_count = 1 + int(max((k.get("frame", 0) for keys in key_data.values() for k in keys), default=0))
+            tracks.extend(tracks_from_keyframes(key_data, frame_count))
+
+        if not tracks:
+            return {"ui": {}, "result": ("",)}
+
+        safe_name = "".join(c for c in filename if c.isalnum() or c in ('_', '-')).strip() or "scene_animation"
+        subfolder = "mixo3d_animation"
+        full_out_dir = os.path.join(folder_paths.get_output_directory(), subfolder)
+        os.makedirs(full_out_dir, exist_ok=True)
+        out_filename = f"{safe_name}.glb"
+
+        stats = write_animated_glb(os.path.join(full_out_dir, out_filename), tracks, fps,
+                                   up_direction, tolerance, name=safe_name)
+        if stats is None:
+            return {"ui": {}, "result": ("",)}
+
+        relative_path = os.path.join(subfolder, out_filename)
+        ui_data = {
+            "glb_url": [relative_path],
+            "settings": {"show_preview": show_preview, "up_direction": "Y"},
+            "stats": stats
+        }
+        return {"ui": ui_data, "result": (relative_path,)}
+
+NODE_CLASS_MAPPINGS = {
+    "SceneAnimationExporter": SceneAnimationExporter
+}
+
+NODE_DISPLAY_NAME_MAPPINGS = {
+    "SceneAnimationExporter": "Scene Animation Exporter"
+}
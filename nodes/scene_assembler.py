@@ -1,7 +1,10 @@
 import os
 import folder_paths
 from ..core.scene_registry import registry
-from ..core.glb_exporter import GLBExporter
+from ..core.cache_keys import input_signature
+from ..core.bounds import scene_bounds
+from ..core.transform_delta import delta_tracker
+from ..core.transform_utils import up_direction_matrix
 
 class SceneAssembler:
     @classmethod
@@ -17,59 +20,80 @@ class SceneAssembler:
                 "bg_color": ("STRING", {"default": "#1a1a1b"}),
                 "grid_size": (["10cm", "20cm", "30cm"], {"default": "10cm"}),
                 "optimize_mesh": (["none", "weld_vertices", "full"], {"default": "none"}),
+                "batch_materials": ("BOOLEAN", {"default": False}),
+                "progressive_chunks": (["off", "by_input", "octree"], {"default": "off"}),
+                "chunk_order": (["importance", "size"], {"default": "importance"}),
                 "use_cache": ("BOOLEAN", {"default": True}),
                 "export_format": (["glb", "obj", "stl"], {"default": "glb"}),
                 "export_filename": ("STRING", {"default": "scene_export"}),
                 "export_directory": ("STRING", {"default": ""}),
                 "trigger_export": (["true", "false"], {"default": "false"}),
+                "quantize_export": (["none", "KHR_mesh_quantization"], {"default": "none"}),
+                "position_bits": ("INT", {"default": 14, "min": 8, "max": 16, "step": 1}),
+                "normal_bits": ("INT", {"default": 8, "min": 8, "max": 16, "step": 8}),
+                "uv_bits": ("INT", {"default": 12, "min": 8, "max": 16, "step": 1}),
                 "show_preview": ("BOOLEAN", {"default": True}),
                 "show_stats": ("BOOLEAN", {"default": True}),
+            },
+            "hidden": {
+                "unique_id": "UNIQUE_ID",
             }
         }
 
+    # Mesh inputs receive every id of a list output (MeshArray copies) in one run
+    INPUT_IS_LIST = True
     RETURN_TYPES = ("STRING", "STRING")
     RETURN_NAMES = ("mesh_id", "model_file")
-    FUNCTION = "assemble_and_preview"
+    FUNCTION = "assemble_lists"
     CATEGORY = "mixo3dtools"
     OUTPUT_NODE = True
 
     @classmethod
     def IS_CHANGED(s, **kwargs):
-        import hashlib
-        h = hashlib.md5()
-        for key, val in sorted(kwargs.items()):
-            if val is None: continue
+        return input_signature(kwargs, "mesh_id_")
+
+    def assemble_lists(self, **kwargs):
+        # INPUT_IS_LIST: widgets arrive as one-element lists, mesh inputs as every upstream id
+        args = {}
+        for key, val in kwargs.items():
             if key.startswith("mesh_id_"):
-                item = registry.get_any(val)
-                if item:
-                    h.update(item.get_hash().encode())
+                args[key] = [v for item in val for v in (item if isinstance(item, list) else [item])]
             else:
-                h.update(str(val).encode())
-        return h.hexdigest()
+                args[key] = val[0] if isinstance(val, list) and val else val
+        return self.assemble_and_preview(**args)
 
     def assemble_and_preview(self, mesh_id_1=None, scene_name="assembled_scene", 
                              up_direction="Y", material_mode="original", 
                              fov=45.0, exposure=1.0, bg_color="#1a1a1b", grid_size="10cm",
-                             optimize_mesh="none", use_cache=True,
+                             optimize_mesh="none", batch_materials=False,
+                             progressive_chunks="off", chunk_order="importance", use_cache=True,
                              export_format="glb", export_filename="scene_export", 
                              export_directory="", trigger_export="false", 
+                             quantize_export="none", position_bits=14, normal_bits=8, uv_bits=12,
                              show_preview=True, show_stats=True, **kwargs):
         
         id_list = []
-        if mesh_id_1 and isinstance(mesh_id_1, str) and mesh_id_1.strip():
-            id_list.append(mesh_id_1)
-            
-        for i in range(2, 51):
-            val = kwargs.get(f"mesh_id_{i}")
+        slots = []
+        # Inputs may carry a single id or a list of ids (e.g. from MeshArray)
+        for i in range(1, 51):
+            val = mesh_id_1 if i == 1 else kwargs.get(f"mesh_id_{i}")
             if val:
-                if isinstance(val, list): id_list.extend(val)
-                elif isinstance(val, str) and val.strip(): id_list.append(val)
+                vals = val if isinstance(val, list) else [val]
+                vals = [v for v in vals if isinstance(v, str) and v.strip()]
+                id_list.extend(vals)
+                slots.extend((f"mesh_id_{i}", j, v) for j, v in enumerate(vals))
 
         if not id_list:
             return {"ui": {}, "result": ("", "")}
 
+        # Registry ids per input, in order; the viewer maps its traced objects onto them
+        node_slots = {}
+        for slot, _, item_id in slots:
+            node_slots.setdefault(slot, []).append(item_id)
+
         import uuid
         import trimesh
+        from ..core.glb_exporter import GLBExporter
         import numpy as np
         import hashlib
         from ..core.mesh_model import SceneMeshData
@@ -88,7 +112,7 @@ class SceneAssembler:
                 cache_key.update(item.get_hash().encode())
         cache_key.update(up_direction.encode())
         cache_key.update(optimize_mesh.encode())
-        if grid_size: cache_key.update(grid_size.encode())
+        if batch_materials: cache_key.update(b"batch_materials")
         cache_hash = cache_key.hexdigest()[:8]
         
         # Create a persistent combined GLB file for the assembled scene
@@ -103,6 +127,34 @@ class SceneAssembler:
         combined_path = os.path.join(full_out_dir, combined_filename)
         relative_combined_path = os.path.join(subfolder, combined_filename)
         
+        # ⚡ Transform-only re-run: push the new matrices to the viewer right away
+        transform_only = False
+        unique_id = kwargs.get("unique_id")
+        if unique_id is not None:
+            changes = delta_tracker.update(str(unique_id), slots, up_direction_matrix(up_direction),
+                                           extra_signature=(optimize_mesh, batch_materials))
+            if changes:
+                self.send_transform_delta(unique_id, scene_id, changes, node_slots)
+            # [] = same layout (only view settings changed): the viewer keeps what it has loaded
+            transform_only = changes is not None
+
+        # 📦 Progressive delivery: chunk GLBs + ordered manifest the viewer streams one by one.
+        # Written before the combined GLB; the bake is cached, so the combined export reuses it.
+        chunk_manifest = None
+        if progressive_chunks != "off":
+            from ..core.scene_chunks import MANIFEST_NAME, write_scene_chunks
+            chunk_subfolder = os.path.join(subfolder, f"{scene_id}_{progressive_chunks}_{chunk_order}")
+            chunk_manifest = os.path.join(chunk_subfolder, MANIFEST_NAME)
+            if not (use_cache and os.path.exists(os.path.join(output_dir, chunk_manifest))):
+                try:
+                    manifest_path = write_scene_chunks(GLBExporter.bake(id_list, up_direction, batch_materials),
+                                                       os.path.join(output_dir, chunk_subfolder),
+                                                       progressive_chunks, chunk_order)
+                    chunk_manifest = os.path.relpath(manifest_path, output_dir)
+                except Exception as e:
+                    print(f"[Mixo3D] Warning: Chunk export failed: {e}")
+                    chunk_manifest = None
+
         # Check if cached version exists
         use_existing = False
         stats = {}
@@ -123,8 +175,11 @@ class SceneAssembler:
                 }
         
         if not use_existing:
+            # ⚡ Bake once; the preview GLB, the registry mesh and any user export all reuse it
+            baked = GLBExporter.bake(id_list, up_direction, batch_materials)
+
             # Export the combined scene to a persistent GLB file
-            GLBExporter.export(id_list, combined_path, add_preview_helpers=False, up_direction=up_direction)
+            baked.write(combined_path, 'glb')
             
             # Apply mesh optimization if requested
             if optimize_mesh != "none":
@@ -158,85 +213,89 @@ class SceneAssembler:
                 except Exception as e:
                     print(f"[Mixo3D] Warning: Optimization failed: {e}")
             
-            # Load the combined GLB back and register it as a new mesh
+            # Register the combined mesh: straight from the bake, or reloaded if optimization rewrote the file
             try:
-                combined_mesh = trimesh.load(combined_path)
+                mesh_metadata = {"source": "scene_assembler", "input_count": len(id_list), "optimization": optimize_mesh}
+                if optimize_mesh == "none":
+                    combined_mesh_data = baked.to_mesh_data(mesh_metadata)
+                else:
+                    combined_mesh = trimesh.load(combined_path)
                 
-                # Handle both Scene and Mesh types
-                if isinstance(combined_mesh, trimesh.Scene):
-                    # Merge all geometries in the scene
-                    all_verts = []
-                    all_faces = []
-                    all_normals = []
-                    all_uvs = []
-                    all_mats = []
-                    all_face_mat_indices = []
+                    # Handle both Scene and Mesh types
+                    if isinstance(combined_mesh, trimesh.Scene):
+                        # Merge all geometries in the scene
+                        all_verts = []
+                        all_faces = []
+                        all_normals = []
+                        all_uvs = []
+                        all_mats = []
+                        all_face_mat_indices = []
                     
-                    v_offset = 0
-                    mat_cache = {}
+                        v_offset = 0
+                        mat_cache = {}
                     
-                    for name, mesh in combined_mesh.geometry.items():
-                        mat_obj = getattr(mesh.visual, 'material', None)
-                        mat_key = str(id(mat_obj)) if mat_obj else "default"
+                        for name, mesh in combined_mesh.geometry.items():
+                            mat_obj = getattr(mesh.visual, 'material', None)
+                            mat_key = str(id(mat_obj)) if mat_obj else "default"
                         
-                        if mat_key not in mat_cache:
-                            mat_idx = len(all_mats)
-                            mat_cache[mat_key] = mat_idx
-                            m_name = getattr(mat_obj, 'name', f"Material_{mat_idx}")
-                            if not m_name: m_name = f"Material_{mat_idx}"
+                            if mat_key not in mat_cache:
+                                mat_idx = len(all_mats)
+                                mat_cache[mat_key] = mat_idx
+                                m_name = getattr(mat_obj, 'name', f"Material_{mat_idx}")
+                                if not m_name: m_name = f"Material_{mat_idx}"
                             
-                            m_info = {
-                                "name": m_name,
-                                "base_color": [0.8, 0.8, 0.8, 1.0],
-                                "metallic": 0.0,
-                                "roughness": 0.5
-                            }
-                            if mat_obj and hasattr(mat_obj, 'baseColorFactor'):
-                                m_info["base_color"] = list(mat_obj.baseColorFactor)
-                                m_info["metallic"] = float(getattr(mat_obj, 'metallicFactor', 0.0))
-                                m_info["roughness"] = float(getattr(mat_obj, 'roughnessFactor', 0.5))
-                            all_mats.append(m_info)
+                                m_info = {
+                                    "name": m_name,
+                                    "base_color": [0.8, 0.8, 0.8, 1.0],
+                                    "metallic": 0.0,
+                                    "roughness": 0.5
+                                }
+                                if mat_obj and hasattr(mat_obj, 'baseColorFactor'):
+                                    m_info["base_color"] = list(mat_obj.baseColorFactor)
+                                    m_info["metallic"] = float(getattr(mat_obj, 'metallicFactor', 0.0))
+                                    m_info["roughness"] = float(getattr(mat_obj, 'roughnessFactor', 0.5))
+                                all_mats.append(m_info)
                         
-                        m_idx = mat_cache[mat_key]
-                        all_verts.append(mesh.vertices)
-                        all_faces.append(mesh.faces + v_offset)
-                        if hasattr(mesh, 'vertex_normals'): all_normals.append(mesh.vertex_normals)
-                        if hasattr(mesh.visual, 'uv'): all_uvs.append(mesh.visual.uv)
-                        else: all_uvs.append(np.zeros((len(mesh.vertices), 2)))
+                            m_idx = mat_cache[mat_key]
+                            all_verts.append(mesh.vertices)
+                            all_faces.append(mesh.faces + v_offset)
+                            if hasattr(mesh, 'vertex_normals'): all_normals.append(mesh.vertex_normals)
+                            if hasattr(mesh.visual, 'uv'): all_uvs.append(mesh.visual.uv)
+                            else: all_uvs.append(np.zeros((len(mesh.vertices), 2)))
                         
-                        all_face_mat_indices.append(np.full(len(mesh.faces), m_idx, dtype=np.int32))
-                        v_offset += len(mesh.vertices)
+                            all_face_mat_indices.append(np.full(len(mesh.faces), m_idx, dtype=np.int32))
+                            v_offset += len(mesh.vertices)
                     
-                    combined_mesh_data = SceneMeshData(
-                        vertices=np.vstack(all_verts) if all_verts else np.zeros((0,3)),
-                        indices=np.vstack(all_faces) if all_faces else np.zeros((0,3), dtype=np.int32),
-                        normals=np.vstack(all_normals) if all_normals else None,
-                        uvs=np.vstack(all_uvs) if all_uvs else None,
-                        materials=all_mats,
-                        face_material_indices=np.concatenate(all_face_mat_indices) if all_face_mat_indices else None,
-                        metadata={"source": "scene_assembler", "input_count": len(id_list), "optimization": optimize_mesh}
-                    )
-                else:
-                    # Single mesh
-                    mesh = combined_mesh
-                    m_obj = getattr(mesh.visual, 'material', None)
-                    m_name = getattr(m_obj, 'name', "CombinedMaterial")
+                        combined_mesh_data = SceneMeshData(
+                            vertices=np.vstack(all_verts) if all_verts else np.zeros((0,3)),
+                            indices=np.vstack(all_faces) if all_faces else np.zeros((0,3), dtype=np.int32),
+                            normals=np.vstack(all_normals) if all_normals else None,
+                            uvs=np.vstack(all_uvs) if all_uvs else None,
+                            materials=all_mats,
+                            face_material_indices=np.concatenate(all_face_mat_indices) if all_face_mat_indices else None,
+                            metadata=mesh_metadata
+                        )
+                    else:
+                        # Single mesh
+                        mesh = combined_mesh
+                        m_obj = getattr(mesh.visual, 'material', None)
+                        m_name = getattr(m_obj, 'name', "CombinedMaterial")
                     
-                    m_info = {"name": m_name, "base_color": [0.8, 0.8, 0.8, 1.0], "metallic": 0.0, "roughness": 0.5}
-                    if m_obj and hasattr(m_obj, 'baseColorFactor'):
-                        m_info["base_color"] = list(m_obj.baseColorFactor)
-                        m_info["metallic"] = float(getattr(m_obj, 'metallicFactor', 0.0))
-                        m_info["roughness"] = float(getattr(m_obj, 'roughnessFactor', 0.5))
+                        m_info = {"name": m_name, "base_color": [0.8, 0.8, 0.8, 1.0], "metallic": 0.0, "roughness": 0.5}
+                        if m_obj and hasattr(m_obj, 'baseColorFactor'):
+                            m_info["base_color"] = list(m_obj.baseColorFactor)
+                            m_info["metallic"] = float(getattr(m_obj, 'metallicFactor', 0.0))
+                            m_info["roughness"] = float(getattr(m_obj, 'roughnessFactor', 0.5))
                     
-                    combined_mesh_data = SceneMeshData(
-                        vertices=np.array(mesh.vertices, dtype=np.float32),
-                        indices=np.array(mesh.faces, dtype=np.int32),
-                        normals=np.array(mesh.vertex_normals, dtype=np.float32) if hasattr(mesh, 'vertex_normals') else None,
-                        uvs=np.array(mesh.visual.uv, dtype=np.float32) if hasattr(mesh.visual, 'uv') else None,
-                        materials=[m_info],
-                        face_material_indices=np.zeros(len(mesh.faces), dtype=np.int32),
-                        metadata={"source": "scene_assembler", "input_count": len(id_list), "optimization": optimize_mesh}
-                    )
+                        combined_mesh_data = SceneMeshData(
+                            vertices=np.array(mesh.vertices, dtype=np.float32),
+                            indices=np.array(mesh.faces, dtype=np.int32),
+                            normals=np.array(mesh.vertex_normals, dtype=np.float32) if hasattr(mesh, 'vertex_normals') else None,
+                            uvs=np.array(mesh.visual.uv, dtype=np.float32) if hasattr(mesh.visual, 'uv') else None,
+                            materials=[m_info],
+                            face_material_indices=np.zeros(len(mesh.faces), dtype=np.int32),
+                            metadata=mesh_metadata
+                        )
                 
                 # Register the combined mesh with the scene_id
                 registry.register_mesh(combined_mesh_data, requested_id=scene_id)
@@ -248,25 +307,24 @@ class SceneAssembler:
                     "materials": len(combined_mesh_data.materials),
                     "input_meshes": len(id_list),
                     "cached": False,
-                    "optimization": optimize_mesh
+                    "optimization": optimize_mesh,
+                    "primitives": len(baked.primitives)
                 }
                 
-                # Calculate bounding box
-                if len(combined_mesh_data.vertices) > 0:
-                    bbox_min = combined_mesh_data.vertices.min(axis=0)
-                    bbox_max = combined_mesh_data.vertices.max(axis=0)
-                    bbox_size = bbox_max - bbox_min
-                    stats["bbox_mm"] = {
-                        "width": float(bbox_size[0]),
-                        "height": float(bbox_size[1]),
-                        "depth": float(bbox_size[2])
-                    }
-                
             except Exception as e:
                 print(f"[Mixo3D] Warning: Could not register combined mesh: {e}")
                 # Still continue with the file output
                 stats = {"error": str(e)}
         
+        # Bounding box from cached per-mesh AABBs and node matrices (no bake needed)
+        bounds = scene_bounds(id_list, up_direction)
+        if bounds and "error" not in stats:
+            stats["bbox_mm"] = {
+                "width": bounds["size"][0],
+                "height": bounds["size"][1],
+                "depth": bounds["size"][2]
+            }
+
         # Handle optional user export
         final_result_path = relative_combined_path
         if trigger_export == "true":
@@ -283,8 +341,13 @@ class SceneAssembler:
             export_file_path = os.path.join(export_dir, actual_export_filename)
             
             # ⚡ IMPORTANT: Pass up_direction to match preview
-            GLBExporter.export(id_list, export_file_path, add_preview_helpers=False, 
-                               file_type=export_format, up_direction=up_direction)
+            quantization = None
+            if quantize_export == "KHR_mesh_quantization" and export_format == "glb":
+                quantization = {"position_bits": position_bits, "normal_bits": normal_bits, "uv_bits": uv_bits}
+            # Serialization only: the bake is cached by input hash
+            export_result = GLBExporter.bake(id_list, up_direction, batch_materials).write(export_file_path, export_format, quantization)
+            if isinstance(export_result, dict) and "error" not in stats:
+                stats["max_position_error"] = export_result["max_position_error"]
             
             if is_custom_path:
                 final_result_path = os.path.abspath(export_file_path)
@@ -302,6 +365,21 @@ class SceneAssembler:
             }
         }
         
+        if chunk_manifest:
+            ui_data["chunk_manifest"] = [chunk_manifest]
+
+        # Registry ids the viewer sends to /mixo3d/raycast for picking
+        ui_data["node_ids"] = list(id_list)
+        ui_data["node_slots"] = node_slots
+
+        # Framing data so the viewer can position the camera before the GLB arrives
+        if bounds:
+            ui_data["bounds"] = bounds
+        
+        # Viewer keeps its loaded objects and relies on the delta message
+        if transform_only:
+            ui_data["transform_only"] = True
+
         # Add statistics if enabled
         if show_stats and stats:
             ui_data["stats"] = stats
@@ -314,6 +392,20 @@ class SceneAssembler:
         # Return the new scene_id and the appropriate file path
         return {"ui": ui_data, "result": (scene_id, final_result_path)}
 
+    @staticmethod
+    def send_transform_delta(unique_id, scene_id, changes, node_slots):
+        try:
+            from server import PromptServer
+            # node_slots rides along: content ids change with the transform, and this arrives before onExecuted
+            PromptServer.instance.send_sync("mixo3d.transform_delta", {
+                "node": str(unique_id),
+                "scene_id": scene_id,
+                "updates": changes,
+                "node_slots": node_slots
+            })
+        except Exception as e:
+            print(f"[Mixo3D] Warning: Could not send transform delta: {e}")
+
 NODE_CLASS_MAPPINGS = {
     "SceneAssembler": SceneAssembler
 }
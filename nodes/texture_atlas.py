@@ -0,0 +1,81 @@
+import os
+import uuid
+import folder_paths
+from ..core.scene_registry import registry
+from ..core.mesh_model import SceneNodeData
+from ..core.texture_atlas import build_texture_atlas
+
+class MeshTextureAtlas:
+    @classmethod
+    def INPUT_TYPES(s):
+        return {
+            "required": {
+                "mesh_id": ("STRING", {"forceInput": True}),
+                "max_atlas_size": ("INT", {"default": 2048, "min": 256, "max": 8192, "step": 256}),
+                "padding": ("INT", {"default": 4, "min": 0, "max": 64, "step": 1}),
+                "show_preview": ("BOOLEAN", {"default": True}),
+            }
+        }
+
+    RETURN_TYPES = ("STRING", "STRING")
+    RETURN_NAMES = ("mesh_id", "model_file")
+    FUNCTION = "bake_atlas"
+    CATEGORY = "mixo3dtools"
+
+    def bake_atlas(self, mesh_id, max_atlas_size, padding, show_preview=True):
+        item = registry.get_any(mesh_id)
+        if not item: return {"ui": {}, "result": ("", "")}
+
+        target_mesh_id = mesh_id
+        if isinstance(item, SceneNodeData):
+            target_mesh_id = item.mesh_id
+
+        mesh_data = registry.get_mesh(target_mesh_id)
+        if not mesh_data: return {"ui": {}, "result": ("", "")}
+
+        new_mesh_data, stats = build_texture_atlas(mesh_data, max_atlas_size, padding)
+        print(f"[Mixo3D] Texture atlas: {stats['packed_materials']} materials -> {stats['atlases']} atlases "
+              f"({stats['skipped_materials']} skipped, UVs outside 0..1)")
+
+        final_id = mesh_id
+        if new_mesh_data is not mesh_data:
+            new_mesh_id = f"{target_mesh_id}_atlas_{uuid.uuid4().hex[:4]}"
+            registry.register_mesh(new_mesh_data, requested_id=new_mesh_id)
+            final_id = new_mesh_id
+            # Preserve transform if incoming was a node
+            if isinstance(item, SceneNodeData):
+                final_id = registry.register_node(SceneNodeData(
+                    mesh_id=new_mesh_id,
+                    transform=item.transform,
+                    metadata=item.metadata.copy()
+                ))
+
+        ui_data = {
+            "settings": {
+                "show_preview": show_preview,
+                "material_count": len(new_mesh_data.materials)
+            },
+            "stats": stats
+        }
+
+        model_file = ""
+        if show_preview:
+            from ..core.glb_exporter import GLBExporter
+            subfolder = "mixo3d_cache"
+            full_out_dir = os.path.join(folder_paths.get_output_directory(), subfolder)
+            os.makedirs(full_out_dir, exist_ok=True)
+
+            preview_filename = f"preview_atlas_{uuid.uuid4().hex[:8]}.glb"
+            GLBExporter.export([final_id], os.path.join(full_out_dir, preview_filename), add_preview_helpers=False)
+            model_file = os.path.join(subfolder, preview_filename)
+            ui_data["glb_url"] = [model_file]
+
+        return {"ui": ui_data, "result": (final_id, model_file)}
+
+NODE_CLASS_MAPPINGS = {
+    "MeshTextureAtlas": MeshTextureAtlas
+}
+
+NODE_DISPLAY_NAME_MAPPINGS = {
+    "MeshTextureAtlas": "Mesh Texture Atlas"
+}
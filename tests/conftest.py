@@ -0,0 +1,30 @@
+import os
+import sys
+import numpy as np
+import pytest
+
+# Registers the package as "mixo3dtools" without running the ComfyUI __init__
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import mixo3d_batch  # noqa: E402,F401
+
+def uv_sphere(rings: int = 16, segments: int = 32, radius: float = 1.0):
+    """Closed UV sphere: float32 vertices (poles repeated per segment), int32 faces and UVs in [0, 1]."""
+    theta = np.linspace(0.0, np.pi, rings + 1)
+    phi = np.linspace(0.0, 2.0 * np.pi, segments + 1)
+    t, p = np.meshgrid(theta, phi, indexing="ij")
+    vertices = np.stack([np.sin(t) * np.cos(p), np.cos(t), -np.sin(t) * np.sin(p)], axis=-1).reshape(-1, 3) * radius
+    uvs = np.stack([p / (2.0 * np.pi), 1.0 - t / np.pi], axis=-1).reshape(-1, 2)
+    row = segments + 1
+    a = (np.arange(rings)[:, None] * row + np.arange(segments)[None, :]).ravel()
+    faces = np.concatenate([np.stack([a, a + row, a + 1], axis=1), np.stack([a + 1, a + row, a + row + 1], axis=1)])
+    # Drop the zero-area triangles at the poles
+    corners = vertices[faces]
+    area = np.linalg.norm(np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0]), axis=1)
+    return vertices.astype(np.float32), faces[area > 1e-12].astype(np.int32), uvs.astype(np.float32)
+
+@pytest.fixture
+def registry():
+    """The registry singleton, emptied after the test."""
+    from mixo3dtools.core.scene_registry import registry
+    yield registry
+    registry.clear()
@@ -0,0 +1,100 @@
+import numpy as np
+import pytest
+from mixo3dtools.core.animation import _rotation_angle, _slerp, decompose_trs, reduce_keyframes, tracks_from_frame_ids
+from mixo3dtools.core.mesh_model import SceneMeshData, SceneNodeData
+from mixo3dtools.core.transform_utils import create_trs_matrices, create_trs_matrix
+
+def quat_to_matrix(q):
+    x, y, z, w = np.moveaxis(q, -1, 0)
+    return np.stack([
+        np.stack([1 - 2 * (y * y + z * z), 2 * (x * y - z * w), 2 * (x * z + y * w)], axis=-1),
+        np.stack([2 * (x * y + z * w), 1 - 2 * (x * x + z * z), 2 * (y * z - x * w)], axis=-1),
+        np.stack([2 * (x * z - y * w), 2 * (y * z + x * w), 1 - 2 * (x * x + y * y)], axis=-1),
+    ], axis=-2)
+
+def compose(translations, quaternions, scales):
+    """glTF node TRS -> (K, 4, 4)."""
+    m = np.tile(np.eye(4), (len(translations), 1, 1))
+    m[:, :3, :3] = quat_to_matrix(quaternions) * scales[:, None, :]
+    m[:, :3, 3] = translations
+    return m
+
+def test_decompose_trs_round_trips_including_mirroring():
+    rng = np.random.default_rng(0)
+    k = 200
+    positions = rng.uniform(-10, 10, size=(k, 3))
+    rotations = rng.uniform(-180, 180, size=(k, 3))
+    scales = rng.uniform(0.1, 4.0, size=(k, 3))
+    scales[::3] *= [-1.0, 1.0, 1.0]
+    scales[1::3] *= [1.0, 1.0, -1.0]
+    matrices = create_trs_matrices(positions, rotations, scales)
+
+    t, q, s = decompose_trs(matrices)
+    np.testing.assert_allclose(np.linalg.norm(q, axis=1), 1.0, atol=1e-12)
+    np.testing.assert_allclose(t, positions, atol=1e-12)
+    np.testing.assert_allclose(np.abs(s), np.abs(scales), rtol=1e-9)
+    np.testing.assert_allclose(compose(t, q, s), matrices, atol=1e-9)
+
+def test_decompose_trs_keeps_quaternion_signs_continuous():
+    angles = np.linspace(0.0, 720.0, 97)
+    matrices = create_trs_matrices(np.zeros((97, 3)), np.stack([np.zeros(97), angles, np.zeros(97)], axis=1), np.ones((97, 3)))
+    _, q, _ = decompose_trs(matrices)
+    assert ((q[1:] * q[:-1]).sum(axis=1) > 0).all()
+
+def test_linear_translation_reduces_to_its_endpoints():
+    times = np.arange(60) / 24.0
+    values = np.stack([np.linspace(0, 5, 60), np.linspace(1, -1, 60), np.zeros(60)], axis=1)
+    assert reduce_keyframes(times, values).tolist() == [0, 59]
+
+def test_constant_tracks_collapse_to_one_key():
+    times = np.arange(30) / 24.0
+    assert reduce_keyframes(times, np.ones((30, 3))).tolist() == [0]
+    q = np.tile([0.0, 0.0, 0.0, 1.0], (30, 1))
+    assert reduce_keyframes(times, q, rotation=True).tolist() == [0]
+
+def test_dropped_samples_stay_within_tolerance():
+    times = np.arange(120) / 24.0
+    values = np.stack([np.sin(times * 2.0), np.cos(times), 0.1 * times ** 2], axis=1)
+    tolerance = 5e-3
+    keep = reduce_keyframes(times, values, tolerance)
+
+    assert len(keep) < len(times) // 2
+    rebuilt = np.stack([np.interp(times, times[keep], values[keep, c]) for c in range(3)], axis=1)
+    assert np.abs(rebuilt - values).max() <= tolerance + 1e-12
+
+def test_turntable_rotation_keeps_few_keys_and_no_wide_spans():
+    frames = 240
+    times = np.arange(frames) / 24.0
+    angles = np.linspace(0.0, 720.0, frames)
+    matrices = create_trs_matrices(np.zeros((frames, 3)), np.stack([np.zeros(frames), angles, np.zeros(frames)], axis=1),
+                                   np.ones((frames, 3)))
+    _, q, _ = decompose_trs(matrices)
+    tolerance = 1e-4
+    keep = reduce_keyframes(times, q, tolerance, rotation=True)
+
+    # Two full turns need at least five keys to stay under 180 degrees per span
+    assert 5 <= len(keep) <= 12
+    spans = _rotation_angle(q[keep[:-1]], q[keep[1:]], signed=True)
+    assert spans.max() < np.radians(170.0) + 1e-9
+    for a, b in zip(keep[:-1], keep[1:]):
+        t = (times[a:b + 1] - times[a]) / (times[b] - times[a])
+        assert _rotation_angle(_slerp(q[a], q[b], t), q[a:b + 1]).max() <= tolerance + 1e-9
+
+def test_unresolved_frames_hold_the_previous_pose(registry, capsys):
+    registry.register_mesh(SceneMeshData(vertices=np.zeros((3, 3)), indices=np.array([[0, 1, 2]])), "anim_mesh")
+    ids = [registry.register_node(SceneNodeData("anim_mesh", create_trs_matrix(position=(f, 0, 0))), f"anim_{f}")
+           for f in range(4)]
+
+    track = tracks_from_frame_ids(["missing", ids[0], "gone", ids[2], ids[3]], "walk")
+
+    assert track["mesh_id"] == "anim_mesh"
+    assert track["matrices"][:, 0, 3].tolist() == [0.0, 0.0, 0.0, 2.0, 3.0]
+    assert "2 unresolved frames" in capsys.readouterr().out
+
+def test_no_resolved_frame_means_no_track(registry):
+    assert tracks_from_frame_ids(["missing", "gone"], "walk") is None
+
+@pytest.mark.parametrize("frames", [1, 2])
+def test_short_tracks_keep_every_key(frames):
+    times = np.arange(frames, dtype=np.float64)
+    assert reduce_keyframes(times, np.arange(frames * 3.0).reshape(frames, 3)).tolist() == list(range(frames))
@@ -0,0 +1,128 @@
+import numpy as np
+import pytest
+from conftest import uv_sphere
+from mixo3dtools.core import bvh as bvh_module
+from mixo3dtools.core.bvh import MeshBVH, get_mesh_bvh, raycast_scene
+from mixo3dtools.core.mesh_model import SceneMeshData, SceneNodeData
+from mixo3dtools.core.transform_utils import apply_transform, create_trs_matrix, up_direction_matrix
+
+def brute_force(vertices, faces, origins, directions):
+    """Closest Möller–Trumbore hit of every ray against every triangle: (t, face), inf / -1 on miss."""
+    tri = np.asarray(vertices, dtype=np.float64)[faces]
+    v0, e1, e2 = tri[:, 0], tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0]
+    d = directions[:, None, :]
+    p = np.cross(d, e2[None])
+    det = (e1[None] * p).sum(axis=2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        inv = 1.0 / det
+        s = origins[:, None, :] - v0[None]
+        u = (s * p).sum(axis=2) * inv
+        q = np.cross(s, e1[None])
+        v = (d * q).sum(axis=2) * inv
+        t = (e2[None] * q).sum(axis=2) * inv
+    ok = (np.abs(det) > 1e-12) & (u >= -1e-9) & (v >= -1e-9) & (u + v <= 1 + 1e-9) & (t >= 0)
+    t = np.where(ok, t, np.inf)
+    face = t.argmin(axis=1)
+    best = t[np.arange(len(t)), face]
+    return best, np.where(np.isfinite(best), face, -1)
+
+@pytest.fixture
+def sphere():
+    vertices, faces, _ = uv_sphere(20, 40)
+    return vertices, faces
+
+def test_random_rays_match_brute_force(sphere):
+    vertices, faces = sphere
+    rng = np.random.default_rng(0)
+    n = 600
+    origins = rng.normal(size=(n, 3))
+    origins *= 3.0 / np.linalg.norm(origins, axis=1, keepdims=True)
+    targets = rng.uniform(-1.2, 1.2, size=(n, 3))  # some miss the unit sphere
+    directions = targets - origins
+    directions[:100] = rng.normal(size=(100, 3))  # arbitrary, unnormalized directions
+
+    t, face, u, v = MeshBVH(vertices, faces).raycast(origins, directions)
+    expected_t, expected_face = brute_force(vertices, faces, origins, directions)
+
+    np.testing.assert_array_equal(face >= 0, expected_face >= 0)
+    hit = face >= 0
+    assert hit.sum() > n // 3 and (~hit).sum() > 20
+    np.testing.assert_allclose(t[hit], expected_t[hit], rtol=1e-6, atol=1e-9)
+    # Ties on shared edges may pick either triangle; the reported one must contain the hit
+    tri = vertices[faces[face[hit]]].astype(np.float64)
+    point = tri[:, 0] + (tri[:, 1] - tri[:, 0]) * u[hit, None] + (tri[:, 2] - tri[:, 0]) * v[hit, None]
+    np.testing.assert_allclose(point, origins[hit] + directions[hit] * t[hit, None], atol=1e-6)
+
+def test_axis_parallel_rays_through_vertices_hit(sphere):
+    vertices, faces = sphere
+    points = np.unique(vertices[faces.ravel()], axis=0).astype(np.float64)
+    points = points[np.abs(points[:, 0]) > 1e-3]  # vertices on the x = 0 silhouette are grazed, not entered
+    directions = np.tile([-1.0, 0.0, 0.0], (len(points), 1)) * np.sign(points[:, :1])
+    origins = points - directions * 5.0
+
+    t, face, _, _ = MeshBVH(vertices, faces).raycast(origins, directions)
+    assert (face >= 0).all()
+    np.testing.assert_allclose(t, 5.0, atol=1e-6)
+
+def test_misses_and_max_distance(sphere):
+    vertices, faces = sphere
+    tree = MeshBVH(vertices, faces)
+    origins = np.array([[0.0, 5.0, 0.0], [0.0, 0.0, 5.0], [0.0, 0.0, 5.0]])
+    directions = np.array([[1.0, 0.0, 0.0], [0.0, 0.0, 1.0], [0.0, 0.0, -1.0]])
+
+    t, face, _, _ = tree.raycast(origins, directions)
+    assert face[:2].tolist() == [-1, -1] and np.isinf(t[:2]).all()
+    assert face[2] >= 0 and t[2] == pytest.approx(4.0, abs=1e-3)
+
+    t, face, _, _ = tree.raycast(origins[2:], directions[2:], max_distance=3.0)
+    assert face.tolist() == [-1] and np.isinf(t).all()
+
+def test_tree_stays_float32_and_small(sphere):
+    vertices, faces = sphere
+    tree = MeshBVH(vertices, faces)
+    assert tree.tri.dtype == np.float32 and tree.lo.dtype == np.float32
+    assert tree.nbytes <= 64 * len(faces)
+
+@pytest.mark.parametrize("up_direction", ["Y", "Z"])
+def test_raycast_scene_applies_node_and_up_transforms(registry, sphere, up_direction):
+    vertices, faces = sphere
+    registry.register_mesh(SceneMeshData(vertices=vertices, indices=faces,
+                                         materials=[{"name": "skin"}]), "ray_mesh")
+    matrix = create_trs_matrix(position=(3, 1, -2), rotation=(20, 40, 0), scale=(2.0, 1.0, 0.5))
+    registry.register_node(SceneNodeData("ray_mesh", matrix), "ray_node")
+
+    world = apply_transform(vertices, up_direction_matrix(up_direction) @ matrix)
+    rng = np.random.default_rng(1)
+    center = world.mean(axis=0)
+    origins = center + rng.normal(size=(200, 3)) * 6.0
+    directions = center + rng.uniform(-1.5, 1.5, size=(200, 3)) - origins
+
+    hits = raycast_scene(["ray_node"], origins, directions, up_direction=up_direction)
+    expected_t, expected_face = brute_force(world, faces, origins, directions)
+
+    assert [h is not None for h in hits] == (expected_face >= 0).tolist()
+    for hit, t, o, d in zip(hits, expected_t, origins, directions):
+        if hit is None:
+            continue
+        assert hit["node_id"] == "ray_node" and hit["mesh_id"] == "ray_mesh"
+        assert hit["material_name"] == "skin"
+        assert hit["distance"] == pytest.approx(t, rel=1e-6, abs=1e-9)
+        np.testing.assert_allclose(hit["point"], o + d * t, atol=1e-6)
+
+def test_cache_is_bounded_by_bytes(monkeypatch):
+    monkeypatch.setattr(bvh_module, "_bvh_cache", type(bvh_module._bvh_cache)())
+    monkeypatch.setattr(bvh_module, "_cached_bytes", 0)
+    meshes = []
+    for radius in (1.0, 2.0, 3.0):
+        vertices, faces, _ = uv_sphere(10, 20, radius)
+        meshes.append(SceneMeshData(vertices=vertices, indices=faces))
+    one_tree = MeshBVH(meshes[0].vertices, meshes[0].indices).nbytes
+    monkeypatch.setattr(bvh_module, "_MAX_CACHED_BYTES", int(one_tree * 2.5))
+
+    trees = [get_mesh_bvh(mesh) for mesh in meshes]
+    assert len(bvh_module._bvh_cache) == 2
+    assert bvh_module._cached_bytes == sum(tree.nbytes for tree in bvh_module._bvh_cache.values())
+    # The oldest tree was evicted and is rebuilt; the newest is reused
+    assert get_mesh_bvh(meshes[0]) is not trees[0]
+    assert get_mesh_bvh(meshes[2]) is trees[2]
+    assert "bvh_key" in meshes[0]._derived and not any(isinstance(v, MeshBVH) for v in meshes[0]._derived.values())
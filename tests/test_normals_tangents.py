@@ -0,0 +1,93 @@
+import numpy as np
+from conftest import uv_sphere
+from mixo3dtools.core.mesh_model import SceneMeshData
+from mixo3dtools.core.transform_utils import apply_transform, create_trs_matrix, transform_normals
+
+def sphere_mesh(**kwargs):
+    vertices, faces, uvs = uv_sphere(24, 48)
+    return SceneMeshData(vertices=vertices, indices=faces, uvs=uvs, **kwargs)
+
+def used(mesh):
+    """Vertices some face references; the sphere's first and last pole copies are left unused."""
+    mask = np.zeros(len(mesh.vertices), dtype=bool)
+    mask[mesh.indices.ravel()] = True
+    return mask
+
+def row_dot(a, b):
+    return (a * b).sum(axis=1)
+
+def test_computed_vertex_normals_point_outward_on_a_sphere():
+    mesh = sphere_mesh()
+    normals = mesh.get_vertex_normals()
+    keep = used(mesh)
+    radial = mesh.vertices / np.linalg.norm(mesh.vertices, axis=1, keepdims=True)
+
+    np.testing.assert_allclose(np.linalg.norm(normals[keep], axis=1), 1.0, atol=1e-9)
+    assert row_dot(normals[keep], radial[keep]).min() > 0.99
+    assert mesh.get_vertex_normals() is normals  # cached
+
+def test_file_normals_win_and_geometry_changes_drop_the_cache():
+    mesh = sphere_mesh()
+    computed = mesh.get_vertex_normals()
+    mesh.vertices = mesh.vertices * 2.0
+    assert mesh.get_vertex_normals() is not computed
+
+    given = np.tile([0.0, 1.0, 0.0], (len(mesh.vertices), 1))
+    mesh.normals = given
+    assert mesh.get_vertex_normals() is given
+
+def test_tangents_are_unit_orthogonal_and_follow_u():
+    mesh = sphere_mesh()
+    tangents = mesh.get_tangents()
+    normals = mesh.get_vertex_normals()
+    keep = used(mesh)
+    t, w = tangents[keep, :3], tangents[keep, 3]
+    normals = normals[keep]
+
+    np.testing.assert_allclose(np.linalg.norm(t, axis=1), 1.0, atol=1e-9)
+    assert np.abs(row_dot(t, normals)).max() < 1e-9
+    assert set(np.unique(w)) <= {-1.0, 1.0}
+
+    # Away from the poles the tangent follows dP/du, i.e. the direction of increasing longitude
+    x, z = mesh.vertices[keep, 0].astype(np.float64), mesh.vertices[keep, 2].astype(np.float64)
+    along_u = np.stack([z, np.zeros_like(x), -x], axis=1)
+    ring = np.hypot(x, z)
+    body = ring > 0.3
+    along_u = along_u[body] / ring[body, None]
+    assert row_dot(t[body], along_u).min() > 0.98
+    # Seam vertices are duplicated, so a consistent UV layout has a single handedness
+    assert len(np.unique(w[body])) == 1
+
+def test_mirrored_uvs_flip_handedness():
+    mesh = sphere_mesh()
+    w = mesh.get_tangents()[:, 3]
+    mirrored = sphere_mesh()
+    mirrored.uvs = mirrored.uvs * [-1.0, 1.0] + [1.0, 0.0]
+    w_mirrored = mirrored.get_tangents()[:, 3]
+
+    body = np.hypot(mesh.vertices[:, 0], mesh.vertices[:, 2]) > 0.3
+    np.testing.assert_array_equal(w_mirrored[body], -w[body])
+
+def test_planar_quad_has_exact_tangent_frame():
+    mesh = SceneMeshData(
+        vertices=np.array([[0, 0, 0], [2, 0, 0], [0, 1, 0], [2, 1, 0]], dtype=np.float32),
+        indices=np.array([[0, 1, 2], [2, 1, 3]]),
+        uvs=np.array([[0, 0], [1, 0], [0, 1], [1, 1]], dtype=np.float32),
+    )
+    np.testing.assert_allclose(mesh.get_vertex_normals(), np.tile([0.0, 0.0, 1.0], (4, 1)), atol=1e-12)
+    np.testing.assert_allclose(mesh.get_tangents(), np.tile([1.0, 0.0, 0.0, 1.0], (4, 1)), atol=1e-12)
+
+def test_tangents_need_uvs():
+    vertices, faces, _ = uv_sphere(4, 8)
+    assert SceneMeshData(vertices=vertices, indices=faces).get_tangents() is None
+
+def test_transformed_normals_match_the_transformed_surface():
+    mesh = sphere_mesh()
+    keep = used(mesh)
+    for matrix in (create_trs_matrix(rotation=(30, 45, 10), scale=(2.0, 2.0, 2.0)),
+                   create_trs_matrix(rotation=(30, 45, 10), scale=(3.0, 1.0, 0.5))):
+        moved = SceneMeshData(vertices=apply_transform(mesh.vertices, matrix), indices=mesh.indices)
+        expected = moved.get_vertex_normals()[keep]
+        got = transform_normals(mesh.get_vertex_normals(), matrix)[keep]
+        np.testing.assert_allclose(np.linalg.norm(got, axis=1), 1.0, atol=1e-9)
+        assert row_dot(got, expected).min() > 0.99
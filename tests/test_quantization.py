@@ -0,0 +1,86 @@
+import json
+import struct
+import numpy as np
+import pytest
+from mixo3dtools.core.gltf_writer import (GLTFBuilder, quantize_positions, quantize_unit, quantize_uvs)
+
+def read_glb(data: bytes):
+    """(gltf json, binary chunk) of a GLB."""
+    json_len = struct.unpack_from("<I", data, 12)[0]
+    gltf = json.loads(data[20:20 + json_len])
+    return gltf, data[20 + json_len + 8:]
+
+def read_accessor(gltf, bin_chunk, index):
+    accessor = gltf["accessors"][index]
+    view = gltf["bufferViews"][accessor["bufferView"]]
+    dtype = {5120: np.int8, 5121: np.uint8, 5122: np.int16, 5123: np.uint16, 5125: np.uint32, 5126: np.float32}[accessor["componentType"]]
+    comps = {"SCALAR": 1, "VEC2": 2, "VEC3": 3, "VEC4": 4}[accessor["type"]]
+    row = comps * np.dtype(dtype).itemsize
+    stride = view.get("byteStride", row)
+    raw = np.frombuffer(bin_chunk, dtype=np.uint8, count=view["byteLength"], offset=view["byteOffset"])
+    rows = raw.reshape(accessor["count"], stride)[:, :row].copy()
+    return rows.view(dtype).reshape(accessor["count"], comps)
+
+@pytest.mark.parametrize("bits", [8, 12, 14, 16])
+def test_position_round_trip_error_is_bounded_and_reported(bits):
+    rng = np.random.default_rng(bits)
+    positions = rng.uniform([-3.0, 10.0, -0.5], [5.0, 12.0, 0.5], size=(2000, 3))
+    stored, translation, scale, error = quantize_positions(positions, bits)
+
+    assert stored.dtype == np.int16
+    decoded = np.asarray(translation) + scale * stored / 32767.0
+    actual = np.linalg.norm(decoded - positions, axis=1).max()
+    # Half a grid step per axis over the largest extent (8 units)
+    step = 8.0 / 2.0 / ((1 << (bits - 1)) - 1)
+    assert actual <= np.sqrt(3.0) * step / 2.0 + 1e-9
+    assert error == pytest.approx(actual, rel=1e-6, abs=1e-12)
+
+def test_unit_vectors_round_trip_within_half_a_step():
+    rng = np.random.default_rng(0)
+    normals = rng.normal(size=(500, 3))
+    normals /= np.linalg.norm(normals, axis=1, keepdims=True)
+
+    q8 = quantize_unit(normals, 8)
+    assert q8.dtype == np.int8
+    assert np.abs(q8 / 127.0 - normals).max() <= 0.5 / 127.0 + 1e-12
+
+    q16 = quantize_unit(normals, 16)
+    assert q16.dtype == np.int16
+    assert np.abs(q16 / 32767.0 - normals).max() <= 0.5 / 32767.0 + 1e-12
+
+@pytest.mark.parametrize("bits", [8, 12, 16])
+def test_uvs_round_trip_on_the_bit_grid(bits):
+    uvs = np.random.default_rng(bits).uniform(size=(500, 2))
+    uvs[0] = [0.0, 1.0]
+    q = quantize_uvs(uvs, bits)
+
+    full = 255.0 if bits <= 8 else 65535.0
+    decoded = q / full
+    assert np.abs(decoded - uvs).max() <= 0.5 / ((1 << bits) - 1) + 1.0 / full
+    assert decoded[0].tolist() == [0.0, 1.0]
+
+def test_tiling_uvs_are_not_quantized():
+    assert quantize_uvs(np.array([[0.5, 0.5], [1.5, 0.2]]), 12) is None
+
+def test_quantized_glb_dequantizes_through_the_node_transform():
+    positions = np.array([[0.0, 0.0, 0.0], [2.0, 0.0, 0.0], [0.0, 3.0, 1.0], [2.0, 3.0, 1.0]])
+    prim = {"name": "quad", "positions": positions,
+            "normals": np.tile([0.0, 0.0, 1.0], (4, 1)),
+            "uvs": np.array([[0.0, 0.0], [1.0, 0.0], [0.0, 1.0], [1.0, 1.0]]),
+            "indices": np.array([[0, 1, 2], [2, 1, 3]], dtype=np.uint32)}
+    builder = GLTFBuilder()
+    material = builder.add_material({"name": "m", "base_color": [1.0, 1.0, 1.0, 1.0]})
+    node_index = builder.add_primitive_node(prim, material, quantize={"position_bits": 14, "normal_bits": 8, "uv_bits": 12})
+    gltf, bin_chunk = read_glb(builder.to_bytes())
+
+    assert "KHR_mesh_quantization" in gltf["extensionsRequired"]
+    node = gltf["nodes"][node_index]
+    attributes = gltf["meshes"][node["mesh"]]["primitives"][0]["attributes"]
+    stored = read_accessor(gltf, bin_chunk, attributes["POSITION"])
+    decoded = np.asarray(node["translation"]) + np.asarray(node["scale"]) * stored / 32767.0
+    assert np.abs(decoded - positions).max() <= builder.max_position_error + 1e-9
+    assert builder.max_position_error < 3.0 / (1 << 13)
+
+    uvs = read_accessor(gltf, bin_chunk, attributes["TEXCOORD_0"]) / 65535.0
+    # glTF UVs are flipped vertically relative to SceneMeshData
+    assert np.abs(uvs - (prim["uvs"] * [1.0, -1.0] + [0.0, 1.0])).max() < 1e-9
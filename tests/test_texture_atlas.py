@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+from mixo3dtools.core.mesh_model import SceneMeshData, base_color_texture_key
+from mixo3dtools.core.texture_atlas import build_texture_atlas, shelf_pack
+
+Image = pytest.importorskip("PIL.Image")
+
+def overlaps(a, b):
+    (ax, ay, aw, ah), (bx, by, bw, bh) = a, b
+    return ax < bx + bw and bx < ax + aw and ay < by + bh and by < ay + ah
+
+def test_shelf_pack_places_every_rectangle_inside_its_bin_without_overlap():
+    rng = np.random.default_rng(0)
+    sizes = [tuple(int(v) for v in rng.integers(8, 300, size=2)) for _ in range(60)]
+    placements, bins = shelf_pack(sizes, 512)
+
+    assert len(placements) == len(sizes)
+    rects = {}
+    for (w, h), (b, x, y) in zip(sizes, placements):
+        bin_w, bin_h = bins[b]
+        assert 0 <= x and x + w <= bin_w <= 512
+        assert 0 <= y and y + h <= bin_h <= 512
+        rects.setdefault(b, []).append((x, y, w, h))
+    for placed in rects.values():
+        for i in range(len(placed)):
+            for j in range(i + 1, len(placed)):
+                assert not overlaps(placed[i], placed[j])
+
+def test_shelf_pack_uses_one_bin_when_everything_fits():
+    placements, bins = shelf_pack([(64, 64)] * 4 + [(128, 32)], 256)
+    assert len(bins) == 1
+    assert {b for b, _, _ in placements} == {0}
+
+def texel_quad(offset, material):
+    """Two triangles spanning UV texel centers of an 8x8 texture, positions offset along x."""
+    uv = np.array([[0.5, 0.5], [7.5, 0.5], [0.5, 7.5], [7.5, 7.5]]) / 8.0
+    positions = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0], [1, 1, 0]], dtype=np.float64) + [offset, 0, 0]
+    return positions, uv, np.array([[0, 1, 2], [2, 1, 3]]), np.full(2, material)
+
+def sample(image, uv):
+    """Nearest texel of a PIL image at bottom-left origin UVs."""
+    pixels = np.asarray(image.convert("RGBA"))
+    h, w = pixels.shape[:2]
+    cols = np.clip((uv[:, 0] * w).astype(int), 0, w - 1)
+    rows = np.clip(((1.0 - uv[:, 1]) * h).astype(int), 0, h - 1)
+    return pixels[rows, cols]
+
+@pytest.fixture
+def two_textured_quads():
+    rng = np.random.default_rng(1)
+    parts = [texel_quad(0.0, 0), texel_quad(2.0, 1)]
+    mesh = SceneMeshData(
+        vertices=np.vstack([p[0] for p in parts]),
+        uvs=np.vstack([p[1] for p in parts]),
+        indices=np.vstack([parts[0][2], parts[1][2] + 4]),
+        face_material_indices=np.concatenate([p[3] for p in parts]).astype(np.int32),
+        materials=[{"name": "a", "base_color": [1.0, 1.0, 1.0, 1.0]},
+                   {"name": "b", "base_color": [0.5, 1.0, 1.0, 1.0]}],
+    )
+    for m in range(2):
+        pixels = rng.integers(0, 256, size=(8, 8, 4), dtype=np.uint8)
+        pixels[..., 3] = 255
+        mesh.textures[base_color_texture_key(m)] = Image.fromarray(pixels, "RGBA")
+    return mesh
+
+def test_atlas_uvs_sample_the_same_texels_as_the_source(two_textured_quads):
+    mesh = two_textured_quads
+    atlas_mesh, stats = build_texture_atlas(mesh, max_atlas_size=64, padding=2)
+
+    assert stats["atlases"] == 1 and stats["packed_materials"] == 2
+    atlas = atlas_mesh.textures[base_color_texture_key(int(atlas_mesh.face_material_indices[0]))]
+    assert len(atlas_mesh.materials) == 1
+
+    # Same triangles, corner by corner
+    np.testing.assert_array_equal(atlas_mesh.vertices[atlas_mesh.indices], mesh.vertices[mesh.indices])
+    for face in range(len(mesh.indices)):
+        src_mat = int(mesh.face_material_indices[face])
+        expected = sample(mesh.textures[base_color_texture_key(src_mat)], mesh.uvs[mesh.indices[face]]).astype(np.float64)
+        # The base color factor is baked into the atlas pixels
+        expected[:, :3] = np.clip(expected[:, :3] * mesh.materials[src_mat]["base_color"][:3] + 0.5, 0, 255).astype(np.uint8)
+        got = sample(atlas, atlas_mesh.uvs[atlas_mesh.indices[face]])
+        np.testing.assert_array_equal(got, expected)
+
+def test_tiling_uvs_keep_their_own_texture(two_textured_quads):
+    mesh = two_textured_quads
+    mesh.uvs = mesh.uvs.copy()
+    mesh.uvs[4:] *= 3.0  # material 1 repeats its texture
+    atlas_mesh, stats = build_texture_atlas(mesh, max_atlas_size=64, padding=2)
+
+    assert stats["skipped_materials"] == 1
+    assert stats["packed_materials"] == 1
+    kept = int(atlas_mesh.face_material_indices[-1])
+    assert atlas_mesh.textures[base_color_texture_key(kept)] is mesh.textures[base_color_texture_key(1)]
+    np.testing.assert_allclose(atlas_mesh.uvs[atlas_mesh.indices[2:]], mesh.uvs[mesh.indices[2:]])
@@ -24,10 +24,71 @@ const loadLib = (url) => new Promise(resolve => {
     }, 500);
 })();
 
+// "sub/dir/file.glb" in the ComfyUI output folder -> /view URL
+const outputURL = (path) => {
+    const fn = path.split("/").pop();
+    const sub = path.includes("/") ? path.substring(0, path.lastIndexOf("/")) : "";
+    return api.apiURL(`/view?filename=${encodeURIComponent(fn)}&type=output&subfolder=${encodeURIComponent(sub)}`);
+};
+
+// Registry geometry straight from memory (/mixo3d/mesh_buffers), cached by content hash
+const meshBufferCache = new Map(); // hash -> { header, arrays }
+const meshBufferEtags = new Map(); // url -> hash
+
+const fetchMeshBuffers = async (url) => {
+    const known = meshBufferEtags.get(url);
+    const res = await fetch(url, { headers: known ? { "If-None-Match": `"${known}"` } : {} });
+    if (res.status === 304 && meshBufferCache.has(known)) return meshBufferCache.get(known);
+    if (!res.ok) throw new Error(`mesh_buffers ${res.status}`);
+
+    const buf = await res.arrayBuffer();
+    const view = new DataView(buf);
+    const magic = String.fromCharCode(...new Uint8Array(buf, 0, 4));
+    if (magic !== "MX3D") throw new Error("Bad mesh buffer payload");
+    const header = JSON.parse(new TextDecoder().decode(new Uint8Array(buf, 8, view.getUint32(4, true))));
+    const types = { float32: Float32Array, uint16: Uint16Array, uint32: Uint32Array };
+    const arrays = {};
+    for (const b of header.buffers) {
+        const T = types[b.dtype];
+        arrays[b.name] = { data: new T(buf, b.offset, b.length / T.BYTES_PER_ELEMENT), components: b.components };
+    }
+    const parsed = { header, arrays };
+    meshBufferCache.set(header.hash, parsed);
+    meshBufferEtags.set(url, header.hash);
+    return parsed;
+};
+
+const buildBufferScene = ({ header, arrays }) => {
+    const geo = new THREE.BufferGeometry();
+    const attr = (name, key) => { if (arrays[key]) geo.setAttribute(name, new THREE.BufferAttribute(arrays[key].data, arrays[key].components)); };
+    attr("position", "position");
+    attr("normal", "normal");
+    attr("uv", "uv");
+    if (arrays.index) geo.setIndex(new THREE.BufferAttribute(arrays.index.data, 1));
+    if (!arrays.normal) geo.computeVertexNormals();
+
+    const mats = (header.materials.length ? header.materials : [{ base_color: [0.8, 0.8, 0.8, 1], metallic: 0, roughness: 0.5 }]).map(m => {
+        const mat = new THREE.MeshStandardMaterial({ metalness: m.metallic, roughness: m.roughness, side: THREE.DoubleSide });
+        mat.color.setRGB(m.base_color[0], m.base_color[1], m.base_color[2]);
+        return mat;
+    });
+    header.groups.forEach(g => geo.addGroup(g.start, g.count, Math.min(g.material, mats.length - 1)));
+    const root = new THREE.Group();
+    root.add(new THREE.Mesh(geo, header.groups.length > 1 ? mats : mats[Math.min(header.groups[0]?.material || 0, mats.length - 1)]));
+    return root;
+};
+
 app.registerExtension({
     name: "Mixo3DTools.Viewer",
+    async setup() {
+        // Transform-only re-runs of SceneAssembler: move loaded objects instead of reloading
+        api.addEventListener("mixo3d.transform_delta", ({ detail }) => {
+            const node = app.graph?.getNodeById(Number(detail?.node));
+            if (node && node.applyTransformDelta) node.applyTransformDelta(detail);
+        });
+    },
     async beforeRegisterNodeDef(nodeType, nodeData) {
-        const supported = ["SceneAssembler", "MeshMaterialInspector", "MeshTransform", "MeshFromPath"];
+        const supported = ["SceneAssembler", "MeshMaterialInspector", "MeshMaterialBatchEditor", "MeshTextureAtlas", "SceneAnimationExporter", "MeshTransform", "MeshFromPath"];
         if (!supported.includes(nodeData.name) || nodeType.__mixo3d_wrapped) return;
         nodeType.__mixo3d_wrapped = true;
 
@@ -244,17 +305,94 @@ app.registerExtension({
                     const mouse = new THREE.Vector2();
                     let dragStart = { x: 0, y: 0 };
 
-                    container.addEventListener('pointerdown', (e) => { dragStart = { x: e.clientX, y: e.clientY }; });
+                    // Alt + click / Alt + drag: server-side BVH pick of registry mesh + material (see /mixo3d/raycast)
+                    const selectBox = document.createElement("div");
+                    Object.assign(selectBox.style, {
+                        position: "absolute", border: "1px dashed #0af", backgroundColor: "rgba(0,170,255,0.1)",
+                        pointerEvents: "none", display: "none", zIndex: "15"
+                    });
+                    container.appendChild(selectBox);
+                    let boxSelecting = false;
+
+                    const rayAt = (clientX, clientY) => {
+                        const rect = container.getBoundingClientRect();
+                        mouse.x = ((clientX - rect.left) / rect.width) * 2 - 1;
+                        mouse.y = -((clientY - rect.top) / rect.height) * 2 + 1;
+                        raycaster.setFromCamera(mouse, this.threeCamera);
+                        return [...raycaster.ray.origin.toArray(), ...raycaster.ray.direction.toArray()];
+                    };
+
+                    const showPicks = (hits) => {
+                        const picks = new Map();
+                        for (const h of hits) {
+                            if (!h) continue;
+                            const key = `${h.node_id}:${h.material_index}`;
+                            if (!picks.has(key)) picks.set(key, h);
+                        }
+                        this.mixo3d_picked = [...picks.values()];
+                        const lines = this.mixo3d_picked.slice(0, 8).map(h =>
+                            `${h.mesh_id} · MAT ${h.material_index}${h.material_name ? ` (${h.material_name})` : ""}` +
+                            (hits.length === 1 ? ` · FACE ${h.face_index}` : ""));
+                        if (this.mixo3d_picked.length > 8) lines.push(`+${this.mixo3d_picked.length - 8} more`);
+                        this.viewer_info_badge.innerHTML = lines.length ? `PICK: ${lines.join("<br>")}` : "PICK: nothing";
+                        this.viewer_info_badge.style.display = "block";
+                        this.setDirtyCanvas(true);
+                    };
+
+                    const serverPick = async (rays) => {
+                        const ids = this.mixo3d_node_ids;
+                        if (!ids?.length) return;
+                        const body = { ids, up_direction: this.mixo3d_settings?.up_direction || "Y" };
+                        if (rays.length === 1) { body.origin = rays[0].slice(0, 3); body.direction = rays[0].slice(3); }
+                        else body.rays = rays;
+                        try {
+                            const res = await api.fetchApi("/mixo3d/raycast", { method: "POST", body: JSON.stringify(body) });
+                            const data = await res.json();
+                            if (data.error) throw new Error(data.error);
+                            showPicks(data.hits || [data.hit]);
+                        } catch (err) {
+                            console.warn("[Mixo3D] Raycast failed:", err);
+                        }
+                    };
+
+                    container.addEventListener('pointerdown', (e) => {
+                        dragStart = { x: e.clientX, y: e.clientY };
+                        boxSelecting = e.altKey && !!this.mixo3d_node_ids?.length && !this.transformControl.axis;
+                        if (boxSelecting) this.threeControls.enabled = false;
+                    });
+                    container.addEventListener('pointermove', (e) => {
+                        if (!boxSelecting) return;
+                        const rect = container.getBoundingClientRect();
+                        Object.assign(selectBox.style, {
+                            display: "block",
+                            left: `${Math.min(e.clientX, dragStart.x) - rect.left}px`,
+                            top: `${Math.min(e.clientY, dragStart.y) - rect.top}px`,
+                            width: `${Math.abs(e.clientX - dragStart.x)}px`,
+                            height: `${Math.abs(e.clientY - dragStart.y)}px`
+                        });
+                    });
                     container.addEventListener('pointerup', (e) => {
                         const dx = Math.abs(e.clientX - dragStart.x);
                         const dy = Math.abs(e.clientY - dragStart.y);
+                        if (boxSelecting) {
+                            boxSelecting = false;
+                            selectBox.style.display = "none";
+                            this.threeControls.enabled = true;
+                            if (dx <= 2 && dy <= 2) { serverPick([rayAt(e.clientX, e.clientY)]); return; }
+                            // Sample the box on a grid; the server answers every ray in one batch
+                            const steps = Math.min(24, Math.max(2, Math.ceil(Math.max(dx, dy) / 8)));
+                            const x0 = Math.min(e.clientX, dragStart.x), y0 = Math.min(e.clientY, dragStart.y);
+                            const rays = [];
+                            for (let i = 0; i < steps; i++)
+                                for (let j = 0; j < steps; j++)
+                                    rays.push(rayAt(x0 + dx * (i + 0.5) / steps, y0 + dy * (j + 0.5) / steps));
+                            serverPick(rays);
+                            return;
+                        }
                         if (dx > 2 || dy > 2) return; // Drag
                         if (this.transformControl.dragging) return;
 
-                        const rect = container.getBoundingClientRect();
-                        mouse.x = ((e.clientX - rect.left) / rect.width) * 2 - 1;
-                        mouse.y = -((e.clientY - rect.top) / rect.height) * 2 + 1;
-                        raycaster.setFromCamera(mouse, this.threeCamera);
+                        rayAt(e.clientX, e.clientY);
 
                         const meshes = [];
                         this.threeScene.traverse(o => { if (o.isMesh && o.type !== "GridHelper") meshes.push(o); });
@@ -306,9 +444,12 @@ app.registerExtension({
                     this.gltfLoader = new THREE.GLTFLoader();
 
                     // Loop
+                    const clock = new THREE.Clock();
                     const animate = () => {
                         if (!this.threeRenderer) return;
                         requestAnimationFrame(animate);
+                        const dt = clock.getDelta();
+                        if (this.animationMixers) this.animationMixers.forEach(m => m.update(dt));
                         this.threeControls.update();
                         this.threeRenderer.render(this.threeScene, this.threeCamera);
                     };
@@ -365,6 +506,63 @@ app.registerExtension({
             }
             container.appendChild(resetBtn);
 
+            // onLoad receives an Object3D for both GLB urls and registry buffer streams
+            this.loadModel = function (obj, onLoad, onError) {
+                if (obj.kind === "chunks") {
+                    this.loadChunks(obj.path, onLoad, onError);
+                    return;
+                }
+                if (obj.kind === "buffers") {
+                    fetchMeshBuffers(obj.url).then(p => onLoad(buildBufferScene(p))).catch(onError);
+                    return;
+                }
+                this.gltfLoader.load(obj.url, (gltf) => {
+                    if (gltf.animations && gltf.animations.length) this.playAnimations(gltf.scene, gltf.animations);
+                    onLoad(gltf.scene);
+                }, undefined, onError);
+            };
+
+            // Progressive scene: hand back an empty group at once, then add chunks in manifest order
+            this.loadChunks = async function (manifestPath, onLoad, onError) {
+                let manifest;
+                try {
+                    const res = await fetch(outputURL(manifestPath));
+                    if (!res.ok) throw new Error(`HTTP ${res.status}`);
+                    manifest = await res.json();
+                } catch (e) { onError(e); return; }
+
+                const group = new THREE.Group();
+                onLoad(group);
+                const dir = manifestPath.substring(0, manifestPath.lastIndexOf("/"));
+                const inScene = () => { let o = group; while (o.parent) o = o.parent; return o === this.threeScene; };
+                for (const chunk of manifest.chunks || []) {
+                    if (!inScene()) return; // replaced while streaming
+                    try {
+                        const gltf = await this.gltfLoader.loadAsync(outputURL(`${dir}/${chunk.file}`));
+                        group.add(gltf.scene);
+                        this.setDirtyCanvas(true);
+                    } catch (e) { console.error("[Mixo3D] Chunk load error:", chunk.file, e); }
+                }
+            };
+
+            // Loop glTF animation clips (SceneAnimationExporter output)
+            this.playAnimations = function (root, clips) {
+                const mixer = new THREE.AnimationMixer(root);
+                clips.forEach(c => mixer.clipAction(c).play());
+                (this.animationMixers = this.animationMixers || []).push(mixer);
+            };
+
+            // Server matrices by registry node_id; the monitor feeds them into the traced objects
+            this.mixo3d_server_matrices = {};
+            this.applyTransformDelta = function (delta) {
+                if (delta.node_slots) this.mixo3d_node_slots = delta.node_slots;
+                for (const u of delta.updates || []) {
+                    // Backend sends row-major; Matrix4.set takes row-major arguments
+                    this.mixo3d_server_matrices[u.node_id] = { matrix: new THREE.Matrix4().set(...u.matrix), traced: null };
+                }
+                this.setDirtyCanvas(true);
+            };
+
             this.clearAllModels = function () {
                 if (!this.compositionModels) return;
                 for (const k in this.compositionModels) {
@@ -375,6 +573,8 @@ app.registerExtension({
                     }
                 }
                 this.compositionModels = {};
+                if (this.animationMixers) this.animationMixers.forEach(m => m.stopAllAction());
+                this.animationMixers = [];
             };
 
             this.fitCamera = (force = false) => {
@@ -390,6 +590,7 @@ app.registerExtension({
                 });
 
                 if (!any) {
+                    if (this.mixo3d_bounds) { this.frameBounds(this.mixo3d_bounds); return; }
                     if (force) {
                         this.threeControls.target.set(0, 0, 0);
                         this.threeCamera.position.set(150, 150, 150);
@@ -416,6 +617,18 @@ app.registerExtension({
                 this.threeControls.update();
             };
 
+            // Frame server-side bounds ({center, radius}) without waiting for geometry
+            this.frameBounds = (b) => {
+                if (!this.threeControls || !b || !b.center) return;
+                const fov = this.threeCamera.fov * (Math.PI / 180);
+                const d = Math.max((b.radius / Math.sin(fov / 2)) * 1.5 / Math.sqrt(3), 50);
+                if (!isFinite(d)) return;
+                const [x, y, z] = b.center;
+                this.threeControls.target.set(x, y, z);
+                this.threeCamera.position.set(x + d, y + d, z + d);
+                this.threeControls.update();
+            };
+
             container.addEventListener("mouseenter", () => { this.__mouseIn = true; });
             container.addEventListener("mouseleave", () => { this.__mouseIn = false; });
 
@@ -431,8 +644,12 @@ app.registerExtension({
                 };
 
                 // Source?
-                let url = null, sid = null;
-                if (node.mixo3d_last_url) url = node.mixo3d_last_url;
+                let url = null, sid = null, kind = "gltf";
+                if (node.mixo3d_mesh_ref) {
+                    url = api.apiURL(`/mixo3d/mesh_buffers/${encodeURIComponent(node.mixo3d_mesh_ref)}`);
+                    kind = "buffers";
+                }
+                else if (node.mixo3d_last_url) url = node.mixo3d_last_url;
                 else {
                     for (const w of (node.widgets || [])) {
                         const v = String(w.value || "");
@@ -446,7 +663,7 @@ app.registerExtension({
                 }
                 if (url) {
                     sid = (node && node.id) ? node.id : null;
-                    results.push({ url, matrix: new THREE.Matrix4(), materialState: null, sourceNodeId: sid });
+                    results.push({ url, kind, matrix: new THREE.Matrix4(), materialState: null, sourceNodeId: sid });
                 }
 
                 // Upstream
@@ -505,7 +722,7 @@ app.registerExtension({
                 if (self.mixo3d_settings && self.mixo3d_settings.material_count !== undefined) {
                     self.viewer_info_badge.style.display = "block";
                     self.viewer_info_badge.innerHTML = `SLOTS: ${self.mixo3d_settings.material_count}`;
-                } else self.viewer_info_badge.style.display = "none";
+                } else if (!self.mixo3d_picked) self.viewer_info_badge.style.display = "none";
 
                 // Grid
                 const gs = self.widgets?.find(x => x.name === "grid_size")?.value || "10cm";
@@ -526,16 +743,27 @@ app.registerExtension({
                             if (l && l.origin_id) {
                                 const origin = app.graph.getNodeById(l.origin_id);
                                 if (origin) {
-                                    traceScene(origin).forEach((o, i) => {
+                                    const traced = traceScene(origin);
+                                    // Registry ids only line up with traced objects one to one (not for MeshArray lists)
+                                    const ids = self.mixo3d_node_slots?.[inp.name];
+                                    traced.forEach((o, i) => {
                                         o.id = `asm_${inp.name}_${i}`;
                                         o.matrix.premultiply(orient);
+                                        const server = ids && ids.length === traced.length ? self.mixo3d_server_matrices[ids[i]] : null;
+                                        if (server) {
+                                            // Server matrix wins until the widgets move away from what was executed
+                                            if (!server.traced) server.traced = o.matrix.clone();
+                                            if (server.traced.equals(o.matrix)) o.matrix.copy(server.matrix);
+                                            else delete self.mixo3d_server_matrices[ids[i]];
+                                        }
                                         sceneObjects.push(o);
                                     });
                                 }
                             }
                         }
                     });
-                    if (sceneObjects.length === 0 && self.mixo3d_last_url) sceneObjects.push({ id: "baked", url: self.mixo3d_last_url, matrix: new THREE.Matrix4() });
+                    if (sceneObjects.length === 0 && self.mixo3d_chunk_manifest) sceneObjects.push({ id: "baked", url: outputURL(self.mixo3d_chunk_manifest), path: self.mixo3d_chunk_manifest, kind: "chunks", matrix: new THREE.Matrix4() });
+                    else if (sceneObjects.length === 0 && self.mixo3d_last_url) sceneObjects.push({ id: "baked", url: self.mixo3d_last_url, matrix: new THREE.Matrix4() });
                 } else {
                     traceScene(self).forEach((o, i) => { o.id = `live_${i}`; sceneObjects.push(o); });
                     if (sceneObjects.length === 0 && self.mixo3d_last_url) sceneObjects.push({ id: "baked", url: self.mixo3d_last_url, matrix: new THREE.Matrix4() });
@@ -549,9 +777,9 @@ app.registerExtension({
                         if (m === "LOADING") return;
                         if (m) self.threeScene.remove(m);
                         self.compositionModels[obj.id] = "LOADING";
-                        self.gltfLoader.load(obj.url, (gltf) => {
+                        self.loadModel(obj, (loaded) => {
                             const w = new THREE.Group();
-                            w.add(gltf.scene);
+                            w.add(loaded);
                             w.__lastUrl = obj.url;
                             w.isWrapper = true;
                             if (obj.sourceNodeId) w.userData.sourceNodeId = obj.sourceNodeId;
@@ -563,7 +791,7 @@ app.registerExtension({
                                 self.fitCamera(true);
                                 self.__hasFramedOnce = true;
                             }
-                        }, undefined, (e) => {
+                        }, (e) => {
                             console.error("[Mixo3D] Load Error:", e);
                             self.compositionModels[obj.id] = null;
                         });
@@ -627,9 +855,22 @@ app.registerExtension({
         const onExecuted = nodeType.prototype.onExecuted;
         nodeType.prototype.onExecuted = function (message) {
             onExecuted?.apply(this, arguments);
-            if (this.clearAllModels) this.clearAllModels();
             const d = message?.ui || message;
+            if (this.clearAllModels && !d?.transform_only) {
+                this.clearAllModels();
+                this.mixo3d_server_matrices = {};
+            }
+            if (d?.node_slots) this.mixo3d_node_slots = d.node_slots;
             if (d?.settings) this.mixo3d_settings = d.settings;
+            if (d?.mesh_ref) this.mixo3d_mesh_ref = d.mesh_ref[0];
+            if (d?.bounds) {
+                this.mixo3d_bounds = d.bounds;
+                if (this.frameBounds && !this.__cameraMoved) this.frameBounds(d.bounds);
+            }
+            // Chunked delivery replaces the single baked GLB as the viewer fallback
+            this.mixo3d_chunk_manifest = d?.chunk_manifest ? d.chunk_manifest[0].replace(/\\/g, "/") : null;
+            this.mixo3d_node_ids = d?.node_ids || null;
+            this.mixo3d_picked = null;
             if (d?.glb_url) {
                 // Format URL
                 let path = d.glb_url[0].replace(/\\/g, "/");